@@ -4,5 +4,13 @@ __author__ = """Vance Russell"""
 __email__ = 'vance@3point.xyz'
 __version__ = '1.1.6'
 
-# Import main functionality for easy access
-from .autorpt import main
+
+def __getattr__(name):
+    """Import main functionality on first access so the CLI starts quickly."""
+    if name == 'main':
+        from .autorpt import main
+        return main
+    if name in ('ReportBuilder', 'ReportBuildError', 'build_report'):
+        from . import builder
+        return getattr(builder, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
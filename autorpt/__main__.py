@@ -0,0 +1,6 @@
+"""Allow running autorpt with ``python -m autorpt``."""
+
+from .autorpt import main
+
+if __name__ == '__main__':
+    exit(main())
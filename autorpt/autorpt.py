@@ -1,198 +1,275 @@
 #!/usr/bin/env python
 """
 Auto-report generator from content.md with budget table insertion.
-Reads content.md and replaces [insert budget from budget.xlsx here] with actual budget table.
+Reads content.md and replaces [insert budget from budget.xlsx here] with actual budget table,
+[insert table from <file>.xlsx sheet <name>] with any other table and
+{{ frontmatter.<key> }} with frontmatter values.
 """
 
-import pandas as pd
 from pathlib import Path
-from docx import Document
-from docx.shared import Pt
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 from datetime import datetime
 import re
 import argparse
-import subprocess
+import os
+import hashlib
+import json
+from html import escape as _html_escape
 
+from .common import traced
+from .placeholders import compile_plan, missing_tables, resolve_table
+from .sections import BUDGET_TABLE, parse_blocks, section_cache, text_hash
+from .timings import stage
 
-def read_excel_as_dataframe(excel_file):
-    """Read Excel file and return pandas DataFrame"""
+TYPST_TABLE_MODES = ('auto', 'markup', 'data')
+
+# Tables with at least this many rows use a data file in 'auto' mode
+DATA_TABLE_ROWS = 500
+
+# Builds data-file tables with the same styling as df_to_typst_table
+TYPST_DATA_TABLE = """#let autorpt-data-table(data) = table(
+  columns: data.columns.len(),
+  align: (x, y) => if x == 0 or y == 0 { left } else { right },
+  ..data.columns.map(name => [*#name*]),
+  ..data.rows.map(row => {
+    let task = row.cells.first()
+    let bold = row.kind in ("total", "total_project", "indirect")
+    (
+      if row.hline_before { (table.hline(),) } else { () },
+      if row.kind == "total" [*#task*] else if row.kind == "sub_item" [    #task] else [#task],
+      row.cells.slice(1).map(value => if bold [*#value*] else [#value]),
+      if row.hline_after { (table.hline(),) } else { () },
+    )
+  }).flatten(),
+)"""
+
+
+def read_excel_as_dataframe(excel_file, sheet_name=0, **options):
+    """Read an Excel sheet (the first by default) and return pandas DataFrame.
+
+    Options (engine, usecols, nrows, header, dtype) are passed to the reader.
+    """
+    from .excel import read_excel_cached
     try:
-        df = pd.read_excel(excel_file)
+        with stage('read_excel', bytes=Path(excel_file).stat().st_size) as sizes:
+            df = read_excel_cached(excel_file, sheet_name=sheet_name, **options)
+            sizes.update(rows=len(df), columns=len(df.columns))
         return df
     except Exception as e:
         print(f"❌ Error reading Excel file: {e}")
         return None
 
 
+NO_BORDERS_XML = (
+    '<w:tblBorders>'
+    '<w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    '<w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    '<w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    '<w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    '<w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    '<w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/>'
+    '</w:tblBorders>'
+)
+
+
+def _run_xml(text, bold=False):
+    """Build a <w:r> element the way python-docx's run.text setter does"""
+    parts = ['<w:r>']
+    if bold:
+        parts.append('<w:rPr><w:b/></w:rPr>')
+    # Tabs and line breaks become their own elements, like _RunContentAppender
+    for piece in re.split(r'([\t\r\n])', text):
+        if piece == '\t':
+            parts.append('<w:tab/>')
+        elif piece in ('\r', '\n'):
+            parts.append('<w:br/>')
+        elif piece:
+            space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ''
+            parts.append(f'<w:t{space}>{_html_escape(piece, quote=False)}</w:t>')
+    parts.append('</w:r>')
+    return ''.join(parts)
+
+
+def _format_table_value(value, col_idx, is_missing):
+    """Format a budget cell value as shown in the Word table"""
+    # Handle NaN and None values
+    if is_missing:
+        return ""
+    # Format numeric values without $ signs
+    if isinstance(value, (int, float)) and col_idx > 0:
+        return f"{value:,.0f}" if value == int(value) else f"{value:,.2f}"
+    return str(value)
+
+
+def classify_budget_rows(df):
+    """Classify every budget row from its first column in one vectorized pass.
+
+    Row kinds are 'total', 'total_project', 'indirect', 'subtotal',
+    'sub_item', 'category' and 'item'. A sub-item either has a decimal
+    number (2.1, 2.2, ...) or has no number and follows a numbered category.
+    The rules above "total project" rows and below "indirect" rows are
+    flagged separately, since a row may be both.
+
+    Args:
+        df (DataFrame): Budget table with task names in the first column
+
+    Returns:
+        DataFrame: Columns 'task' (stripped name), 'kind', 'numbered' (the
+        name contains a "1." to "9." style number), 'hline_before' and
+        'hline_after', indexed like df
+    """
+    import numpy as np
+    import pandas as pd
+
+    if len(df.columns) == 0:
+        return pd.DataFrame({'task': [], 'kind': [], 'numbered': [], 'hline_before': [],
+                             'hline_after': []})
+
+    first = df.iloc[:, 0]
+    task = first.where(first.notna(), '').astype(str).str.strip()
+    lower = task.str.lower()
+
+    is_total_project = lower.str.contains('total project', regex=False)
+    is_indirect = lower.str.contains('indirect', regex=False)
+    is_sub_total = lower.str.contains('subtotal|sub-total|sub total', regex=True)
+    is_special = is_total_project | is_indirect | is_sub_total
+    is_total = lower.str.contains('total', regex=False) & ~is_special
+
+    has_decimal_number = task.str.match(r'\d+\.\d+')
+    numbered = task.str.contains(r'[1-9]\.', regex=True)
+    is_category = numbered & ~has_decimal_number
+    prev_is_category = is_category.shift(1, fill_value=False).astype(bool)
+
+    is_sub_item = ~(is_special | is_total) & (
+        has_decimal_number | (prev_is_category & ~numbered))
+
+    kind = np.select(
+        [is_total, is_total_project, is_indirect, is_sub_total, is_sub_item, is_category],
+        ['total', 'total_project', 'indirect', 'subtotal', 'sub_item', 'category'],
+        default='item',
+    )
+    return pd.DataFrame({'task': task, 'kind': kind, 'numbered': numbered.astype(bool),
+                         'hline_before': is_total_project.astype(bool),
+                         'hline_after': is_indirect.astype(bool)},
+                        index=df.index)
+
+
 def add_table_to_document(doc, df):
-    """Add a pandas DataFrame as a table to Word document"""
+    """Add a pandas DataFrame as a table to Word document.
+
+    The whole <w:tbl> element is built as one XML string from the column
+    arrays and inserted into the document body once, instead of filling
+    cells one at a time through python-docx.
+    """
     from docx.oxml import parse_xml
     from docx.oxml.ns import nsdecls
-    
-    # Create table with header row + data rows
-    table = doc.add_table(rows=len(df) + 1, cols=len(df.columns))
-    
-    # Remove all shading and borders
-    tbl = table._tbl
-    tblPr = tbl.tblPr
-    if tblPr is None:
-        tblPr = parse_xml(r'<w:tblPr xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"/>')
-        tbl.insert(0, tblPr)
-    
-    # Remove existing borders if any
-    tblBorders = tblPr.find('{http://schemas.openxmlformats.org/wordprocessingml/2006/main}tblBorders')
-    if tblBorders is not None:
-        tblPr.remove(tblBorders)
-    
-    # Add new borders with all set to none
-    no_border_xml = f'<w:tblBorders {nsdecls("w")}><w:top w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:left w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:bottom w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:right w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideH w:val="none" w:sz="0" w:space="0" w:color="auto"/><w:insideV w:val="none" w:sz="0" w:space="0" w:color="auto"/></w:tblBorders>'
-    borders_element = parse_xml(no_border_xml)
-    tblPr.append(borders_element)
-    
+    from docx.shared import Emu
+    from docx.table import Table
+
+    n_cols = len(df.columns)
+    col_width = Emu(doc._block_width // n_cols) if n_cols > 0 else Emu(0)
+    tc_open = f'<w:tc><w:tcPr><w:tcW w:type="dxa" w:w="{col_width.twips}"/></w:tcPr><w:p>'
+    tc_close = '</w:p></w:tc>'
+
+    # Format every column in one pass over its values
+    columns = []
+    for col_idx in range(n_cols):
+        column = df.iloc[:, col_idx]
+        columns.append([
+            _format_table_value(value, col_idx, is_missing)
+            for value, is_missing in zip(column.to_numpy(dtype=object), column.isna().tolist())
+        ])
+
+    # Bold only the row named exactly TOTAL, not rows that merely contain
+    # 'total' such as "Grand Total"
+    first_column = df.iloc[:, 0].to_numpy(dtype=object) if n_cols else []
+    total_rows = [str(value).upper() == 'TOTAL' for value in first_column]
+
+    parts = [
+        f'<w:tbl {nsdecls("w")}>',
+        '<w:tblPr><w:tblW w:type="auto" w:w="0"/>',
+        '<w:tblLook w:firstColumn="1" w:firstRow="1" w:lastColumn="0" w:lastRow="0"'
+        ' w:noHBand="0" w:noVBand="1" w:val="04A0"/>',
+        NO_BORDERS_XML,
+        '</w:tblPr><w:tblGrid>',
+        f'<w:gridCol w:w="{col_width.twips}"/>' * n_cols,
+        '</w:tblGrid>',
+    ]
+
     # Add header row (bolded)
-    header_cells = table.rows[0].cells
-    for i, column in enumerate(df.columns):
-        header_cells[i].text = str(column)
-        # Make header bold
-        for paragraph in header_cells[i].paragraphs:
-            for run in paragraph.runs:
-                run.font.bold = True
-    
+    parts.append('<w:tr>')
+    for column in df.columns:
+        parts.extend((tc_open, _run_xml(str(column), bold=True), tc_close))
+    parts.append('</w:tr>')
+
     # Add data rows
-    for row_idx, (_, row) in enumerate(df.iterrows(), start=1):
-        data_cells = table.rows[row_idx].cells
-        is_total_row = str(row.iloc[0]).upper() == 'TOTAL'
-        
-        for col_idx, value in enumerate(row):
-            # Handle NaN and None values
-            if pd.isna(value):
-                data_cells[col_idx].text = ""
-            # Format numeric values without $ signs
-            elif isinstance(value, (int, float)):
-                if col_idx > 0:  # Only for numeric columns after first
-                    data_cells[col_idx].text = f"{value:,.0f}" if value == int(value) else f"{value:,.2f}"
-                else:
-                    data_cells[col_idx].text = str(value)
-            else:
-                data_cells[col_idx].text = str(value)
-            
-            # Bold only TOTAL row
-            if is_total_row:
-                for paragraph in data_cells[col_idx].paragraphs:
-                    for run in paragraph.runs:
-                        run.font.bold = True
+    for row_idx, is_total_row in enumerate(total_rows):
+        parts.append('<w:tr>')
+        for column in columns:
+            parts.extend((tc_open, _run_xml(column[row_idx], bold=is_total_row), tc_close))
+        parts.append('</w:tr>')
+
+    parts.append('</w:tbl>')
+
+    tbl = parse_xml(''.join(parts))
+    doc._body._element._insert_tbl(tbl)
+    return Table(tbl, doc._body)
 
 
 def parse_markdown_sections(markdown_text):
     """Parse markdown text into sections by headers"""
-    sections = []
-    current_section = None
-    current_content = []
-    
-    for line in markdown_text.split('\n'):
-        if line.startswith('# '):
-            # Top-level header
-            if current_section is not None:
-                sections.append({
-                    'level': 1,
-                    'title': current_section,
-                    'content': '\n'.join(current_content).strip()
-                })
-            current_section = line[2:].strip()
-            current_content = []
-        elif line.startswith('## '):
-            # Sub-header
-            if current_section is not None:
-                sections.append({
-                    'level': 1,
-                    'title': current_section,
-                    'content': '\n'.join(current_content).strip()
-                })
-            current_section = line[3:].strip()
-            current_content = []
-        else:
-            current_content.append(line)
-    
-    # Don't forget the last section
-    if current_section is not None:
-        sections.append({
-            'level': 1,
-            'title': current_section,
-            'content': '\n'.join(current_content).strip()
-        })
-    
-    return sections
+    return [
+        {'level': 1, 'title': section['title'], 'content': section['content'].strip(),
+         'hash': section['hash']}
+        for section in compile_plan(markdown_text).sections
+        if section['level'] > 0
+    ]
 
 
-def add_markdown_to_document(doc, markdown_text, budget_df=None):
-    """Add markdown-formatted content to Word document"""
-    lines = markdown_text.split('\n')
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].rstrip()
-        
-        if not line:
-            # Skip empty lines - don't add paragraph spacing
-            i += 1
-            continue
-        elif line.startswith('## '):
+def add_markdown_to_document(doc, markdown_text, budget_df=None, tables=None):
+    """Add markdown-formatted content to Word document.
+
+    Table placeholders are filled from tables (DataFrames by TableRef);
+    budget_df fills the budget.xlsx placeholder if tables lacks it.
+    """
+    for kind, value in parse_blocks(markdown_text):
+        if kind == 'heading':
             # Level 2 header
-            heading = line[3:].strip()
-            doc.add_heading(heading, level=2)
-            i += 1
-        elif line.startswith('[insert budget from budget.xlsx here]'):
-            # Replace with actual budget table
-            if budget_df is not None:
-                add_table_to_document(doc, budget_df)
-            i += 1
-        elif line.startswith('- '):
-            # Bullet point - collect all consecutive bullet points
-            bullets = []
-            while i < len(lines) and lines[i].rstrip().startswith('- '):
-                bullet_text = lines[i].rstrip()[2:].strip()
-                bullets.append(bullet_text)
-                i += 1
-            # Add all bullets together
-            for bullet_text in bullets:
+            doc.add_heading(value, level=2)
+        elif kind == 'table':
+            # Replace with the referenced table
+            df = resolve_table(value, tables, budget_df)
+            if df is not None:
+                with stage('word_table', table=value.label, rows=len(df), columns=len(df.columns)):
+                    add_table_to_document(doc, df)
+        elif kind == 'bullets':
+            for bullet_text in value:
                 doc.add_paragraph(bullet_text, style='List Bullet')
         else:
             # Regular paragraph
-            if line.strip():
-                doc.add_paragraph(line)
-            i += 1
+            doc.add_paragraph(value)
 
 
-def generate_report_from_content():
-    """Main function to generate report"""
-    reports_dir = Path('reports')
-    content_file = reports_dir / 'content.md'
-    budget_file = reports_dir / 'budget.xlsx'
-    
-    print("📄 Reading content.md...")
-    if not content_file.exists():
-        print(f"❌ {content_file} not found")
-        return False
-    
-    with open(content_file, 'r', encoding='utf-8') as f:
-        content_text = f.read()
-    
-    print("📊 Reading budget.xlsx...")
-    if not budget_file.exists():
-        print(f"❌ {budget_file} not found")
-        return False
-    
-    budget_df = read_excel_as_dataframe(budget_file)
-    if budget_df is None:
-        return False
-    
-    print("📝 Creating Word document...")
+def build_word_document(content_text, budget_df=None, tables=None):
+    """Build the Word report from content.md text and its tables"""
+    from docx import Document
+
     doc = Document()
     
     # Parse content into sections
-    sections = parse_markdown_sections(content_text)
+    with stage('parse_markdown', bytes=len(content_text.encode('utf-8'))) as sizes:
+        sections = parse_markdown_sections(content_text)
+        sizes['sections'] = len(sections)
     
+    with stage('build_docx', sections=len(sections)):
+        _add_sections_to_document(doc, sections, budget_df, tables)
+    
+    return doc
+
+
+def _add_sections_to_document(doc, sections, budget_df, tables):
+    """Add parsed content.md sections to the Word document"""
+    from docx.enum.text import WD_ALIGN_PARAGRAPH
+
     for section in sections:
         title = section['title']
         content = section['content']
@@ -212,285 +289,444 @@ def generate_report_from_content():
             
             # Add content
             if content:
-                add_markdown_to_document(doc, content, budget_df)
+                add_markdown_to_document(doc, content, budget_df, tables)
+
+
+def read_content(content_file):
+    """Read content.md text"""
+    with stage('read_content', bytes=Path(content_file).stat().st_size):
+        with open(content_file, 'r', encoding='utf-8') as f:
+            return f.read()
+
+
+def save_word_document(doc, output_file):
+    """Save the Word document to output_file"""
+    with stage('save_docx') as sizes:
+        doc.save(str(output_file))
+        sizes['bytes'] = Path(output_file).stat().st_size
+
+
+def _typst_cache_inputs(reports_dir):
+    """Return the template files and settings a cached PDF depends on.
+
+    Returns:
+        tuple: (report.typ and the asset files it references, (Typst backend,))
+    """
+    from .typst_build import resolve_backend, template_assets
+
+    template = Path(reports_dir) / 'report.typ'
+    try:
+        assets = list(template_assets(template).values())
+    except (OSError, UnicodeDecodeError):
+        assets = []
+    try:
+        backend = resolve_backend()
+    except ValueError:
+        backend = None
+    return [template] + assets, (backend,)
+
+
+def _restore_cached_report(kind, input_files, output_file, extra=()):
+    """Reuse a cached report if its inputs are unchanged.
+
+    Args:
+        extra (tuple): Settings that change the output besides the input files
+
+    Returns:
+        tuple: (cache, key, hit) - cache and key are None if the cache is unusable
+    """
+    from .cache import BuildCache
+    with stage('cache_lookup', format=kind) as sizes:
+        try:
+            cache = BuildCache()
+            # The report date is part of the output, so it is part of the key
+            key = BuildCache.make_key(kind, input_files,
+                                      extra=(datetime.now().strftime('%Y-%m-%d'),) + tuple(extra))
+        except OSError:
+            return None, None, False
+        sizes['hit'] = hit = cache.restore(key, [output_file])
+    if hit:
+        print(f"♻️  Inputs unchanged, reused cached report: {output_file}")
+        return cache, key, True
+    return cache, key, False
+
+
+@traced('generate_docx', 'report')
+def generate_report_from_content(reports_dir='reports', use_cache=True):
+    """Main function to generate report"""
+    reports_dir = Path(reports_dir)
+    content_file = reports_dir / 'content.md'
+    output_file = reports_dir / f"report_{datetime.now().strftime('%Y-%m-%d')}.docx"
+    
+    print("📄 Reading content.md...")
+    if not content_file.exists():
+        print(f"❌ {content_file} not found")
+        return False
+    
+    # Only the workbooks referenced by placeholders are inputs
+    content_text = read_content(content_file)
+    plan = compile_plan(content_text)
+    
+    cache, cache_key = None, None
+    if use_cache:
+        cache, cache_key, hit = _restore_cached_report(
+            'docx', [content_file] + plan.table_files(reports_dir), output_file)
+        if hit:
+            return True
+    
+    tables = plan.load_tables(reports_dir)
+    if missing_tables(tables):
+        return False
+    
+    print("📝 Creating Word document...")
+    doc = build_word_document(content_text, tables=tables)
     
     # Save document
-    output_file = reports_dir / f"report_{datetime.now().strftime('%Y-%m-%d')}.docx"
-    doc.save(str(output_file))
+    save_word_document(doc, output_file)
     print(f"✅ Report generated: {output_file}")
+    if cache is not None:
+        cache.put(cache_key, [output_file])
     return True
 
 
+def _format_typst_value(value, is_category, is_missing):
+    """Format a budget cell value as shown in the Typst table"""
+    if is_missing:
+        # For category headers without values, leave blank
+        return '' if is_category else '-'
+    # Format numbers with comma separator and no decimals
+    try:
+        return f'{float(value):,.0f}'
+    except (ValueError, TypeError):
+        return str(value)
+
+
+def _typst_table_rows(df):
+    """Yield (kind, (rule above, rule below), task name, formatted values) for every budget row"""
+    rows = classify_budget_rows(df)
+    kinds = rows['kind'].tolist()
+    hlines = list(zip(rows['hline_before'].tolist(), rows['hline_after'].tolist()))
+    numbered = rows['numbered'].tolist()
+
+    # Format numeric columns once per column
+    value_columns = []
+    for col_idx in range(1, len(df.columns)):
+        column = df.iloc[:, col_idx]
+        value_columns.append([
+            _format_typst_value(value, is_category, is_missing)
+            for value, is_category, is_missing
+            in zip(column.to_numpy(dtype=object), numbered, column.isna().tolist())
+        ])
+
+    for row_idx, (task_name, kind) in enumerate(zip(rows['task'].tolist(), kinds)):
+        if kind == 'total_project':
+            # Capitalize Total Project
+            task_name = task_name.replace('total project', 'Total Project').replace('TOTAL PROJECT', 'Total Project')
+        elif kind == 'indirect':
+            # Capitalize Indirect
+            task_name = task_name.replace('indirect', 'Indirect').replace('INDIRECT', 'Indirect')
+        yield kind, hlines[row_idx], task_name, [column[row_idx] for column in value_columns]
+
+
 def df_to_typst_table(df):
     """Convert a DataFrame to Typst table syntax with formatting"""
     cells = []
-    
+
     # Add header row with bold formatting
     for col in df.columns:
         cells.append(f'[*{col}*]')
-    
+
     # Add data rows
-    for idx, (_, row) in enumerate(df.iterrows()):
-        task_name = str(row.iloc[0]).strip() if not pd.isna(row.iloc[0]) else ''
-        
-        # Determine row type
-        is_total_project = 'total project' in task_name.lower()
-        is_indirect = 'indirect' in task_name.lower()
-        is_sub_total = 'subtotal' in task_name.lower() or 'sub-total' in task_name.lower() or 'sub total' in task_name.lower()
-        is_total_row = 'total' in task_name.lower() and not is_total_project and not is_indirect and not is_sub_total
-        
-        # Check if this is a sub-item: has decimal number (2.1, 2.2, etc) or no number following a numbered category
-        is_sub_item = False
-        
-        # Check if current task has decimal number (2.1, 2.2, etc.)
-        import re
-        has_decimal_number = bool(re.match(r'^\d+\.\d+', task_name))
-        
-        if has_decimal_number and not is_total_project and not is_indirect and not is_total_row and not is_sub_total:
-            is_sub_item = True
-        elif idx > 0:
-            prev_task = str(df.iloc[idx-1, 0]).strip() if not pd.isna(df.iloc[idx-1, 0]) else ''
-            # Previous row is a category if it starts with a number (1., 2., 3., etc.)
-            prev_is_category = any(f'{i}.' in prev_task for i in range(1, 10)) and not bool(re.match(r'^\d+\.\d+', prev_task))
-            # Current row is a sub-item if it doesn't start with a number
-            curr_is_category = any(f'{i}.' in task_name for i in range(1, 10))
-            
-            if prev_is_category and not curr_is_category and not is_total_project and not is_indirect and not is_total_row and not is_sub_total:
-                is_sub_item = True
-        
+    for kind, (hline_before, hline_after), task_name, values in _typst_table_rows(df):
         # Add horizontal line above Total Project
-        if is_total_project:
+        if hline_before:
             cells.append('table.hline()')
-        
+
         # Format task name
-        if is_total_row:
+        if kind == 'total':
             formatted_task = f'*{task_name}*'
-        elif is_total_project:
-            # Capitalize Total Project
-            formatted_task = task_name.replace('total project', 'Total Project').replace('TOTAL PROJECT', 'Total Project')
-        elif is_indirect:
-            # Capitalize Indirect
-            formatted_task = task_name.replace('indirect', 'Indirect').replace('INDIRECT', 'Indirect')
-        elif is_sub_total:
-            formatted_task = task_name
-        elif is_sub_item:
+        elif kind == 'sub_item':
             formatted_task = f'    {task_name}'  # Indent with 4 spaces
         else:
             formatted_task = task_name
-        
+
         cells.append(f'[{formatted_task}]')
-        
-        # Add numeric columns
-        for col_idx in range(1, len(row)):
-            val = row.iloc[col_idx]
-            
-            # Convert to string, handling NaN values
-            if pd.isna(val):
-                # For category headers without values, leave blank
-                if any(f'{i}.' in task_name for i in range(1, 10)):
-                    cell_str = ''
-                else:
-                    cell_str = '-'
-            else:
-                # Format numbers with comma separator and no decimals
-                try:
-                    num = float(val)
-                    cell_str = f'{num:,.0f}'
-                except (ValueError, TypeError):
-                    cell_str = str(val)
-            
-            # Bold only the TOTAL row (not subtotal or total project/indirect numbers)
-            if is_total_row:
-                cells.append(f'[#align(right)[*{cell_str}*]]')
-            elif is_total_project or is_indirect:
-                cells.append(f'[#align(right)[*{cell_str}*]]')
-            else:
-                cells.append(f'[#align(right)[{cell_str}]]')
-        
+
+        # Bold the TOTAL row and the total project/indirect numbers
+        if kind in ('total', 'total_project', 'indirect'):
+            cells.extend(f'[#align(right)[*{value}*]]' for value in values)
+        else:
+            cells.extend(f'[#align(right)[{value}]]' for value in values)
+
         # Add horizontal line below Indirect
-        if is_indirect:
+        if hline_after:
             cells.append('table.hline()')
-    
+
     # Format as Typst table
     table_str = f'#table(\n  columns: {len(df.columns)},\n  ' + ', '.join(cells) + '\n)'
-    
+
     return table_str
 
 
-def generate_pdf_with_typst():
+def typst_table_mode(mode=None):
+    """Return how tables are put into the Typst content.
+
+    Args:
+        mode (str): 'markup' inlines every cell, 'data' loads the table from
+            a JSON data file and 'auto' (the default) uses a data file for
+            tables of DATA_TABLE_ROWS rows or more. Defaults to the
+            AUTORPT_TYPST_TABLES environment variable.
+
+    Raises:
+        ValueError: If the mode is unknown
+    """
+    mode = (mode or os.environ.get('AUTORPT_TYPST_TABLES') or 'auto').lower()
+    if mode not in TYPST_TABLE_MODES:
+        raise ValueError(f"unknown Typst table mode '{mode}' "
+                         f"(choose from {', '.join(TYPST_TABLE_MODES)})")
+    return mode
+
+
+def df_to_typst_data(df):
+    """Convert a DataFrame to a JSON data file and the Typst markup loading it.
+
+    The formatted cells and each row's kind are written as data, and the
+    table is built by the autorpt-data-table function (TYPST_DATA_TABLE),
+    which applies the same styling as df_to_typst_table. Typst reads the
+    file with json() instead of parsing every cell as markup.
+
+    Returns:
+        tuple: (markup, data file name, data file bytes). The name is
+        derived from the data, so unchanged tables keep their file.
+    """
+    data = {
+        'columns': [str(col) for col in df.columns],
+        'rows': [{'kind': kind, 'hline_before': hline_before, 'hline_after': hline_after,
+                  'cells': [task_name] + values}
+                 for kind, (hline_before, hline_after), task_name, values
+                 in _typst_table_rows(df)],
+    }
+    payload = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    file_name = f"table-{hashlib.sha256(payload).hexdigest()[:16]}.json"
+    return f'#autorpt-data-table(json("{file_name}"))', file_name, payload
+
+
+def _section_to_typst(section, table_markup):
+    """Convert one parsed section to a tuple of Typst lines"""
+    typst_content = []
+    if section['level'] > 0:
+        typst_content.append(f"{'=' * section['level']} {section['title']}")
+        typst_content.append('')
+
+    for kind, value in parse_blocks(section['content']):
+        if kind == 'table':
+            # Insert the referenced table
+            if table_markup.get(value):
+                typst_content.append(table_markup[value])
+                typst_content.append('')
+        elif kind == 'bullets':
+            typst_content.extend(f'- {bullet}' for bullet in value)
+            typst_content.append('')
+        elif kind == 'heading':
+            typst_content.append(f'== {value}')
+            typst_content.append('')
+        else:
+            typst_content.append(value)
+
+    return tuple(typst_content)
+
+
+def markdown_to_typst(content_text, budget_df=None, budget_table=None, tables=None,
+                      table_markup=None, data_files=None, table_mode=None):
+    """Convert content.md text to Typst markup.
+
+    Each section is rendered once per distinct content (and tables used),
+    so re-converting an edited document only renders the changed sections.
+
+    Args:
+        content_text (str): Markdown text, optionally with YAML frontmatter
+        budget_df (DataFrame): Budget table to insert at the budget.xlsx placeholder
+        budget_table (str): Already converted budget table, used instead of
+            converting budget_df again
+        tables (dict): Tables (DataFrames by TableRef) for the table placeholders
+        table_markup (dict): Converted Typst tables by TableRef. Tables missing
+            from it are converted and added, so callers can reuse conversions.
+        data_files (dict): Receives the data files (bytes by file name) of
+            tables loaded from JSON, which must be placed next to
+            report_content.typ. Without it every table is inlined as markup.
+        table_mode (str): 'auto', 'markup' or 'data' (see typst_table_mode)
+
+    Returns:
+        str: Typst markup for report_content.typ
+    """
+    with stage('parse_markdown', bytes=len(content_text.encode('utf-8'))) as sizes:
+        plan = compile_plan(content_text)
+        sections = plan.sections
+        sizes['sections'] = len(sections)
+
+    if table_markup is None:
+        table_markup = {}
+    if budget_table is not None:
+        table_markup.setdefault(BUDGET_TABLE, budget_table)
+    table_mode = typst_table_mode(table_mode) if data_files is not None else 'markup'
+    for ref in plan.tables:
+        if ref in table_markup:
+            continue
+        df = resolve_table(ref, tables, budget_df)
+        if df is not None and not df.empty:
+            with stage('typst_table', table=ref.label, rows=len(df),
+                       columns=len(df.columns)) as sizes:
+                if table_mode == 'data' or (table_mode == 'auto' and len(df) >= DATA_TABLE_ROWS):
+                    table_markup[ref], file_name, payload = df_to_typst_data(df)
+                    data_files[file_name] = payload
+                    sizes['data_bytes'] = len(payload)
+                else:
+                    table_markup[ref] = df_to_typst_table(df)
+    table_keys = {ref: text_hash(markup) for ref, markup in table_markup.items() if markup}
+
+    typst_content = []
+    with stage('build_typst', sections=len(sections)):
+        for section in sections:
+            used = tuple(table_keys.get(ref) for ref in plan.section_tables(section))
+            typst_content.extend(section_cache.get_or_build(
+                ('typst', section['hash'], used),
+                lambda section=section: _section_to_typst(section, table_markup)))
+
+    if data_files and any(table_markup.get(ref, '').startswith('#autorpt-data-table(')
+                          for ref in plan.tables):
+        typst_content.insert(0, TYPST_DATA_TABLE + '\n')
+    return '\n'.join(typst_content).strip()
+
+
+def write_typst_content(report_content_file, typst_text):
+    """Write report_content.typ, leaving it untouched if nothing changed.
+
+    Returns:
+        bool: True if the file was written
+    """
+    report_content_file = Path(report_content_file)
+    with stage('write_typst', bytes=len(typst_text.encode('utf-8'))) as sizes:
+        sizes['written'] = False
+        if report_content_file.exists():
+            with open(report_content_file, 'r', encoding='utf-8') as f:
+                if f.read() == typst_text:
+                    return False
+        with open(report_content_file, 'w', encoding='utf-8') as f:
+            f.write(typst_text)
+        sizes['written'] = True
+    return True
+
+
+def write_typst_data_files(folder, data_files):
+    """Write the data files of Typst tables that are not in folder yet.
+
+    Data file names are derived from their contents, so existing files are
+    already up to date.
+    """
+    for file_name, payload in data_files.items():
+        data_file = Path(folder) / file_name
+        if not data_file.exists():
+            with open(data_file, 'wb') as f:
+                f.write(payload)
+
+
+def compile_typst_pdf(reports_dir, output_file, typst_text=None, data_files=None):
+    """Compile report.typ in reports_dir into output_file with Typst.
+
+    The compilation runs in its own scratch workspace (see typst_build), so
+    concurrent builds of the same folder never share intermediate files.
+    typst_text is the generated content, with its tables' data_files;
+    without it report_content.typ in reports_dir is used.
+    """
+    from .typst_build import TypstError, compile_typst, write_output
+
+    reports_dir = Path(reports_dir)
+    output_file = Path(output_file)
+    try:
+        if typst_text is None:
+            typst_text = (reports_dir / 'report_content.typ').read_text(encoding='utf-8')
+        print(f"🔄 Converting to PDF with Typst...")
+        data = compile_typst(reports_dir / 'report.typ', typst_text, data_files=data_files)
+        write_output(output_file, data)
+        print(f"✅ PDF created successfully: {output_file}")
+        print(f"📊 PDF file size: {len(data) / 1024:.1f} KB")
+        return True
+    except TypstError as e:
+        print(f"❌ {e}")
+        if str(e) == "Typst not found":
+            print("   Please install Typst: https://github.com/typst/typst")
+        return False
+    except Exception as e:
+        print(f"❌ Error generating PDF: {e}")
+        return False
+
+
+@traced('generate_pdf', 'report')
+def generate_pdf_with_typst(reports_dir='reports', use_cache=True):
     """Generate PDF from content.md using Typst"""
-    reports_dir = Path('reports')
+    reports_dir = Path(reports_dir)
     content_file = reports_dir / 'content.md'
-    budget_file = reports_dir / 'budget.xlsx'
-    report_content_file = reports_dir / 'report_content.typ'
     typst_template = reports_dir / 'report.typ'
     
     print("📄 Checking Typst template and content.md...")
     
     if not typst_template.exists():
         print(f"❌ Typst template not found: {typst_template}")
-        print("   Please create report.typ in the reports/ folder")
+        print(f"   Please create report.typ in the {reports_dir}/ folder")
         return False
     
     if not content_file.exists():
         print(f"❌ Content file not found: {content_file}")
         return False
     
-    # Read budget if it exists
-    budget_df = None
-    if budget_file.exists():
-        budget_df = read_excel_as_dataframe(budget_file)
+    output_file = reports_dir / f"report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
     
     # Read and parse content.md
-    with open(content_file, 'r', encoding='utf-8') as f:
-        content_text = f.read()
+    content_text = read_content(content_file)
+    plan = compile_plan(content_text)
     
-    # Strip YAML frontmatter
-    lines = content_text.split('\n')
-    body_start = 0
-    if lines[0].strip() == '---':
-        for i in range(1, len(lines)):
-            if lines[i].strip() == '---':
-                body_start = i + 1
-                break
+    cache, cache_key = None, None
+    if use_cache:
+        template_files, settings = _typst_cache_inputs(reports_dir)
+        cache, cache_key, hit = _restore_cached_report(
+            'pdf', [content_file] + plan.table_files(reports_dir) + template_files, output_file,
+            settings)
+        if hit:
+            return True
     
-    body_lines = lines[body_start:]
+    # Read the referenced tables; missing ones are left out of the PDF
+    tables = plan.load_tables(reports_dir)
     
     # Convert markdown to Typst format
-    typst_content = []
-    i = 0
-    while i < len(body_lines):
-        line = body_lines[i].rstrip()
-        
-        if not line:
-            i += 1
-            continue
-        elif line.startswith('# '):
-            heading = line[2:].strip()
-            typst_content.append(f'= {heading}')
-            typst_content.append('')
-            i += 1
-        elif line.startswith('## '):
-            heading = line[3:].strip()
-            typst_content.append(f'== {heading}')
-            typst_content.append('')
-            i += 1
-        elif line.startswith('[insert budget from budget.xlsx here]'):
-            # Insert actual budget table
-            if budget_df is not None and not budget_df.empty:
-                typst_content.append(df_to_typst_table(budget_df))
-                typst_content.append('')
-            i += 1
-        elif line.startswith('- '):
-            # Bullet points
-            while i < len(body_lines) and body_lines[i].rstrip().startswith('- '):
-                bullet = body_lines[i].rstrip()[2:].strip()
-                typst_content.append(f'- {bullet}')
-                i += 1
-            typst_content.append('')
-        else:
-            typst_content.append(line)
-            i += 1
-    
-    # Write report_content.typ
-    with open(report_content_file, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(typst_content).strip())
+    data_files = {}
+    typst_text = markdown_to_typst(content_text, tables=tables, data_files=data_files)
     
-    # Generate PDF filename
-    output_file = reports_dir / f"report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
-    
-    try:
-        print(f"🔄 Converting to PDF with Typst...")
-        # Run typst compile command
-        result = subprocess.run(
-            ['typst', 'compile', 'report.typ', f"report_{datetime.now().strftime('%Y-%m-%d')}.pdf"],
-            cwd=str(reports_dir),
-            capture_output=True,
-            text=True,
-            timeout=30
-        )
-        
-        if result.returncode == 0:
-            if output_file.exists():
-                file_size = output_file.stat().st_size / 1024  # KB
-                print(f"✅ PDF created successfully: {output_file}")
-                print(f"📊 PDF file size: {file_size:.1f} KB")
-                return True
-            else:
-                print("❌ Typst compilation succeeded but PDF file not created")
-                return False
-        else:
-            print(f"❌ Typst compilation failed:")
-            print(result.stderr)
-            return False
-    
-    except FileNotFoundError:
-        print("❌ Typst not found. Please install Typst:")
-        print("   https://github.com/typst/typst")
-        return False
-    except subprocess.TimeoutExpired:
-        print("❌ Typst compilation timed out")
-        return False
-    except Exception as e:
-        print(f"❌ Error generating PDF: {e}")
+    if not compile_typst_pdf(reports_dir, output_file, typst_text, data_files):
         return False
+    if cache is not None:
+        cache.put(cache_key, [output_file])
+    return True
 
 
+def _add_format_arguments(subparser, cache=True):
+    """Add the --typst/--all output format flags to a subcommand"""
+    if cache:
+        subparser.add_argument('--no-cache', action='store_true', dest='sub_no_cache',
+                               help='Rebuild even if the inputs are unchanged')
+    group = subparser.add_mutually_exclusive_group()
+    group.add_argument('--typst', action='store_true', dest='sub_typst',
+                       help='Generate PDF using Typst instead of .docx')
+    group.add_argument('--all', action='store_true', dest='sub_all',
+                       help='Generate both Word and PDF (Typst) reports')
 
-    """Main function to generate report"""
-    reports_dir = Path('reports')
-    content_file = reports_dir / 'content.md'
-    budget_file = reports_dir / 'budget.xlsx'
-    
-    print("📄 Reading content.md...")
-    if not content_file.exists():
-        print(f"❌ {content_file} not found")
-        return False
-    
-    with open(content_file, 'r', encoding='utf-8') as f:
-        content_text = f.read()
-    
-    print("📊 Reading budget.xlsx...")
-    if not budget_file.exists():
-        print(f"❌ {budget_file} not found")
-        return False
-    
-    budget_df = read_excel_as_dataframe(budget_file)
-    if budget_df is None:
-        return False
-    
-    print("📝 Creating Word document...")
-    doc = Document()
-    
-    # Parse content into sections
-    sections = parse_markdown_sections(content_text)
-    
-    for section in sections:
-        title = section['title']
-        content = section['content']
-        
-        if title.lower() == 'monthly report':
-            # Add as main title
-            title_para = doc.add_heading(title, level=0)
-            title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-            
-            # Add today's date under title
-            date_para = doc.add_paragraph(datetime.now().strftime('%B %d, %Y'))
-            date_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        else:
-            # Add as regular section
-            if title:
-                doc.add_heading(title, level=1)
-            
-            # Add content
-            if content:
-                add_markdown_to_document(doc, content, budget_df)
-    
-    # Save document
-    output_file = reports_dir / f"report_{datetime.now().strftime('%Y-%m-%d')}.docx"
-    doc.save(str(output_file))
-    print(f"✅ Report generated: {output_file}")
-    return True
+
+def _selected_formats(args):
+    """Return the output formats chosen with a subcommand's format flags"""
+    if args.sub_all:
+        return ('docx', 'pdf')
+    if args.sub_typst:
+        return ('pdf',)
+    return ('docx',)
 
 
 def main():
@@ -503,16 +739,47 @@ Examples:
   auto                          # Generate Word report (.docx)
   auto --typst                  # Generate PDF report using Typst
   auto --all                    # Generate both Word and PDF
+  auto --formats docx,pdf,html  # Generate several formats concurrently
+  auto --no-cache               # Rebuild even if nothing changed
+  auto --timings                # Show where the time goes
+  auto --trace trace.json       # Record a trace to open in Perfetto
   auto start                    # Open web interface in browser
   auto start --no-browser       # Start web server only
+  auto batch reports            # Build every project folder in reports/
+  auto batch reports --all -j 8 # Word and PDF for each project, 8 workers
+  auto watch --typst            # Rebuild the PDF whenever content.md changes
+  auto volume reports           # One PDF of every project, with contents
         """)
     
     parser.add_argument('--typst', action='store_true',
                         help='Generate PDF using Typst instead of .docx')
     parser.add_argument('--all', action='store_true',
                         help='Generate both Word and PDF (Typst) reports')
+    parser.add_argument('--formats', metavar='LIST',
+                        help='Comma-separated formats to generate from one parse: docx,pdf,html,md')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Rebuild even if the inputs are unchanged')
     parser.add_argument('--verbose', '-v', action='store_true',
                         help='Enable verbose output')
+    parser.add_argument('--timings', action='store_true',
+                        help='Print wall time, CPU time and peak memory of every stage')
+    parser.add_argument('--timings-json', metavar='FILE',
+                        help='Write the stage timings as JSON to FILE')
+    parser.add_argument('--excel-engine', choices=('auto', 'calamine', 'openpyxl'),
+                        help='Excel reader (default: calamine if installed, else openpyxl)')
+    parser.add_argument('--typst-backend', choices=('auto', 'python', 'cli'),
+                        help='Compile PDFs in process with the typst package, or with the '
+                             'typst command (default: python if installed, else cli)')
+    parser.add_argument('--typst-jobs', type=int, metavar='N',
+                        help='Typst compilations run at once (default: CPU count)')
+    parser.add_argument('--typst-timeout', type=float, metavar='SECONDS',
+                        help='Time limit per Typst compilation, 0 for none (default: 30)')
+    parser.add_argument('--typst-tables', choices=TYPST_TABLE_MODES,
+                        help='Inline tables as Typst markup, or load them from JSON data '
+                             f'files (default: auto, data files from {DATA_TABLE_ROWS} rows)')
+    parser.add_argument('--trace', metavar='FILE',
+                        help='Record a trace: Chrome trace JSON (open in Perfetto), '
+                             'or JSON lines if FILE ends in .jsonl')
     
     subparsers = parser.add_subparsers(dest='command')
     
@@ -522,11 +789,86 @@ Examples:
     start_parser.add_argument('--port', type=int, default=8080,
                               help='Port for web server (default: 8080)')
     
+    batch_parser = subparsers.add_parser(
+        'batch', help='Build reports for every project folder under a root')
+    batch_parser.add_argument('root', nargs='?', default='reports',
+                              help='Folder holding one subfolder per project (default: reports)')
+    batch_parser.add_argument('--workers', '-j', type=int, default=None,
+                              help='Number of worker processes (default: CPU count)')
+    _add_format_arguments(batch_parser)
+
+    watch_parser = subparsers.add_parser(
+        'watch', help='Rebuild the report whenever its inputs change')
+    watch_parser.add_argument('dir', nargs='?', default='reports',
+                              help='Folder with content.md, budget.xlsx and report.typ (default: reports)')
+    watch_parser.add_argument('--debounce', type=float, default=0.3,
+                              help='Seconds to wait for saves to settle (default: 0.3)')
+    _add_format_arguments(watch_parser, cache=False)
+
+    volume_parser = subparsers.add_parser(
+        'volume', help='Compile every project report into one PDF with a table of contents')
+    volume_parser.add_argument('root', nargs='?', default='reports',
+                               help='Folder holding one subfolder per project (default: reports)')
+    volume_parser.add_argument('--output', '-o', metavar='FILE',
+                               help='PDF to write (default: volume_YYYY-MM-DD.pdf in the root)')
+    volume_parser.add_argument('--title', default='Contents',
+                               help='Heading of the table of contents (default: Contents)')
+
     args = parser.parse_args()
     
     if args.verbose:
         print("Verbose mode enabled")
     
+    if args.excel_engine:
+        # Also seen by batch worker processes
+        os.environ['AUTORPT_EXCEL_ENGINE'] = args.excel_engine
+    if args.typst_backend:
+        os.environ['AUTORPT_TYPST_BACKEND'] = args.typst_backend
+    if args.typst_jobs is not None:
+        os.environ['AUTORPT_TYPST_JOBS'] = str(args.typst_jobs)
+    if args.typst_tables:
+        os.environ['AUTORPT_TYPST_TABLES'] = args.typst_tables
+    if args.typst_timeout is not None:
+        os.environ['AUTORPT_TYPST_TIMEOUT'] = str(args.typst_timeout)
+    
+    if not (args.timings or args.timings_json or args.trace):
+        return _run_command(parser, args)
+
+    from .common import start_tracing, stop_tracing
+    from .timings import start_timings, stop_timings
+    if args.trace:
+        if args.trace.endswith('.jsonl'):
+            # Stream events so long-running servers can be inspected live
+            open(args.trace, 'w').close()
+            start_tracing(jsonl_file=args.trace)
+        else:
+            start_tracing()
+    if args.timings or args.timings_json:
+        start_timings()
+    try:
+        exit_code = _run_command(parser, args)
+    finally:
+        recorder = stop_timings()
+        tracer = stop_tracing()
+    if tracer is not None:
+        if not args.trace.endswith('.jsonl'):
+            tracer.export_chrome(args.trace)
+        print(f"🔍 Trace written to {args.trace}")
+    if recorder is None:
+        return exit_code
+    if args.timings:
+        print(recorder.format_text())
+    if args.timings_json:
+        recorder.write_json(args.timings_json, command=args.command or 'report',
+                            exit_code=exit_code)
+        print(f"⏱️  Timings written to {args.timings_json}")
+    return exit_code
+
+
+def _run_command(parser, args):
+    """Run the command selected on the command line and return its exit code"""
+    use_cache = not (args.no_cache or getattr(args, 'sub_no_cache', False))
+    
     if args.command == 'start':
         try:
             from .webapp import start_server
@@ -544,11 +886,41 @@ Examples:
             print("\n\nServer stopped")
             return 0
     
+    if args.command == 'batch':
+        from .batch import run_batch
+        results = run_batch(args.root, formats=_selected_formats(args), workers=args.workers,
+                            use_cache=use_cache)
+        return 0 if results['failed'] == 0 else 1
+
+    if args.command == 'volume':
+        from .volume import build_volume
+        results = build_volume(args.root, output_file=args.output, title=args.title)
+        return 0 if results['output'] and results['failed'] == 0 else 1
+
+    if args.command == 'watch':
+        from .watch import watch_reports
+        return watch_reports(args.dir, formats=_selected_formats(args), debounce=args.debounce)
+
+    if args.formats:
+        from .pipeline import generate_formats, parse_formats
+        try:
+            formats = parse_formats(args.formats)
+        except ValueError as e:
+            parser.error(f"--formats: {e}")
+        print(f"Generating {', '.join(formats)} reports...")
+        results = generate_formats(formats=formats, use_cache=use_cache)
+        if results['failed'] == 0:
+            print("\nReport generation completed successfully!")
+            return 0
+        else:
+            print("\nSome reports failed to generate")
+            return 1
+
     if getattr(args, 'all'):
+        from .pipeline import generate_formats
         print("Generating Word and PDF reports...")
-        docx_success = generate_report_from_content()
-        pdf_success = generate_pdf_with_typst()
-        if docx_success and pdf_success:
+        results = generate_formats(formats=('docx', 'pdf'), use_cache=use_cache)
+        if results['failed'] == 0:
             print("\nReport generation completed successfully!")
             return 0
         else:
@@ -556,7 +928,7 @@ Examples:
             return 1
     elif args.typst:
         print("Generating PDF report with Typst...")
-        success = generate_pdf_with_typst()
+        success = generate_pdf_with_typst(use_cache=use_cache)
         if success:
             print("\nPDF generation completed successfully!")
             return 0
@@ -566,7 +938,7 @@ Examples:
     else:
         # Default: generate Word report
         print("Starting auto-report generation...")
-        success = generate_report_from_content()
+        success = generate_report_from_content(use_cache=use_cache)
         
         if success:
             print("\nReport generation completed successfully!")
@@ -0,0 +1,159 @@
+"""Batch report generation across many project folders."""
+
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .common import get_tracer, print_results_summary, span, start_tracing, stop_tracing, traced
+
+
+def discover_projects(root_dir="reports"):
+    """Find every project folder below the root directory.
+
+    A project folder is any direct subfolder that contains a content.md file,
+    following the ``reports/<project>/`` layout.
+
+    Args:
+        root_dir (str or Path): Directory holding one folder per project
+
+    Returns:
+        list: Sorted list of project folder paths
+    """
+    root_path = Path(root_dir)
+    if not root_path.is_dir():
+        return []
+
+    return sorted(
+        item for item in root_path.iterdir()
+        if item.is_dir() and not item.name.startswith('.')
+        and (item / 'content.md').is_file()
+    )
+
+
+def build_project(project_dir, formats=('docx',), use_cache=True, trace=False):
+    """Build the requested report formats for a single project folder.
+
+    Console output from the generators is captured so that parallel workers
+    do not interleave their messages.
+
+    Args:
+        project_dir (str or Path): Project folder containing content.md
+        formats (tuple): Formats to build, any of 'docx' and 'pdf'
+        use_cache (bool): Reuse cached reports when the inputs are unchanged
+        trace (bool): Record spans in this worker process and return them
+            under 'trace_events'
+
+    Returns:
+        dict: Result with project name, success flag, error and captured log
+    """
+    if trace:
+        start_tracing()
+        try:
+            result = build_project(project_dir, formats, use_cache)
+        finally:
+            tracer = stop_tracing()
+        result['trace_events'] = tracer.events
+        return result
+
+    from .autorpt import generate_pdf_with_typst, generate_report_from_content
+
+    builders = {
+        'docx': generate_report_from_content,
+        'pdf': generate_pdf_with_typst,
+    }
+
+    project_dir = Path(project_dir)
+    result = {'project': project_dir.name, 'success': True, 'error': None}
+    log = io.StringIO()
+
+    with contextlib.redirect_stdout(log), span('build_project', 'batch', project=project_dir.name):
+        for fmt in formats:
+            try:
+                ok = builders[fmt](project_dir, use_cache=use_cache)
+            except Exception as e:
+                print(f"❌ Unexpected error building {fmt}: {e}")
+                ok = False
+            if not ok:
+                result['success'] = False
+                result['error'] = f"{fmt} generation failed"
+
+    result['log'] = log.getvalue()
+    if not result['success']:
+        # Point the summary at the generator's own error message
+        errors = [line.strip() for line in result['log'].splitlines()
+                  if line.startswith('❌')]
+        if errors:
+            result['error'] = errors[-1].lstrip('❌ ').strip()
+    return result
+
+
+@traced('run_batch', 'batch')
+def run_batch(root_dir="reports", formats=('docx',), workers=None, use_cache=True):
+    """Build reports for every project folder using a process pool.
+
+    Args:
+        root_dir (str or Path): Directory holding one folder per project
+        formats (tuple): Formats to build, any of 'docx' and 'pdf'
+        workers (int): Number of worker processes (default: CPU count).
+            A value of 1 builds the projects serially in this process.
+        use_cache (bool): Reuse cached reports when the inputs are unchanged
+
+    Returns:
+        dict: Summary with success/failed/errors/discovered keys and the
+        per-project results under 'projects'
+    """
+    projects = discover_projects(root_dir)
+    results = {
+        'success': 0,
+        'failed': 0,
+        'errors': [],
+        'discovered': len(projects),
+        'projects': [],
+    }
+
+    if not projects:
+        print(f"ℹ️  No project folders with content.md found in {root_dir}")
+        return results
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(projects)))
+    print(f"📁 Building {len(projects)} project(s) with {workers} worker(s)...")
+
+    # Worker processes return their spans to be merged into this trace
+    tracer = get_tracer()
+
+    def record(project_result):
+        if tracer is not None and 'trace_events' in project_result:
+            tracer.extend(project_result.pop('trace_events'))
+        results['projects'].append(project_result)
+        if project_result['success']:
+            results['success'] += 1
+            print(f"   ✅ {project_result['project']}")
+        else:
+            results['failed'] += 1
+            message = f"{project_result['project']}: {project_result['error']}"
+            results['errors'].append(message)
+            print(f"   ❌ {message}")
+
+    if workers == 1:
+        for project_dir in projects:
+            record(build_project(project_dir, formats, use_cache))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(build_project, project_dir, formats, use_cache,
+                                tracer is not None): project_dir
+                for project_dir in projects
+            }
+            for future in as_completed(futures):
+                try:
+                    record(future.result())
+                except Exception as e:
+                    record({'project': futures[future].name, 'success': False,
+                            'error': str(e), 'log': ''})
+
+    results['projects'].sort(key=lambda r: r['project'])
+    print_results_summary(results, "Batch Build")
+    return results
@@ -0,0 +1,258 @@
+"""In-process report building from explicit inputs.
+
+ReportBuilder renders a report from content.md text and the tables its
+placeholders reference, and returns the document as bytes. Unlike the
+command-line functions it never reads from or writes to the working
+directory, prints nothing and keeps no state outside the builder, so
+services can embed autorpt and build reports concurrently from threads::
+
+    from autorpt.builder import ReportBuilder
+
+    builder = ReportBuilder(content_text, tables={'budget.xlsx': budget_df})
+    docx_bytes = builder.build('docx')
+"""
+
+import io
+import os
+import threading
+from pathlib import Path
+
+from .placeholders import compile_plan, missing_tables
+from .timings import stage
+
+BUILD_FORMATS = ('docx', 'pdf', 'html', 'md')
+
+
+class ReportBuildError(Exception):
+    """Raised when a report cannot be built from the given inputs."""
+
+
+def _read_source(source, binary=False):
+    """Return the contents of a path, file object, string or bytes input.
+
+    A str is taken as the contents themselves; pass a Path to read a file.
+    """
+    if isinstance(source, os.PathLike):
+        path = Path(source)
+        return path.read_bytes() if binary else path.read_text(encoding='utf-8')
+    if hasattr(source, 'read'):
+        source = source.read()
+    if binary and isinstance(source, str):
+        return source.encode('utf-8')
+    if not binary and isinstance(source, bytes):
+        return source.decode('utf-8')
+    return source
+
+
+def _table_source(source):
+    """Normalize a table input to a DataFrame, a workbook path or workbook bytes."""
+    if isinstance(source, (str, os.PathLike)):
+        return Path(source)
+    if hasattr(source, 'read'):
+        # Read file objects once so that every build sees the whole workbook
+        return source.read()
+    return source
+
+
+class ReportBuilder:
+    """Build reports in memory from explicit inputs.
+
+    Inputs are read when the builder is created, and tables when they are
+    first needed, so a builder can be shared between threads and build
+    any number of formats. Workbooks are parsed through the Excel frame
+    cache when they are given as paths.
+
+    Attributes:
+        plan (ReportPlan): The compiled content, its sections and table references
+    """
+
+    def __init__(self, content, tables=None, base_dir=None, template=None,
+                 require_tables=True, typst_timeout=None):
+        """Initialize the builder.
+
+        Args:
+            content (str, bytes, Path or file object): Markdown text,
+                optionally with YAML frontmatter. A str is the text itself.
+            tables (dict): Table inputs keyed by workbook name (e.g.
+                'budget.xlsx') or by TableRef for a single sheet. Values are
+                DataFrames, workbook paths, workbook bytes or binary file
+                objects. A DataFrame keyed by workbook name fills every
+                placeholder naming that workbook.
+            base_dir (str or Path): Folder holding workbooks not given in
+                tables and the default Typst template (report.typ)
+            template (str, bytes, Path or file object): Typst template that
+                includes "report_content.typ", needed for PDF output
+            require_tables (bool): Raise ReportBuildError when a referenced
+                table is missing or unreadable, instead of leaving it out
+            typst_timeout (float): Seconds allowed for each Typst compilation
+                (default: AUTORPT_TYPST_TIMEOUT, or 30)
+
+        Raises:
+            ReportBuildError: If the content cannot be read
+        """
+        try:
+            self.content_text = _read_source(content)
+            if template is not None:
+                template = _read_source(template)
+        except (OSError, UnicodeDecodeError) as e:
+            raise ReportBuildError(f"cannot read input: {e}") from e
+        self.plan = compile_plan(self.content_text)
+        self.base_dir = Path(base_dir) if base_dir is not None else None
+        self.template = template
+        self.require_tables = require_tables
+        self.typst_timeout = typst_timeout
+        self._sources = {key: _table_source(value) for key, value in (tables or {}).items()}
+        self._tables = None
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def _read_table(self, ref):
+        """Read one referenced sheet from the given inputs or base_dir."""
+        from .excel import read_excel, read_excel_cached
+
+        source = self._sources.get(ref)
+        if source is None:
+            source = self._sources.get(ref.file)
+        if source is None and self.base_dir is not None:
+            try:
+                source = ref.path(self.base_dir)
+            except ValueError as e:
+                raise ReportBuildError(str(e)) from e
+        if source is None:
+            raise ReportBuildError(f"{ref.label} was not given")
+
+        sheet_name = ref.sheet if ref.sheet is not None else 0
+        if isinstance(source, Path):
+            if not source.exists():
+                raise ReportBuildError(f"{source} not found")
+            return read_excel_cached(source, sheet_name=sheet_name)
+        if isinstance(source, (bytes, bytearray)):
+            with stage('read_excel', table=ref.label, bytes=len(source)):
+                return read_excel(io.BytesIO(source), sheet_name=sheet_name)
+        # Anything else is taken to be a DataFrame
+        return source
+
+    @property
+    def tables(self):
+        """DataFrames by TableRef for every referenced table, None for unreadable ones."""
+        with self._lock:
+            if self._tables is None:
+                tables = {}
+                for ref in self.plan.tables:
+                    try:
+                        tables[ref] = self._read_table(ref)
+                    except Exception as e:
+                        tables[ref] = None
+                        self._errors[ref] = str(e)
+                self._tables = tables
+            return self._tables
+
+    def _checked_tables(self):
+        """Return the tables, raising ReportBuildError for missing ones if required."""
+        tables = self.tables
+        if self.require_tables and missing_tables(tables):
+            details = '; '.join(self._errors[ref] for ref, df in tables.items() if df is None)
+            raise ReportBuildError(f"tables not available: {details}")
+        return tables
+
+    def docx(self):
+        """Return the Word report as bytes."""
+        from .autorpt import build_word_document
+
+        doc = build_word_document(self.content_text, tables=self._checked_tables())
+        buffer = io.BytesIO()
+        with stage('save_docx') as sizes:
+            doc.save(buffer)
+            sizes['bytes'] = buffer.tell()
+        return buffer.getvalue()
+
+    def typst(self):
+        """Return the Typst markup for report_content.typ, with every table inlined."""
+        from .autorpt import markdown_to_typst
+
+        return markdown_to_typst(self.content_text, tables=self._checked_tables())
+
+    def pdf(self):
+        """Return the Typst PDF report as bytes.
+
+        The template and generated content are compiled in a private
+        scratch workspace, so concurrent builds never share files. Assets
+        the template loads by relative path are taken from base_dir.
+
+        Raises:
+            ReportBuildError: If there is no template or Typst fails
+        """
+        from .typst_build import TypstError, compile_typst
+
+        template = self.template
+        if template is None and self.base_dir is not None:
+            template_file = self.base_dir / 'report.typ'
+            if template_file.exists():
+                template = template_file.read_text(encoding='utf-8')
+        if template is None:
+            raise ReportBuildError("a Typst template (report.typ) is needed for PDF output")
+
+        from .autorpt import markdown_to_typst
+
+        data_files = {}
+        typst_text = markdown_to_typst(self.content_text, tables=self._checked_tables(),
+                                       data_files=data_files)
+        try:
+            return compile_typst(template, typst_text, asset_dir=self.base_dir,
+                                 timeout=self.typst_timeout, data_files=data_files)
+        except TypstError as e:
+            raise ReportBuildError(str(e)) from e
+
+    def html(self, table_name='budget.xlsx'):
+        """Return the HTML report as text.
+
+        Args:
+            table_name (str): Workbook name shown above the budget table
+        """
+        from .pipeline import HTML_TABLE_CLASSES, build_html_report
+
+        with stage('build_html') as sizes:
+            tables = {
+                ref: df.to_html(classes=HTML_TABLE_CLASSES, index=False)
+                for ref, df in self._checked_tables().items() if df is not None
+            }
+            sizes['tables'] = len(tables)
+            return build_html_report(self.content_text,
+                                     title=self.plan.metadata.get('title', 'Report'),
+                                     table_name=table_name, tables=tables)
+
+    def build(self, fmt='docx'):
+        """Return the report in one of BUILD_FORMATS as bytes.
+
+        Raises:
+            ValueError: If the format is unknown
+            ReportBuildError: If the report cannot be built
+        """
+        if fmt == 'docx':
+            return self.docx()
+        if fmt == 'pdf':
+            return self.pdf()
+        if fmt == 'html':
+            return self.html().encode('utf-8')
+        if fmt == 'md':
+            return self.content_text.encode('utf-8')
+        raise ValueError(f"unknown format '{fmt}' (choose from {', '.join(BUILD_FORMATS)})")
+
+    def build_io(self, fmt='docx'):
+        """Return the report in one of BUILD_FORMATS as a BytesIO positioned at the start."""
+        return io.BytesIO(self.build(fmt))
+
+
+def build_report(content, fmt='docx', **options):
+    """Build one report from explicit inputs and return it as bytes.
+
+    Args:
+        content (str, bytes, Path or file object): Markdown text or file
+        fmt (str): One of BUILD_FORMATS
+        **options: tables, base_dir, template, require_tables and
+            typst_timeout, as for ReportBuilder
+
+    Returns:
+        bytes: The report
+    """
+    return ReportBuilder(content, **options).build(fmt)
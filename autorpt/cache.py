@@ -0,0 +1,180 @@
+"""Content-hash build cache for generated reports."""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .common import file_sha256, get_cache_dir
+
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+
+
+class BuildCache:
+    """Store generated report artifacts keyed by a hash of all their inputs.
+
+    Each entry lives in its own folder under the cache directory, holding
+    the artifact files and a meta.json with their names, total size and
+    last use time. Entries are written to a temporary folder and renamed
+    into place, so parallel batch workers never see half-written entries.
+    When the cache grows beyond ``max_bytes`` the least recently used
+    entries are evicted.
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=None):
+        """Initialize the cache.
+
+        Args:
+            cache_dir (str or Path): Cache folder (default: <autorpt cache>/builds)
+            max_bytes (int): Size limit for all entries (default: the
+                AUTORPT_CACHE_MAX_MB environment variable, or 500 MB)
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else get_cache_dir('builds')
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if max_bytes is None:
+            max_mb = os.environ.get('AUTORPT_CACHE_MAX_MB')
+            max_bytes = int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_MAX_BYTES
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(kind, input_files, extra=()):
+        """Compute the cache key for a build.
+
+        Args:
+            kind (str): Output kind, e.g. 'docx' or 'pdf'
+            input_files (list): Input file paths; missing files are recorded as absent
+            extra (tuple): Additional values that affect the output (e.g. the date)
+
+        Returns:
+            str: Hex digest identifying the build
+        """
+        from . import __version__
+
+        digest = hashlib.sha256()
+        digest.update(f"autorpt {__version__}\n{kind}\n".encode('utf-8'))
+        for input_file in input_files:
+            input_path = Path(input_file)
+            file_hash = file_sha256(input_path) if input_path.is_file() else 'absent'
+            digest.update(f"{input_path.name}:{file_hash}\n".encode('utf-8'))
+        for value in extra:
+            digest.update(f"{value}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_dir(self, key):
+        return self.cache_dir / key
+
+    def _read_meta(self, entry_dir):
+        try:
+            with open(entry_dir / 'meta.json', 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def restore(self, key, output_files):
+        """Copy the cached artifacts for a key to the given output paths.
+
+        Args:
+            key (str): Cache key from make_key
+            output_files (list): Destination paths, in the order the
+                artifacts were stored
+
+        Returns:
+            bool: True on a cache hit, False if the entry is missing or incomplete
+        """
+        entry_dir = self._entry_dir(key)
+        meta = self._read_meta(entry_dir)
+        if meta is None or len(meta.get('files', [])) != len(output_files):
+            return False
+
+        try:
+            for name, output_file in zip(meta['files'], output_files):
+                shutil.copyfile(entry_dir / name, output_file)
+        except OSError:
+            return False
+
+        # Record the use for LRU eviction
+        meta['last_used'] = time.time()
+        self._write_meta(entry_dir, meta)
+        return True
+
+    def put(self, key, artifact_files):
+        """Store the artifacts produced for a key.
+
+        Args:
+            key (str): Cache key from make_key
+            artifact_files (list): Paths of the generated files
+
+        Returns:
+            bool: True if the entry was stored
+        """
+        entry_dir = self._entry_dir(key)
+        if entry_dir.exists():
+            return True
+
+        try:
+            staging = Path(tempfile.mkdtemp(prefix='.tmp-', dir=self.cache_dir))
+        except OSError:
+            return False
+
+        try:
+            names = []
+            size = 0
+            for artifact_file in artifact_files:
+                artifact_path = Path(artifact_file)
+                shutil.copyfile(artifact_path, staging / artifact_path.name)
+                names.append(artifact_path.name)
+                size += artifact_path.stat().st_size
+            self._write_meta(staging, {'files': names, 'size': size, 'last_used': time.time()})
+            os.rename(staging, entry_dir)
+        except OSError:
+            # Another worker stored the same key first, or the disk is full
+            shutil.rmtree(staging, ignore_errors=True)
+            return entry_dir.exists()
+
+        self.evict()
+        return True
+
+    def _write_meta(self, entry_dir, meta):
+        tmp_file = entry_dir / f'meta.json.{os.getpid()}'
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(tmp_file, entry_dir / 'meta.json')
+        except OSError:
+            pass
+
+    def entries(self):
+        """Return (key, meta) pairs for every complete cache entry."""
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.is_dir() and not entry_dir.name.startswith('.'):
+                meta = self._read_meta(entry_dir)
+                if meta is not None:
+                    entries.append((entry_dir.name, meta))
+        return entries
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits its size limit.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = sorted(self.entries(), key=lambda item: item[1].get('last_used', 0))
+        total = sum(meta.get('size', 0) for _, meta in entries)
+        removed = 0
+        for key, meta in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= meta.get('size', 0)
+            removed += 1
+        return removed
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        for entry_dir in self.cache_dir.iterdir():
+            if entry_dir.is_dir():
+                shutil.rmtree(entry_dir, ignore_errors=True)
@@ -2,6 +2,10 @@
 
 import sys
 import os
+import hashlib
+import json
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
 
@@ -130,6 +134,50 @@ def ensure_reports_directory(reports_dir="reports"):
     return reports_path
 
 
+def get_cache_dir(subdir=None):
+    """
+    Get the autorpt cache directory, creating it if necessary.
+
+    The location is taken from the AUTORPT_CACHE_DIR environment variable,
+    falling back to $XDG_CACHE_HOME/autorpt or ~/.cache/autorpt.
+
+    Args:
+        subdir (str): Optional subdirectory inside the cache directory
+
+    Returns:
+        Path: Path object for the cache directory
+    """
+    cache_dir = os.environ.get('AUTORPT_CACHE_DIR')
+    if cache_dir:
+        cache_path = Path(cache_dir)
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache'
+        cache_path = Path(base) / 'autorpt'
+
+    if subdir:
+        cache_path = cache_path / subdir
+    cache_path.mkdir(parents=True, exist_ok=True)
+    return cache_path
+
+
+def file_sha256(filepath, chunk_size=1024 * 1024):
+    """
+    Compute the SHA-256 hex digest of a file's contents.
+
+    Args:
+        filepath (str): Path to the file
+        chunk_size (int): Number of bytes read at a time
+
+    Returns:
+        str: Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def generate_timestamped_filename(base_name, extension=".docx", include_time=False):
     """
     Generate a filename with timestamp.
@@ -216,3 +264,258 @@ def get_file_list_by_pattern(directory, patterns, recursive=True):
             files.extend(directory.glob(pattern))
 
     return sorted(list(set(files)))  # Remove duplicates and sort
+
+
+# Tracer receiving spans, or None while tracing is off
+_tracer = None
+
+
+class Tracer:
+    """
+    Collect spans as Chrome trace events.
+
+    Every span becomes a complete ("X") event whose timestamp is taken from
+    the wall clock in microseconds since the Unix epoch, so traces recorded
+    by different processes (batch workers, web app instances) line up on
+    one timeline when merged.
+    """
+
+    def __init__(self, jsonl_file=None):
+        """
+        Initialize the tracer.
+
+        Args:
+            jsonl_file (str): Optional JSON lines file that every event is
+                appended to as soon as its span ends, for long-running
+                processes such as the web app
+        """
+        self.events = []
+        self._lock = threading.Lock()
+        self._stream = open(jsonl_file, 'a', encoding='utf-8') if jsonl_file else None
+        self._named_threads = set()
+        self.add(self._metadata('process_name', 0, f"autorpt {os.getpid()}"))
+
+    def _metadata(self, kind, tid, name):
+        return {'name': kind, 'ph': 'M', 'pid': os.getpid(), 'tid': tid,
+                'args': {'name': name}}
+
+    def add(self, event):
+        """Record one trace event."""
+        with self._lock:
+            tid = event.get('tid', 0)
+            if event.get('ph') != 'M' and tid not in self._named_threads:
+                self._named_threads.add(tid)
+                self._append(self._metadata('thread_name', tid,
+                                            threading.current_thread().name))
+            self._append(event)
+
+    def extend(self, events):
+        """Record events collected elsewhere, e.g. by a batch worker process."""
+        with self._lock:
+            for event in events:
+                self._append(event)
+
+    def _append(self, event):
+        self.events.append(event)
+        if self._stream is not None:
+            self._stream.write(json.dumps(event) + '\n')
+            self._stream.flush()
+
+    def close(self):
+        """Close the JSON lines stream, if any."""
+        with self._lock:
+            if self._stream is not None:
+                self._stream.close()
+                self._stream = None
+
+    def export_chrome(self, output_file):
+        """
+        Write the events as Chrome trace-event JSON.
+
+        The file opens in Perfetto (ui.perfetto.dev) and chrome://tracing.
+
+        Args:
+            output_file (str): Path of the .json file to write
+        """
+        with self._lock:
+            events = list(self.events)
+        _write_chrome_trace(events, output_file)
+
+    def export_jsonl(self, output_file):
+        """
+        Write the events as JSON lines, one event per line.
+
+        Args:
+            output_file (str): Path of the .jsonl file to write
+        """
+        with self._lock:
+            events = list(self.events)
+        _write_jsonl_trace(events, output_file)
+
+    def export(self, output_file):
+        """Write JSON lines for .jsonl files and Chrome trace JSON otherwise."""
+        if str(output_file).endswith('.jsonl'):
+            self.export_jsonl(output_file)
+        else:
+            self.export_chrome(output_file)
+
+
+def _write_chrome_trace(events, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
+def _write_jsonl_trace(events, output_file):
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for event in events:
+            f.write(json.dumps(event) + '\n')
+
+
+class _Span:
+    """Context manager recording one span; does nothing while tracing is off."""
+
+    __slots__ = ('tracer', 'name', 'category', 'args', 'start_us', 'start_ns')
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        if self.tracer is not None:
+            self.start_us = time.time_ns() // 1000
+            self.start_ns = time.perf_counter_ns()
+        return self.args
+
+    def __exit__(self, exc_type, exc, tb):
+        tracer = self.tracer
+        if tracer is None:
+            return False
+        duration_us = (time.perf_counter_ns() - self.start_ns) / 1000
+        args = {key: value if isinstance(value, (bool, int, float, str)) or value is None
+                else str(value) for key, value in self.args.items()}
+        if exc_type is not None:
+            args['error'] = f"{exc_type.__name__}: {exc}"
+        tracer.add({
+            'name': self.name,
+            'cat': self.category,
+            'ph': 'X',
+            'ts': self.start_us,
+            'dur': duration_us,
+            'pid': os.getpid(),
+            'tid': threading.get_ident(),
+            'args': args,
+        })
+        return False
+
+
+def span(name, category='autorpt', **args):
+    """
+    Record a span around a block of work if tracing is on.
+
+    While tracing is off this only creates a small object, so spans can
+    wrap every I/O and rendering step.
+
+    Example:
+        with span('read_excel', bytes=size) as args:
+            df = read_excel(path)
+            args['rows'] = len(df)
+
+    Args:
+        name (str): Span name
+        category (str): Span category, e.g. 'io', 'render' or 'http'
+        **args: Values shown with the span; the yielded dict may be
+            updated inside the block
+
+    Returns:
+        A context manager yielding the args dict
+    """
+    return _Span(_tracer, name, category, args)
+
+
+def traced(name=None, category='autorpt'):
+    """
+    Decorate a function so each call is recorded as a span.
+
+    Args:
+        name (str): Span name (default: the function's qualified name)
+        category (str): Span category
+
+    Returns:
+        function: Decorator
+    """
+    import functools
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _Span(_tracer, span_name, category, {}):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def start_tracing(jsonl_file=None):
+    """
+    Start recording spans in this process.
+
+    Args:
+        jsonl_file (str): Optional JSON lines file events are streamed to
+
+    Returns:
+        Tracer: The active tracer
+    """
+    global _tracer
+    _tracer = Tracer(jsonl_file)
+    return _tracer
+
+
+def stop_tracing():
+    """
+    Stop recording spans.
+
+    Returns:
+        Tracer: The tracer that was active, or None
+    """
+    global _tracer
+    tracer, _tracer = _tracer, None
+    if tracer is not None:
+        tracer.close()
+    return tracer
+
+
+def get_tracer():
+    """Return the active tracer, or None while tracing is off."""
+    return _tracer
+
+
+def merge_traces(trace_files, output_file):
+    """
+    Merge Chrome trace JSON and JSON lines files into one timeline.
+
+    Args:
+        trace_files (list): Trace files written by separate processes
+        output_file (str): Merged file (.jsonl for JSON lines, else Chrome JSON)
+
+    Returns:
+        int: Number of events written
+    """
+    events = []
+    for trace_file in trace_files:
+        with open(trace_file, 'r', encoding='utf-8') as f:
+            if str(trace_file).endswith('.jsonl'):
+                events.extend(json.loads(line) for line in f if line.strip())
+            else:
+                events.extend(json.load(f).get('traceEvents', []))
+    events.sort(key=lambda event: event.get('ts', 0))
+
+    if str(output_file).endswith('.jsonl'):
+        _write_jsonl_trace(events, output_file)
+    else:
+        _write_chrome_trace(events, output_file)
+    return len(events)
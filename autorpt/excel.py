@@ -0,0 +1,220 @@
+"""Excel reading with a choice of engine and a persistent cache of parsed worksheets."""
+
+import hashlib
+import importlib.util
+import os
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from .common import file_sha256, get_cache_dir
+
+try:
+    import pyarrow  # noqa: F401
+    FEATHER_AVAILABLE = True
+except ImportError:
+    FEATHER_AVAILABLE = False
+
+# python-calamine parses workbooks in Rust, several times faster than openpyxl
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+
+EXCEL_ENGINES = ('auto', 'calamine', 'openpyxl')
+
+# Parsed frames already seen by this process, keyed by (path, size, mtime, sheet)
+_memory_cache = {}
+_memory_lock = threading.Lock()
+MEMORY_CACHE_SIZE = 32
+
+# Size limit of the on-disk frame cache (AUTORPT_FRAME_CACHE_MAX_MB overrides it)
+DEFAULT_FRAME_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
+
+def resolve_engine(engine=None, excel_file=None):
+    """Return the pandas engine used to read workbooks.
+
+    Args:
+        engine (str): 'auto', 'calamine' or 'openpyxl' (default: the
+            AUTORPT_EXCEL_ENGINE environment variable, or 'auto'). 'auto'
+            picks calamine when python-calamine is installed and otherwise
+            openpyxl for .xlsx/.xlsm files.
+        excel_file (str or Path): Workbook to be read, used by 'auto' to
+            leave other formats such as .xls to pandas' default reader
+
+    Returns:
+        str: The engine name passed to pandas.read_excel, or None for
+        pandas' default
+
+    Raises:
+        ValueError: If the engine is unknown, or calamine is requested but
+            not installed
+    """
+    engine = (engine or os.environ.get('AUTORPT_EXCEL_ENGINE') or 'auto').lower()
+    if engine not in EXCEL_ENGINES:
+        raise ValueError(f"unknown Excel engine '{engine}' (choose from {', '.join(EXCEL_ENGINES)})")
+    if engine == 'auto':
+        if CALAMINE_AVAILABLE:
+            return 'calamine'
+        if excel_file is None or Path(excel_file).suffix.lower() in ('.xlsx', '.xlsm'):
+            return 'openpyxl'
+        return None
+    if engine == 'calamine' and not CALAMINE_AVAILABLE:
+        raise ValueError("the calamine engine needs python-calamine: pip install python-calamine")
+    return engine
+
+
+def read_excel(excel_file, sheet_name=0, engine=None, usecols=None, nrows=None, header=0,
+               dtype=None):
+    """Read one worksheet with the selected engine and reading hints.
+
+    pandas opens workbooks with openpyxl in read-only mode, streaming rows
+    without loading styles; calamine avoids building Python cell objects
+    at all. nrows stops reading after that many data rows, and usecols
+    drops the other columns while parsing.
+
+    Args:
+        excel_file (str or Path): Path to the Excel workbook
+        sheet_name (str or int): Sheet name or index (default: first sheet)
+        engine (str): 'auto', 'calamine' or 'openpyxl' (see resolve_engine)
+        usecols (str or list): Columns to keep, e.g. 'A:D' or ['Task', 'Spent']
+        nrows (int): Number of data rows to read
+        header (int): Row number holding the column names (None for no header)
+        dtype (dict): Column types, e.g. {'Task': str}
+
+    Returns:
+        DataFrame: The worksheet contents
+    """
+    return pd.read_excel(excel_file, sheet_name=sheet_name,
+                         engine=resolve_engine(engine, excel_file),
+                         usecols=usecols, nrows=nrows, header=header, dtype=dtype)
+
+
+def _frame_cache_name(content_hash, sheet_name, options=''):
+    """Return the file stem of the on-disk cache entry for a worksheet"""
+    options = f"{sheet_name!r}|{options}|pandas {pd.__version__}"
+    options_hash = hashlib.sha256(options.encode('utf-8')).hexdigest()[:16]
+    return f"{content_hash}-{options_hash}"
+
+
+def _frame_cache_max_bytes():
+    """Return the size limit of the on-disk frame cache"""
+    max_mb = os.environ.get('AUTORPT_FRAME_CACHE_MAX_MB')
+    return int(float(max_mb) * 1024 * 1024) if max_mb else DEFAULT_FRAME_CACHE_MAX_BYTES
+
+
+def _load_cached_frame(cache_dir, stem):
+    """Load a parsed frame from the disk cache, or return None"""
+    feather_file = cache_dir / f"{stem}.feather"
+    try:
+        df = pd.read_feather(feather_file)
+        # The modification time records the last use for eviction
+        os.utime(feather_file)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # A corrupt or incompatible entry is simply re-parsed
+        return None
+    return df
+
+
+def _store_cached_frame(cache_dir, stem, df):
+    """Write a parsed frame to the disk cache as Feather"""
+    target = cache_dir / f"{stem}.feather"
+    tmp_file = target.with_name(f"{target.name}.tmp{os.getpid()}-{threading.get_ident()}")
+    try:
+        df.to_feather(tmp_file)
+        os.replace(tmp_file, target)
+    except Exception:
+        # Mixed-type or non-string columns cannot be stored as Arrow; such
+        # frames are only kept in memory
+        tmp_file.unlink(missing_ok=True)
+
+
+def _evict_frames(cache_dir, max_bytes):
+    """Delete the least recently used frames until the disk cache fits max_bytes"""
+    entries = []
+    with os.scandir(cache_dir) as scan:
+        for entry in scan:
+            if entry.name.endswith('.pkl'):
+                # Pickled frames of earlier versions are no longer read
+                Path(entry.path).unlink(missing_ok=True)
+            elif entry.name.endswith('.feather'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        Path(path).unlink(missing_ok=True)
+        total -= size
+
+
+def read_excel_cached(excel_file, sheet_name=0, use_cache=True, **options):
+    """Read one worksheet into a DataFrame, reusing earlier parses of the same workbook.
+
+    Parsed worksheets are kept in memory keyed by path, size and modification
+    time, and, when pyarrow is installed, on disk as Feather files keyed by
+    the SHA-256 of the workbook contents. Editing or replacing the workbook
+    changes its stat and hash, so stale entries are never returned. The
+    least recently used files are deleted once the disk cache grows beyond
+    AUTORPT_FRAME_CACHE_MAX_MB (default 200 MB).
+
+    Args:
+        excel_file (str or Path): Path to the Excel workbook
+        sheet_name (str or int): Sheet name or index (default: first sheet)
+        use_cache (bool): Set to False to always parse the workbook
+        **options: engine, usecols, nrows, header and dtype, as for read_excel
+
+    Returns:
+        DataFrame: The worksheet contents (a copy that callers may modify)
+    """
+    excel_path = Path(excel_file)
+    options['engine'] = resolve_engine(options.get('engine'), excel_path)
+    if not use_cache:
+        return read_excel(excel_path, sheet_name=sheet_name, **options)
+
+    # Engines and hints change the parsed frame, so they are part of the keys
+    options_key = repr(sorted(options.items()))
+    stat = excel_path.stat()
+    memory_key = (str(excel_path.resolve()), stat.st_size, stat.st_mtime_ns, sheet_name,
+                  options_key)
+    with _memory_lock:
+        df = _memory_cache.get(memory_key)
+    if df is not None:
+        return df.copy()
+
+    cache_dir = None
+    if FEATHER_AVAILABLE:
+        try:
+            cache_dir = get_cache_dir('frames')
+        except OSError:
+            pass
+
+    df = None
+    if cache_dir:
+        stem = _frame_cache_name(file_sha256(excel_path), sheet_name, options_key)
+        df = _load_cached_frame(cache_dir, stem)
+    if df is None:
+        df = read_excel(excel_path, sheet_name=sheet_name, **options)
+        if cache_dir:
+            _store_cached_frame(cache_dir, stem, df)
+            try:
+                _evict_frames(cache_dir, _frame_cache_max_bytes())
+            except OSError:
+                pass
+
+    with _memory_lock:
+        if len(_memory_cache) >= MEMORY_CACHE_SIZE:
+            _memory_cache.pop(next(iter(_memory_cache)))
+        _memory_cache[memory_key] = df
+    return df.copy()
+
+
+def clear_memory_cache():
+    """Forget the parsed frames held by this process."""
+    with _memory_lock:
+        _memory_cache.clear()
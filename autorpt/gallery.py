@@ -0,0 +1,118 @@
+"""In-process index of the saved reports shown in the web app's gallery.
+
+Each saved report is a folder in reports/ holding a content.md. The index
+keeps every folder's metadata together with the modification times it was
+read at, and on each listing only re-reads the frontmatter of folders
+whose directory or content.md changed since, so listing thousands of
+saved reports costs a few stat calls per folder. A signature of the
+indexed state lets the web app answer repeated requests with ETags.
+"""
+
+import hashlib
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from .sections import split_frontmatter
+
+GALLERY_SORT_KEYS = ('modified', 'name', 'title', 'project', 'date')
+
+
+def read_frontmatter(content_file):
+    """Return the frontmatter of a markdown file, reading no further than its end."""
+    lines = []
+    with open(content_file, 'r', encoding='utf-8') as f:
+        for number, line in enumerate(f):
+            lines.append(line.rstrip('\n'))
+            if number == 0 and line.strip() != '---':
+                return {}
+            if number > 0 and line.strip() == '---':
+                break
+    metadata, _ = split_frontmatter('\n'.join(lines))
+    return metadata
+
+
+class GalleryIndex:
+    """Metadata of the saved report folders in a directory, kept current by mtime."""
+
+    def __init__(self, root):
+        """Initialize an empty index of root's subfolders.
+
+        Args:
+            root (str or Path): Folder holding one subfolder per saved report
+        """
+        self.root = Path(root)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _stamp(self, folder):
+        """Return the modification times that invalidate a folder's entry"""
+        content_file = os.path.join(folder.path, 'content.md')
+        try:
+            content = os.stat(content_file)
+            content_stamp = (content.st_mtime_ns, content.st_size)
+        except OSError:
+            content_stamp = None
+        return folder.stat().st_mtime_ns, content_stamp
+
+    def _read_entry(self, folder, stamp):
+        """Build a folder's gallery entry from its content.md frontmatter"""
+        meta = {}
+        if stamp[1] is not None:
+            try:
+                meta = read_frontmatter(os.path.join(folder.path, 'content.md'))
+            except (OSError, UnicodeDecodeError):
+                meta = {}
+        return {
+            'name': folder.name,
+            'title': meta.get('title', folder.name),
+            'project': meta.get('project', ''),
+            'date': meta.get('date', ''),
+            'modified': datetime.fromtimestamp(stamp[0] / 1e9).isoformat(),
+        }
+
+    def refresh(self):
+        """Bring the index up to date and return a signature of its state.
+
+        Returns:
+            str: A hash that changes whenever any listed entry changes
+        """
+        folders = []
+        if self.root.exists():
+            with os.scandir(self.root) as entries:
+                folders = [entry for entry in entries
+                           if entry.is_dir() and not entry.name.startswith('.')]
+
+        with self._lock:
+            current = {}
+            for folder in folders:
+                try:
+                    stamp = self._stamp(folder)
+                except OSError:
+                    continue
+                cached = self._entries.get(folder.name)
+                if cached is None or cached[0] != stamp:
+                    cached = (stamp, self._read_entry(folder, stamp))
+                current[folder.name] = cached
+            self._entries = current
+
+            digest = hashlib.sha256()
+            for name in sorted(current):
+                digest.update(repr((name, current[name][0])).encode('utf-8'))
+            return digest.hexdigest()[:32]
+
+    def listing(self, sort='modified', descending=True):
+        """Return every entry sorted by one of GALLERY_SORT_KEYS.
+
+        Raises:
+            ValueError: If the sort key is unknown
+        """
+        if sort not in GALLERY_SORT_KEYS:
+            raise ValueError(f"unknown sort '{sort}' (choose from {', '.join(GALLERY_SORT_KEYS)})")
+        with self._lock:
+            entries = [entry for _, entry in self._entries.values()]
+        # Ties keep a stable order by folder name
+        entries.sort(key=lambda entry: entry['name'])
+        entries.sort(key=lambda entry: str(entry[sort]).lower(), reverse=descending)
+        return entries
@@ -6,6 +6,10 @@ from pathlib import Path
 from docx import Document
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 
+from .common import span, traced
+from .excel import read_excel_cached
+from .sections import parse_sections, split_frontmatter
+
 
 class AutoReportGenerator:
     """Convert markdown files and Excel tables to Word document sections with proper formatting."""
@@ -86,6 +90,7 @@ class AutoReportGenerator:
 
         return discovered
 
+    @traced('gen_auto.parse_markdown_file', 'io')
     def parse_markdown_file(self, markdown_file_path):
         """Parse a markdown file and extract structured content.
 
@@ -110,13 +115,16 @@ class AutoReportGenerator:
 
         return self._parse_markdown_content(content)
 
-    def parse_excel_file(self, excel_file_path, sheet_name=None, table_title=None):
+    @traced('gen_auto.parse_excel_file', 'io')
+    def parse_excel_file(self, excel_file_path, sheet_name=None, table_title=None, **read_options):
         """Parse an Excel file and extract table data.
 
         Args:
             excel_file_path (str or Path): Path to the Excel file
             sheet_name (str): Optional sheet name to read (default: first sheet)
             table_title (str): Optional title for the table
+            **read_options: Reader engine and hints (engine, usecols, nrows,
+                header, dtype), see autorpt.excel.read_excel
 
         Returns:
             dict: Dictionary with table data and metadata
@@ -130,9 +138,9 @@ class AutoReportGenerator:
         try:
             # Read Excel file
             if sheet_name:
-                data = pd.read_excel(excel_path, sheet_name=sheet_name)
+                data = read_excel_cached(excel_path, sheet_name=sheet_name, **read_options)
             else:
-                data = pd.read_excel(excel_path)
+                data = read_excel_cached(excel_path, **read_options)
 
             # Get sheet info for title if not provided
             if not table_title:
@@ -161,55 +169,37 @@ class AutoReportGenerator:
             content (str): Raw markdown content
 
         Returns:
-            list: List of dictionaries with 'type', 'level', 'text', and 'content'
+            list: List of dictionaries with 'type', 'level', 'text', 'content'
+            and 'hash' (the section's content hash)
         """
-        blocks = []
-        lines = content.split('\n')
-        current_section = None
-        current_content = []
-
-        for line in lines:
-            # Check for headers (# ## ### etc.)
-            header_match = re.match(r'^(#{1,6})\s+(.+)', line.strip())
-
-            if header_match:
-                # Save previous section if exists
-                if current_section is not None:
-                    current_section['content'] = '\n'.join(
-                        current_content).strip()
-                    blocks.append(current_section)
-
-                # Start new section
-                level = len(header_match.group(1))  # Number of # characters
-                title = header_match.group(2).strip()
-
-                current_section = {
-                    'type': 'header',
-                    'level': level,
-                    'text': title,
-                    'content': ''
-                }
-                current_content = []
-            else:
-                # Add line to current content
-                current_content.append(line)
-
-        # Save last section
-        if current_section:
-            current_section['content'] = '\n'.join(current_content).strip()
-            blocks.append(current_section)
+        _, body = split_frontmatter(content)
+        # Headers may be indented, as gen_auto has always accepted
+        sections = parse_sections(body, max_level=6, indented_headers=True)
+
+        blocks = [
+            {
+                'type': 'header',
+                'level': section['level'],
+                'text': section['title'],
+                'content': section['content'].strip(),
+                'hash': section['hash'],
+            }
+            for section in sections if section['level'] > 0
+        ]
 
         # If no headers found, treat entire content as one block
-        if not blocks and content.strip():
+        if not blocks and body.strip():
             blocks.append({
                 'type': 'content',
                 'level': 0,
                 'text': '',
-                'content': content.strip()
+                'content': body.strip(),
+                'hash': sections[0]['hash'],
             })
 
         return blocks
 
+    @traced('gen_auto.add_markdown_to_document', 'render')
     def add_markdown_to_document(self, markdown_file_path, start_header_level=1):
         """Add markdown content to the Word document with proper formatting.
 
@@ -241,6 +231,7 @@ class AutoReportGenerator:
 
         return True
 
+    @traced('gen_auto.add_excel_table_to_document', 'render')
     def add_excel_table_to_document(self, excel_file_path, sheet_name=None, table_title=None,
                                     include_header=True, start_header_level=1):
         """Add Excel table to the Word document with proper formatting.
@@ -511,7 +502,8 @@ class AutoReportGenerator:
 
         # Save document
         try:
-            self.document.save(output_path)
+            with span('gen_auto.save_docx', 'io', file=str(output_path)):
+                self.document.save(output_path)
             print(f"✅ Auto-generated report saved: {output_path}")
             print(
                 f"📊 Processed {results['success']} files successfully, {results['failed']} failed")
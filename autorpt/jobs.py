@@ -0,0 +1,211 @@
+"""Background report jobs for the web interface.
+
+Report builds are submitted to a bounded thread pool and the request
+returns a job id straight away. Each job's record (status, progress and,
+when finished, the output file) is kept as a small JSON file, so clients
+can poll it or follow it as Server-Sent Events, and finished jobs are
+still listed after a server restart.
+"""
+
+import json
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Job records kept in memory and on disk; older finished ones are removed
+MAX_JOB_RECORDS = 500
+
+
+def default_workers():
+    """Return the number of concurrent jobs (AUTORPT_WEB_WORKERS, default up to 4)."""
+    value = os.environ.get('AUTORPT_WEB_WORKERS')
+    if value and value.isdigit() and int(value) > 0:
+        return int(value)
+    return min(4, os.cpu_count() or 1)
+
+
+class JobQueue:
+    """Run jobs in a bounded thread pool and persist their records.
+
+    A job's status goes from 'queued' to 'running' and then 'done' or
+    'failed'; its version grows with every change of the record.
+
+    A job function is called as ``func(progress, *args)``; it reports
+    progress with ``progress(message, percent)`` and returns a dict of
+    fields (such as 'filename') added to the finished job's record. An
+    exception fails the job with its message as the error.
+    """
+
+    def __init__(self, jobs_dir, workers=None):
+        """Initialize the queue; the records of earlier runs are loaded when first used.
+
+        Jobs still queued or running when the server stopped are marked as
+        failed, since their work was lost with the process. Neither the
+        folder nor the pool threads are created before the queue is used.
+
+        Args:
+            jobs_dir (str or Path): Folder holding one JSON record per job
+            workers (int): Jobs run at once (default: default_workers())
+        """
+        self.jobs_dir = Path(jobs_dir)
+        self.workers = workers or default_workers()
+        self._executor = None
+        self._jobs = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+
+    def _records(self):
+        """Return the job records by id, loading earlier runs' on first use (lock held)"""
+        if self._jobs is None:
+            self.jobs_dir.mkdir(parents=True, exist_ok=True)
+            self._jobs = {}
+            self._load()
+        return self._jobs
+
+    def _load(self):
+        """Read the job records written by earlier runs"""
+        records = []
+        for record_file in self.jobs_dir.glob('*.json'):
+            try:
+                with open(record_file, 'r', encoding='utf-8') as f:
+                    records.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        records.sort(key=lambda job: job.get('created', ''), reverse=True)
+
+        for job in records[MAX_JOB_RECORDS:]:
+            (self.jobs_dir / f"{job['id']}.json").unlink(missing_ok=True)
+        for job in records[:MAX_JOB_RECORDS]:
+            job.setdefault('version', 0)
+            if job.get('status') in ('queued', 'running'):
+                job.update(status='failed', error='Server restarted before the job finished',
+                           finished=datetime.now().isoformat())
+                self._save(job)
+            self._jobs[job['id']] = job
+
+    def _save(self, job):
+        """Write a job record atomically"""
+        record_file = self.jobs_dir / f"{job['id']}.json"
+        tmp_file = record_file.with_name(f".{record_file.name}.{threading.get_ident()}.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(job, f, indent=2)
+        os.replace(tmp_file, record_file)
+
+    def _update(self, job_id, **fields):
+        """Change a job's record, persist it and wake anyone waiting on it"""
+        with self._changed:
+            job = self._jobs[job_id]
+            job.update(fields)
+            job['version'] += 1
+            self._save(job)
+            self._changed.notify_all()
+
+    def submit(self, func, *args, **info):
+        """Queue a job and return its record.
+
+        Args:
+            func (callable): Job function, called as func(progress, *args)
+            *args: Arguments passed on to func
+            **info: Fields stored in the record, such as 'format'
+
+        Returns:
+            dict: A copy of the new job's record
+        """
+        job = dict(info, id=uuid.uuid4().hex, status='queued', progress=0,
+                   message='Queued', error=None, created=datetime.now().isoformat(),
+                   started=None, finished=None, version=0)
+        with self._changed:
+            self._records()[job['id']] = job
+            self._save(job)
+            self._trim()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='autorpt-job')
+            executor = self._executor
+        executor.submit(self._run, job['id'], func, args)
+        return dict(job)
+
+    def _trim(self):
+        """Forget the oldest finished jobs beyond MAX_JOB_RECORDS (lock held)"""
+        excess = len(self._jobs) - MAX_JOB_RECORDS
+        if excess <= 0:
+            return
+        finished = sorted((job for job in self._jobs.values()
+                           if job['status'] in ('done', 'failed')),
+                          key=lambda job: job['created'])
+        for job in finished[:excess]:
+            del self._jobs[job['id']]
+            (self.jobs_dir / f"{job['id']}.json").unlink(missing_ok=True)
+
+    def _run(self, job_id, func, args):
+        """Run one job in a pool thread"""
+        self._update(job_id, status='running', message='Starting',
+                     started=datetime.now().isoformat())
+
+        def progress(message, percent=None):
+            fields = {'message': message}
+            if percent is not None:
+                fields['progress'] = percent
+            self._update(job_id, **fields)
+
+        try:
+            result = func(progress, *args) or {}
+        except Exception as e:
+            self._update(job_id, status='failed', error=str(e), message='Failed',
+                         finished=datetime.now().isoformat())
+            return
+        self._update(job_id, status='done', progress=100, message='Done',
+                     finished=datetime.now().isoformat(), **result)
+
+    def get(self, job_id):
+        """Return a copy of a job's record, or None if it is unknown."""
+        with self._lock:
+            job = self._records().get(job_id)
+            return dict(job) if job is not None else None
+
+    def wait(self, job_id, version, timeout=None):
+        """Wait until a job's record changes past version and return it.
+
+        Args:
+            job_id (str): Job to follow
+            version (int): Last version seen by the caller
+            timeout (float): Seconds to wait at most
+
+        Returns:
+            dict: A copy of the record (unchanged if the wait timed out),
+            or None if the job is unknown
+        """
+        with self._changed:
+            jobs = self._records()
+            self._changed.wait_for(
+                lambda: job_id not in jobs or jobs[job_id]['version'] > version,
+                timeout=timeout)
+            job = jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def recent(self, limit=20, **match):
+        """Return copies of the most recently created job records.
+
+        Args:
+            limit (int): Records to return at most
+            **match: Only return records whose fields have these values,
+                such as workspace='...'
+        """
+        with self._lock:
+            jobs = [dict(job) for job in self._records().values()
+                    if all(job.get(key) == value for key, value in match.items())]
+        jobs.sort(key=lambda job: job['created'], reverse=True)
+        return jobs[:limit]
+
+    def shutdown(self, wait=True):
+        """Release the pool threads, optionally waiting for running jobs.
+
+        A later submit starts a new pool.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
@@ -11,6 +11,12 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+try:
+    from .common import span
+except ImportError:
+    # Running as a script: python pdf.py
+    from common import span
+
 
 def convert_to_pdf(word_file, output_dir=None, max_retries=2):
     """Convert a Word document to PDF with the same name
@@ -54,7 +60,8 @@ def convert_to_pdf(word_file, output_dir=None, max_retries=2):
             else:
                 print(f"🔄 Converting {word_path.name} to PDF...")
 
-            convert(str(word_path), str(pdf_path))
+            with span('docx2pdf', 'io', file=word_path.name, attempt=attempt):
+                convert(str(word_path), str(pdf_path))
 
             # Verify PDF was created
             if pdf_path.exists():
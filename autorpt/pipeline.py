@@ -0,0 +1,273 @@
+"""Single-parse, multi-format report pipeline.
+
+The inputs (content.md and the workbooks its placeholders reference) are
+read and parsed once, and every requested output format is rendered
+concurrently from that shared result.
+"""
+
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from .common import print_error, print_results_summary, traced
+from .placeholders import compile_plan, missing_tables, substitute_fields
+from .sections import BUDGET_TABLE, TABLE_PATTERN, parse_table_placeholder, split_frontmatter
+from .timings import stage
+
+FORMATS = ('docx', 'pdf', 'html', 'md')
+
+HTML_TABLE_CLASSES = 'table table-sm table-bordered'
+
+HTML_TEMPLATE = '''<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+    <style>
+        body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 20px; }}
+        h1 {{ color: #333; border-bottom: 2px solid #0066cc; padding-bottom: 10px; }}
+        h2 {{ color: #0066cc; margin-top: 30px; }}
+        table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
+        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
+        th {{ background-color: #0066cc; color: white; }}
+    </style>
+</head>
+<body>
+    {body}
+</body>
+</html>'''
+
+
+def build_html_report(content_text, title='Report', table_html=None, table_name='budget.xlsx',
+                      tables=None):
+    """Render markdown content as a standalone HTML report.
+
+    Args:
+        content_text (str): Markdown text, optionally with YAML frontmatter
+        title (str): Document title
+        table_html (str): Optional HTML table inserted at the budget placeholder
+        table_name (str): Workbook name shown above the inserted budget table
+        tables (dict): HTML tables by TableRef for the other table placeholders
+
+    Returns:
+        str: The HTML document
+    """
+    import markdown
+
+    metadata, body = split_frontmatter(content_text)
+    body = substitute_fields(body, metadata)
+    tables = dict(tables or {})
+    if table_html:
+        tables[BUDGET_TABLE] = table_html
+
+    def insert_table(match):
+        ref = parse_table_placeholder(match.group(0))
+        if not tables.get(ref):
+            return match.group(0)
+        heading = f'Budget Table: {table_name}' if ref == BUDGET_TABLE else f'Table: {ref.label}'
+        return f'<h3>{heading}</h3>\n{tables[ref]}'
+
+    if tables:
+        body = TABLE_PATTERN.sub(insert_table, body)
+    return HTML_TEMPLATE.format(
+        title=title,
+        body=markdown.markdown(body, extensions=['tables', 'fenced_code']),
+    )
+
+
+def load_report_inputs(reports_dir='reports', need_tables=True):
+    """Read and parse content.md and the tables it references once.
+
+    Args:
+        reports_dir (str or Path): Folder containing content.md and the workbooks
+        need_tables (bool): Read the workbooks named by table placeholders
+
+    Returns:
+        dict: Inputs with 'reports_dir', 'content_file', 'content_text',
+        'metadata', 'plan' (the compiled ReportPlan) and 'tables'
+        (DataFrames by TableRef, None for unreadable ones), or None if
+        content.md is missing
+    """
+    from .autorpt import read_content
+
+    reports_dir = Path(reports_dir)
+    content_file = reports_dir / 'content.md'
+
+    print("📄 Reading content.md...")
+    if not content_file.exists():
+        print_error(f"{content_file} not found")
+        return None
+
+    content_text = read_content(content_file)
+    plan = compile_plan(content_text)
+
+    return {
+        'reports_dir': reports_dir,
+        'content_file': content_file,
+        'content_text': content_text,
+        'metadata': plan.metadata,
+        'plan': plan,
+        'tables': plan.load_tables(reports_dir) if need_tables else {},
+    }
+
+
+def render_docx(inputs, output_file):
+    """Render the Word report from parsed inputs."""
+    from .autorpt import build_word_document, save_word_document
+
+    missing = missing_tables(inputs['tables'])
+    if missing:
+        print_error(f"{', '.join(missing)} not found or unreadable")
+        return False
+    doc = build_word_document(inputs['content_text'], tables=inputs['tables'])
+    save_word_document(doc, output_file)
+    print(f"✅ Report generated: {output_file}")
+    return True
+
+
+def render_pdf(inputs, output_file):
+    """Render the Typst PDF report from parsed inputs."""
+    from .autorpt import compile_typst_pdf, markdown_to_typst
+
+    reports_dir = inputs['reports_dir']
+    if not (reports_dir / 'report.typ').exists():
+        print_error(f"Typst template not found: {reports_dir / 'report.typ'}")
+        return False
+    data_files = {}
+    typst_text = markdown_to_typst(inputs['content_text'], tables=inputs['tables'],
+                                   data_files=data_files)
+    return compile_typst_pdf(reports_dir, output_file, typst_text, data_files)
+
+
+def render_html(inputs, output_file):
+    """Render the HTML report from parsed inputs."""
+    with stage('build_html') as sizes:
+        tables = {
+            ref: df.to_html(classes=HTML_TABLE_CLASSES, index=False)
+            for ref, df in inputs['tables'].items() if df is not None
+        }
+        sizes['tables'] = len(tables)
+        html_content = build_html_report(
+            inputs['content_text'],
+            title=inputs['metadata'].get('title', 'Report'),
+            tables=tables,
+        )
+    with stage('save_html', bytes=len(html_content.encode('utf-8'))):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(html_content)
+    print(f"✅ HTML report generated: {output_file}")
+    return True
+
+
+def render_markdown(inputs, output_file):
+    """Copy content.md as the markdown report."""
+    with stage('save_md'):
+        shutil.copy(inputs['content_file'], output_file)
+    print(f"✅ Markdown report generated: {output_file}")
+    return True
+
+
+RENDERERS = {
+    'docx': render_docx,
+    'pdf': render_pdf,
+    'html': render_html,
+    'md': render_markdown,
+}
+
+
+def parse_formats(value):
+    """Parse a comma-separated format list such as 'docx,pdf'.
+
+    Raises:
+        ValueError: If an unknown format is given
+    """
+    formats = []
+    for fmt in value.split(','):
+        fmt = fmt.strip().lower()
+        if not fmt:
+            continue
+        if fmt not in RENDERERS:
+            raise ValueError(f"unknown format '{fmt}' (choose from {', '.join(FORMATS)})")
+        if fmt not in formats:
+            formats.append(fmt)
+    return tuple(formats)
+
+
+@traced('generate_formats', 'report')
+def generate_formats(reports_dir='reports', formats=('docx', 'pdf'), use_cache=True):
+    """Generate several report formats from a single parse of the inputs.
+
+    Unchanged Word and PDF reports are restored from the build cache first;
+    the remaining formats are rendered concurrently in a thread pool, so the
+    total time approaches that of the slowest renderer.
+
+    Args:
+        reports_dir (str or Path): Folder containing content.md and the workbooks
+        formats (tuple): Formats to generate, any of 'docx', 'pdf', 'html', 'md'
+        use_cache (bool): Reuse cached Word/PDF reports when the inputs are unchanged
+
+    Returns:
+        dict: Summary with success/failed/errors keys and the output file
+        of each successful format under 'outputs'
+    """
+    from .autorpt import _restore_cached_report, _typst_cache_inputs
+
+    reports_dir = Path(reports_dir)
+    today = datetime.now().strftime('%Y-%m-%d')
+    outputs = {fmt: reports_dir / f"report_{today}.{fmt}" for fmt in formats}
+    results = {'success': 0, 'failed': 0, 'errors': [], 'outputs': {}}
+
+    inputs = load_report_inputs(reports_dir, need_tables=False)
+    if inputs is None:
+        results['failed'] += len(formats)
+        results['errors'].extend(f"{fmt}: content.md not found" for fmt in formats)
+        return results
+    table_files = inputs['plan'].table_files(reports_dir)
+
+    # Restore unchanged Word/PDF reports before reading any workbook
+    pending = []
+    cache_keys = {}
+    for fmt in formats:
+        if use_cache and fmt in ('docx', 'pdf'):
+            input_files, settings = [inputs['content_file']] + table_files, ()
+            if fmt == 'pdf':
+                template_files, settings = _typst_cache_inputs(reports_dir)
+                input_files += template_files
+            cache, key, hit = _restore_cached_report(fmt, input_files, outputs[fmt], settings)
+            if hit:
+                results['success'] += 1
+                results['outputs'][fmt] = str(outputs[fmt])
+                continue
+            if cache is not None:
+                cache_keys[fmt] = (cache, key)
+        pending.append(fmt)
+
+    if pending:
+        if any(fmt in ('docx', 'pdf', 'html') for fmt in pending):
+            inputs['tables'] = inputs['plan'].load_tables(reports_dir)
+
+        def render(fmt):
+            try:
+                with stage(f'render_{fmt}'):
+                    return RENDERERS[fmt](inputs, outputs[fmt])
+            except Exception as e:
+                print_error(f"Error generating {fmt}: {e}")
+                return False
+
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            succeeded = dict(zip(pending, executor.map(render, pending)))
+
+        for fmt in pending:
+            if succeeded[fmt]:
+                results['success'] += 1
+                results['outputs'][fmt] = str(outputs[fmt])
+                if fmt in cache_keys:
+                    cache, key = cache_keys[fmt]
+                    cache.put(key, [outputs[fmt]])
+            else:
+                results['failed'] += 1
+                results['errors'].append(f"{fmt}: generation failed")
+
+    print_results_summary(results, "Report Generation")
+    return results
@@ -0,0 +1,141 @@
+"""Placeholders in content.md and the substitution plan compiled from them.
+
+Two kinds of placeholder are recognized:
+
+- Table placeholders on a line of their own, such as
+  ``[insert table from staffing.xlsx sheet Q3]`` or the original
+  ``[insert budget from budget.xlsx here]``
+- Frontmatter fields anywhere in the text, such as ``{{ frontmatter.project }}``
+
+A document is compiled once into a ReportPlan listing the tables it
+references, so a build opens only those workbooks and sheets, each once,
+and every output format renders from the same loaded tables.
+"""
+
+import re
+
+from .common import print_error
+from .sections import (BUDGET_TABLE, parse_blocks, parse_sections, section_cache,
+                       split_frontmatter, text_hash)
+
+FIELD_PATTERN = re.compile(r'\{\{\s*frontmatter\.([\w-]+)\s*\}\}')
+
+
+def substitute_fields(text, metadata):
+    """Replace ``{{ frontmatter.key }}`` placeholders with frontmatter values.
+
+    Placeholders naming a key that is not in the frontmatter are left as they are.
+
+    Args:
+        text (str): Markdown text
+        metadata (dict): Frontmatter values
+
+    Returns:
+        str: The text with known fields substituted
+    """
+    if '{{' not in text:
+        return text
+    return FIELD_PATTERN.sub(
+        lambda match: str(metadata.get(match.group(1), match.group(0))), text)
+
+
+class ReportPlan:
+    """The sections of content.md and the tables they reference.
+
+    Attributes:
+        metadata (dict): Frontmatter values
+        body (str): Markdown body with frontmatter fields substituted
+        sections (list): Sections split at level 1 and 2 headers
+        tables (tuple): Every referenced TableRef, in order of first use
+    """
+
+    def __init__(self, content_text):
+        """Compile the plan for a document.
+
+        Args:
+            content_text (str): Markdown text, optionally with YAML frontmatter
+        """
+        self.metadata, body = split_frontmatter(content_text)
+        self.body = substitute_fields(body, self.metadata)
+        self.sections = parse_sections(self.body, max_level=2)
+
+        tables = {}
+        self._section_tables = {}
+        for section in self.sections:
+            refs = tuple(dict.fromkeys(
+                value for kind, value in parse_blocks(section['content']) if kind == 'table'))
+            self._section_tables[section['hash']] = refs
+            tables.update(dict.fromkeys(refs))
+        self.tables = tuple(tables)
+
+    def section_tables(self, section):
+        """Return the TableRefs used by one of the plan's sections."""
+        return self._section_tables.get(section['hash'], ())
+
+    def table_files(self, base_dir):
+        """Return the distinct workbook paths the plan references, leaving out invalid names."""
+        files = []
+        for ref in self.tables:
+            try:
+                files.append(ref.path(base_dir))
+            except ValueError:
+                continue
+        return list(dict.fromkeys(files))
+
+    def load_tables(self, base_dir, refs=None):
+        """Read every referenced sheet once.
+
+        Args:
+            base_dir (str or Path): Folder the workbook names are relative to
+            refs (list): Subset of the plan's tables to read (default: all)
+
+        Returns:
+            dict: DataFrame by TableRef, or None for sheets that could not be read
+        """
+        from .autorpt import read_excel_as_dataframe
+
+        tables = {}
+        for ref in dict.fromkeys(self.tables if refs is None else refs):
+            try:
+                excel_file = ref.path(base_dir)
+            except ValueError as e:
+                print_error(str(e))
+                tables[ref] = None
+                continue
+            if not excel_file.exists():
+                print_error(f"{excel_file} not found")
+                tables[ref] = None
+                continue
+            print(f"📊 Reading {ref.label}...")
+            tables[ref] = read_excel_as_dataframe(
+                excel_file, sheet_name=ref.sheet if ref.sheet is not None else 0)
+        return tables
+
+
+def compile_plan(content_text):
+    """Return the ReportPlan for a document, compiling it once per distinct text."""
+    return section_cache.get_or_build(('plan', text_hash(content_text)),
+                                      lambda: ReportPlan(content_text))
+
+
+def resolve_table(ref, tables=None, budget_df=None):
+    """Return the DataFrame for a placeholder's table.
+
+    Args:
+        ref (TableRef): Table named by the placeholder
+        tables (dict): Loaded tables by TableRef
+        budget_df (DataFrame): Table used for budget.xlsx when it is not in tables
+
+    Returns:
+        DataFrame: The table, or None if it is not available
+    """
+    if tables and tables.get(ref) is not None:
+        return tables[ref]
+    if ref == BUDGET_TABLE:
+        return budget_df
+    return None
+
+
+def missing_tables(tables):
+    """Return the labels of tables that could not be read."""
+    return [ref.label for ref, df in tables.items() if df is None]
@@ -0,0 +1,273 @@
+"""Shared section-level markdown parser for content.md.
+
+The parser splits a document into sections at its headers and gives every
+section a stable content hash. Parsing a section's body into blocks and
+rendering it are memoized by that hash, so when content.md is edited only
+the sections that actually changed are parsed and rendered again.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+BUDGET_PLACEHOLDER = '[insert budget from budget.xlsx here]'
+
+# A header as gen_auto reads it, after stripping the line
+HEADER_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+
+# [insert table from staffing.xlsx sheet Q3], or the original
+# [insert budget from budget.xlsx here]
+TABLE_PATTERN = re.compile(
+    r'\[insert (?:table|budget) from (?P<file>[^\]]+?\.xlsx?)'
+    r'(?: sheet (?P<sheet>[^\]]+?))?(?: here)?\]'
+)
+
+
+class TableRef(namedtuple('TableRef', ['file', 'sheet'])):
+    """A workbook (relative to the report folder) and sheet named by a placeholder.
+
+    A sheet of None means the first sheet.
+    """
+
+    __slots__ = ()
+
+    @property
+    def label(self):
+        """Return a display name such as 'staffing.xlsx (Q3)'."""
+        return f"{self.file} ({self.sheet})" if self.sheet else self.file
+
+    def path(self, base_dir):
+        """Return the workbook's path in base_dir.
+
+        Placeholders may only name workbooks inside the report folder, so
+        content.md cannot read files elsewhere on the host.
+
+        Raises:
+            ValueError: If the name is absolute, has '..' or hidden parts, or
+                resolves (through links) outside base_dir
+        """
+        name = Path(self.file)
+        if name.anchor or any(part == '..' or part.startswith('.') for part in name.parts):
+            raise ValueError(f"{self.file} is not a workbook inside the report folder")
+        path = Path(base_dir) / name
+        if not path.resolve().is_relative_to(Path(base_dir).resolve()):
+            raise ValueError(f"{self.file} is not a workbook inside the report folder")
+        return path
+
+
+# The table named by BUDGET_PLACEHOLDER
+BUDGET_TABLE = TableRef('budget.xlsx', None)
+
+
+def parse_table_placeholder(line):
+    """Return the TableRef of a line starting with a table placeholder, or None."""
+    match = TABLE_PATTERN.match(line)
+    if match is None:
+        return None
+    sheet = match.group('sheet')
+    return TableRef(match.group('file').strip(), sheet.strip() if sheet else None)
+
+
+class SectionCache:
+    """Bounded, thread-safe LRU cache of per-section results."""
+
+    def __init__(self, max_entries=4096):
+        """Initialize the cache.
+
+        Args:
+            max_entries (int): Number of results kept before the oldest are dropped
+        """
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """Return the cached result for key, calling build() on a miss.
+
+        Args:
+            key (tuple): Hashable key, normally including a section hash
+            build (callable): Function computing the result
+
+        Returns:
+            The cached or newly built result
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        result = build()
+
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Drop every cached result."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# Shared by all parsers and renderers in this process
+section_cache = SectionCache()
+
+
+def text_hash(text):
+    """Return a short stable hash of a piece of text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:32]
+
+
+def split_frontmatter(text):
+    """Split YAML frontmatter from markdown text.
+
+    Frontmatter is only recognized when the first line is ``---`` and a
+    closing ``---`` line follows. Values are read as simple ``key: value``
+    pairs.
+
+    Args:
+        text (str): Markdown text
+
+    Returns:
+        tuple: (metadata dict, body text)
+    """
+    lines = text.split('\n')
+    if lines[0].strip() != '---':
+        return {}, text
+
+    for i in range(1, len(lines)):
+        if lines[i].strip() == '---':
+            metadata = {}
+            for line in lines[1:i]:
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    metadata[key.strip()] = value.strip()
+            return metadata, '\n'.join(lines[i + 1:])
+
+    return {}, text
+
+
+def _header(line, max_level, indented_headers):
+    """Return (level, title) if line is a header of at most max_level, else None"""
+    if indented_headers:
+        match = HEADER_PATTERN.match(line.strip())
+        if match is None:
+            return None
+        level, title = len(match.group(1)), match.group(2).strip()
+    else:
+        # A line starting with "# ", "## ", ...; the title may be empty
+        level = len(line) - len(line.lstrip('#'))
+        if not level or line[level:level + 1] != ' ':
+            return None
+        title = line[level + 1:].strip()
+    return (level, title) if level <= max_level else None
+
+
+def parse_sections(text, max_level=6, indented_headers=False):
+    """Split markdown text into sections at its headers.
+
+    Text before the first header becomes a level 0 section with an empty
+    title. Headers deeper than max_level stay in their section's content.
+    A header is a line starting with one to max_level '#' and a space; its
+    title may be empty.
+
+    Args:
+        text (str): Markdown body (without frontmatter)
+        max_level (int): Deepest header level that starts a new section
+        indented_headers (bool): Read headers as gen_auto does: the line is
+            stripped first, so "  # Title" and "#\tTitle" are headers, and
+            a title is required
+
+    Returns:
+        list: Section dicts with 'level', 'title', 'content' (without the
+        blank lines around it; its first line keeps its indent) and 'hash'
+        (stable across runs for identical sections)
+    """
+    sections = []
+    level, title, content = 0, '', []
+
+    def close():
+        start, end = 0, len(content)
+        while start < end and not content[start].strip():
+            start += 1
+        while end > start and not content[end - 1].strip():
+            end -= 1
+        body = '\n'.join(content[start:end]).rstrip()
+        sections.append({
+            'level': level,
+            'title': title,
+            'content': body,
+            'hash': text_hash(f"{level}\n{title}\n{body}"),
+        })
+
+    for line in text.split('\n'):
+        header = _header(line, max_level, indented_headers)
+        if header is not None:
+            close()
+            (level, title), content = header, []
+        else:
+            content.append(line)
+    close()
+
+    # Drop an empty preamble so header-only documents have no level 0 section
+    if sections[0]['level'] == 0 and not sections[0]['content']:
+        sections.pop(0)
+    return sections
+
+
+def _parse_blocks(text):
+    """Parse section content into blocks without caching."""
+    blocks = []
+    lines = text.split('\n')
+
+    i = 0
+    while i < len(lines):
+        line = lines[i].rstrip()
+        table = parse_table_placeholder(line) if line.startswith('[insert ') else None
+
+        if not line:
+            i += 1
+            continue
+        elif line.startswith('## '):
+            blocks.append(('heading', line[3:].strip()))
+            i += 1
+        elif table is not None:
+            blocks.append(('table', table))
+            i += 1
+        elif line.startswith('- '):
+            # Collect all consecutive bullet points
+            bullets = []
+            while i < len(lines) and lines[i].rstrip().startswith('- '):
+                bullets.append(lines[i].rstrip()[2:].strip())
+                i += 1
+            blocks.append(('bullets', tuple(bullets)))
+        else:
+            blocks.append(('paragraph', line))
+            i += 1
+
+    return tuple(blocks)
+
+
+def parse_blocks(text):
+    """Parse section content into blocks, memoized by the content hash.
+
+    Block kinds are ('heading', text), ('table', TableRef), ('bullets', items)
+    and ('paragraph', line). Empty lines are dropped.
+
+    Args:
+        text (str): Section content
+
+    Returns:
+        tuple: The parsed blocks
+    """
+    return section_cache.get_or_build(('blocks', text_hash(text)), lambda: _parse_blocks(text))
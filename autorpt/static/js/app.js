@@ -3,7 +3,7 @@ let currentSections = [];
 let currentEditor = 'wysiwyg';
 let snippets = [];
 let history = [];
-let uploadedExcelData = { full_table: '', filename: '' };
+let uploadedExcelData = { sha256: '', filename: '' };
 
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
@@ -247,14 +247,126 @@ function updatePreview() {
     }
     
     // Insert budget table if an Excel file has been uploaded
-    if (uploadedExcelData.full_table) {
+    if (uploadedExcelData.sha256) {
         contentHtml = contentHtml.replace(
             /\[insert budget from [^\]]*\.xlsx here\]/gi,
-            `<div class="mt-3 mb-3"><h3>Budget Table: ${uploadedExcelData.filename}</h3>${uploadedExcelData.full_table}</div>`
+            `<div class="mt-3 mb-3"><h3>Budget Table: ${uploadedExcelData.filename}</h3><div class="virtual-table" data-table="${uploadedExcelData.sha256}"></div></div>`
         );
     }
     
     preview.innerHTML = contentHtml;
+    preview.querySelectorAll('.virtual-table').forEach(mountVirtualTable);
+}
+
+// Virtual tables render only the visible rows of a workbook, fetched in pages
+const TABLE_ROW_HEIGHT = 36;
+const TABLE_PAGE_SIZE = 100;
+const TABLE_CACHED_PAGES = 200;
+const tablePages = new Map();
+
+function fetchTablePage(table, offset, sort, order, columns) {
+    const key = JSON.stringify([table, sort, order, offset, columns]);
+    if (!tablePages.has(key)) {
+        const params = new URLSearchParams({ offset, limit: TABLE_PAGE_SIZE, order });
+        if (sort) params.set('sort', sort);
+        // One parameter per column, so names may hold commas
+        (columns || []).forEach(column => params.append('columns', column));
+        const page = fetch(`/api/tables/${table}/rows?${params}`).then(response => response.json()).then(data => {
+            // Keep only good pages, so a failed one is fetched again on the next scroll
+            if (!data || !data.success) tablePages.delete(key);
+            return data;
+        });
+        page.catch(() => tablePages.delete(key));
+        tablePages.set(key, page);
+        // Workbooks never change under their hash, so only the oldest pages are dropped
+        if (tablePages.size > TABLE_CACHED_PAGES) {
+            tablePages.delete(tablePages.keys().next().value);
+        }
+    }
+    return tablePages.get(key);
+}
+
+function mountVirtualTable(container) {
+    const table = container.dataset.table;
+    // data-columns may hold a JSON list of the columns to show; show all if it is malformed
+    let selected = null;
+    try {
+        selected = container.dataset.columns ? JSON.parse(container.dataset.columns) : null;
+    } catch (error) {
+        selected = null;
+    }
+    const state = { sort: null, order: 'asc', columns: null, total: 0, rowHeight: TABLE_ROW_HEIGHT };
+    let renderId = 0;
+    container.innerHTML = '<table class="table table-sm table-bordered"><thead></thead><tbody></tbody></table>';
+    const thead = container.querySelector('thead');
+    const tbody = container.querySelector('tbody');
+
+    function renderHeader() {
+        thead.innerHTML = '<tr>' + state.columns.map(column => {
+            const arrow = column === state.sort ? (state.order === 'asc' ? ' ▲' : ' ▼') : '';
+            return `<th data-column="${escapeHtml(column)}">${escapeHtml(column)}${arrow}</th>`;
+        }).join('') + '</tr>';
+    }
+
+    async function render() {
+        const id = ++renderId;
+        const first = Math.floor(container.scrollTop / state.rowHeight);
+        // A table in a hidden tab has no height yet; fill its maximum height
+        const visible = Math.ceil((container.clientHeight || 400) / state.rowHeight) + 1;
+        const firstPage = Math.floor(first / TABLE_PAGE_SIZE) * TABLE_PAGE_SIZE;
+        const offsets = [firstPage];
+        if (first + visible > firstPage + TABLE_PAGE_SIZE) offsets.push(firstPage + TABLE_PAGE_SIZE);
+
+        let pages;
+        try {
+            pages = await Promise.all(offsets.map(offset => fetchTablePage(table, offset, state.sort, state.order, selected)));
+        } catch (error) {
+            return;
+        }
+        // Any page may fail (e.g. an error body); never build rows from a partial set
+        if (id !== renderId || !pages.every(page => page && page.success)) return;
+
+        if (!state.columns) {
+            state.columns = pages[0].columns;
+            renderHeader();
+        }
+        state.total = pages[0].total;
+        const last = Math.min(first + visible, state.total);
+        const colspan = state.columns.length;
+        const rows = [`<tr class="spacer"><td colspan="${colspan}" style="height: ${first * state.rowHeight}px"></td></tr>`];
+        for (let row = first; row < last; row++) {
+            const page = pages[Math.floor((row - firstPage) / TABLE_PAGE_SIZE)];
+            const index = row - page.offset;
+            rows.push('<tr>' + page.values.map(values => `<td>${escapeHtml(values[index] ?? '')}</td>`).join('') + '</tr>');
+        }
+        rows.push(`<tr class="spacer"><td colspan="${colspan}" style="height: ${(state.total - last) * state.rowHeight}px"></td></tr>`);
+        tbody.innerHTML = rows.join('');
+
+        // Rows may render taller than expected (borders, fonts); measure once and redraw
+        const measured = last > first ? tbody.rows[1].offsetHeight : 0;
+        if (measured && measured !== state.rowHeight) {
+            state.rowHeight = measured;
+            render();
+        }
+    }
+
+    thead.addEventListener('click', (event) => {
+        const header = event.target.closest('th');
+        if (!header) return;
+        const column = header.dataset.column;
+        state.order = state.sort === column && state.order === 'asc' ? 'desc' : 'asc';
+        state.sort = column;
+        renderHeader();
+        container.scrollTop = 0;
+        render();
+    });
+    container.addEventListener('scroll', () => requestAnimationFrame(render));
+    render();
+}
+
+function escapeHtml(value) {
+    return String(value).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;').replace(/'/g, '&#39;');
 }
 
 // Simple HTML to Markdown conversion
@@ -339,6 +451,9 @@ function autoSave() {
     console.log('Auto-saved at', new Date().toLocaleTimeString());
 }
 
+// Files above this size are sent as resumable chunked uploads
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024;
+
 // Upload Excel file
 async function uploadExcel() {
     const fileInput = document.getElementById('excelFile');
@@ -346,18 +461,22 @@ async function uploadExcel() {
     
     if (!file) return;
     
-    const formData = new FormData();
-    formData.append('file', file);
-    
     try {
-        const response = await fetch('/api/upload-excel', {
-            method: 'POST',
-            body: formData
-        });
+        let data;
+        if (file.size > CHUNKED_UPLOAD_THRESHOLD) {
+            data = await uploadInChunks(file);
+        } else {
+            const formData = new FormData();
+            formData.append('file', file);
+            const response = await fetch('/api/upload-excel', {
+                method: 'POST',
+                body: formData
+            });
+            data = await response.json();
+        }
         
-        const data = await response.json();
         if (data.success) {
-            uploadedExcelData = { full_table: data.full_table, filename: data.filename };
+            uploadedExcelData = { sha256: data.sha256, filename: data.filename };
             document.getElementById('excelPreview').innerHTML = `
                 <div class="alert alert-success p-2 mt-2">
                     <small><strong>${data.filename}</strong><br>
@@ -367,7 +486,7 @@ async function uploadExcel() {
             `;
             loadExcelFiles();
             updatePreview();
-            showToast('Excel file uploaded', 'success');
+            showToast(data.duplicate ? 'Excel file already uploaded' : 'Excel file uploaded', 'success');
         } else {
             showToast(data.error, 'danger');
         }
@@ -376,6 +495,51 @@ async function uploadExcel() {
     }
 }
 
+// Send a large file in chunks, resuming from the server's offset after a failed chunk
+async function uploadInChunks(file, retries = 3) {
+    let response = await fetch('/api/uploads', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ filename: file.name, size: file.size })
+    });
+    const upload = await response.json();
+    if (!upload.success) {
+        return upload;
+    }
+    
+    const uploadUrl = `/api/uploads/${upload.upload_id}`;
+    let offset = upload.offset;
+    let failures = 0;
+    while (offset < file.size) {
+        try {
+            response = await fetch(`${uploadUrl}?offset=${offset}`, {
+                method: 'PUT',
+                body: file.slice(offset, offset + upload.chunk_size)
+            });
+            const chunk = await response.json();
+            if (!chunk.success) {
+                throw new Error(chunk.error);
+            }
+            offset = chunk.offset;
+            failures = 0;
+            document.getElementById('excelPreview').innerHTML =
+                `<small class="text-muted">Uploading ${file.name}: ${Math.round(100 * offset / file.size)}%</small>`;
+        } catch (error) {
+            if (++failures > retries) {
+                return { success: false, error: `Upload failed: ${error.message}` };
+            }
+            const status = await (await fetch(uploadUrl)).json();
+            if (!status.success) {
+                return status;
+            }
+            offset = status.offset;
+        }
+    }
+    
+    response = await fetch(`${uploadUrl}/complete`, { method: 'POST' });
+    return response.json();
+}
+
 // Load Excel files list
 async function loadExcelFiles() {
     try {
@@ -427,15 +591,24 @@ async function generateReport(format) {
         });
         
         const data = await response.json();
-        if (data.success) {
-            showToast(`Report generated: ${data.filename}`, 'success');
+        if (!data.success) {
+            showToast(`Error: ${data.error}`, 'danger');
+            return;
+        }
+        
+        // The report builds in the background; poll its job until it finishes
+        const job = await waitForJob(data.status_url, (job) => {
+            button.innerHTML = `<span class="spinner-border spinner-border-sm"></span> ${job.message}...`;
+        });
+        if (job.status === 'done') {
+            showToast(`Report generated: ${job.filename}`, 'success');
             
             // Download file
-            window.location.href = data.download_url;
+            window.location.href = job.download_url;
             
             loadHistory();
         } else {
-            showToast(`Error: ${data.error}`, 'danger');
+            showToast(`Error: ${job.error}`, 'danger');
         }
     } catch (error) {
         showToast('Error generating report', 'danger');
@@ -445,12 +618,36 @@ async function generateReport(format) {
     }
 }
 
+// Poll a report job until it is done or failed
+async function waitForJob(statusUrl, onProgress, interval = 500) {
+    while (true) {
+        const response = await fetch(statusUrl);
+        const data = await response.json();
+        if (!data.success) {
+            return { status: 'failed', error: data.error };
+        }
+        if (data.job.status === 'done' || data.job.status === 'failed') {
+            return data.job;
+        }
+        onProgress(data.job);
+        await new Promise(resolve => setTimeout(resolve, interval));
+    }
+}
+
 // Snippets functionality
 async function loadSnippets() {
     try {
-        const response = await fetch('/api/snippets');
-        const data = await response.json();
-        snippets = data.snippets;
+        // Snippets are served in pages; fetch them all
+        const loaded = [];
+        let total;
+        do {
+            const response = await fetch(`/api/snippets?offset=${loaded.length}&limit=500`);
+            const data = await response.json();
+            loaded.push(...data.snippets);
+            total = data.total;
+            if (data.snippets.length === 0) break;
+        } while (loaded.length < total);
+        snippets = loaded;
     } catch (error) {
         console.error('Error loading snippets:', error);
     }
@@ -520,7 +717,7 @@ async function saveNewSnippet() {
         
         const data = await response.json();
         if (data.success) {
-            snippets = data.snippets;
+            snippets.push(data.snippet);
             renderSnippets();
             hideNewSnippet();
             showToast('Snippet saved', 'success');
@@ -537,7 +734,7 @@ async function deleteSnippet(id) {
         const response = await fetch(`/api/snippets/${id}`, { method: 'DELETE' });
         const data = await response.json();
         if (data.success) {
-            snippets = data.snippets;
+            snippets = snippets.filter(snippet => snippet.id !== id);
             renderSnippets();
             showToast('Snippet deleted', 'success');
         }
@@ -566,11 +763,14 @@ function insertSnippet(content) {
 }
 
 // History functionality
-async function loadHistory() {
+let historyTotal = 0;
+
+async function loadHistory(offset = 0) {
     try {
-        const response = await fetch('/api/history');
+        const response = await fetch(`/api/history?offset=${offset}`);
         const data = await response.json();
-        history = data.history;
+        history = offset === 0 ? data.history : history.concat(data.history);
+        historyTotal = data.total;
     } catch (error) {
         console.error('Error loading history:', error);
     }
@@ -600,12 +800,23 @@ function renderHistory() {
             </div>
             <small class="text-muted">${new Date(item.timestamp).toLocaleString()}</small>
             <div class="mt-2">${item.preview}</div>
-            <a href="/api/download/${item.filename}" class="btn btn-sm btn-primary mt-2">
+            <a href="${item.download_url || `/api/download/${item.filename}`}" class="btn btn-sm btn-primary mt-2">
                 <i class="bi bi-download"></i> Download
             </a>
         `;
         container.appendChild(div);
     });
+    
+    if (history.length < historyTotal) {
+        const more = document.createElement('button');
+        more.className = 'btn btn-sm btn-outline-primary w-100';
+        more.textContent = `Show more (${historyTotal - history.length} older)`;
+        more.onclick = async () => {
+            await loadHistory(history.length);
+            renderHistory();
+        };
+        container.appendChild(more);
+    }
 }
 
 function getFormatBadge(format) {
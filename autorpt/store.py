@@ -0,0 +1,180 @@
+"""SQLite storage for the web app's report history and snippets.
+
+History entries and snippets are rows in one database file opened in WAL
+mode: every insert or delete is a single atomic statement, readers never
+wait for the writer, and concurrent requests cannot lose each other's
+changes. Ids are assigned by SQLite and never reused. The history.json
+and snippets.json files of earlier versions are imported once, the
+first time the database is opened, and renamed to ``*.json.migrated``.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    filename TEXT NOT NULL,
+    format TEXT NOT NULL,
+    download_url TEXT,
+    timestamp TEXT NOT NULL,
+    preview TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS history_format ON history (format, id);
+CREATE TABLE IF NOT EXISTS snippets (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created TEXT NOT NULL
+);
+'''
+
+
+def _read_json_list(json_file):
+    """Return the list stored in a JSON file, or [] if it is missing or unreadable"""
+    try:
+        with open(json_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return data if isinstance(data, list) else []
+
+
+class AppStore:
+    """Report history and snippets in an SQLite database.
+
+    A connection is opened for each operation, so the store can be shared
+    by any number of request threads and server processes.
+    """
+
+    def __init__(self, db_file, history_file=None, snippets_file=None):
+        """Initialize the store; the database is created when first used.
+
+        Args:
+            db_file (str or Path): The SQLite database file
+            history_file (str or Path): history.json to import once
+            snippets_file (str or Path): snippets.json to import once
+        """
+        self.db_file = Path(db_file)
+        self.history_file = Path(history_file) if history_file else None
+        self.snippets_file = Path(snippets_file) if snippets_file else None
+        self._ready = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        """Open a connection returning rows as sqlite3.Row"""
+        conn = sqlite3.connect(self.db_file, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _connect(self):
+        """Return a connection, creating and migrating the database on first use"""
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self._create()
+                    self._ready = True
+        return closing(self._open())
+
+    def _create(self):
+        """Create the schema and import the JSON files of earlier versions"""
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._open()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+            # An immediate transaction lets only one process import the files
+            conn.execute('BEGIN IMMEDIATE')
+            migrated = conn.execute('PRAGMA user_version').fetchone()[0] < SCHEMA_VERSION
+            if migrated:
+                self._import_json(conn)
+                conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+            conn.commit()
+
+        if migrated:
+            for json_file in (self.history_file, self.snippets_file):
+                if json_file is not None and json_file.exists():
+                    json_file.replace(json_file.with_name(json_file.name + '.migrated'))
+
+    def _import_json(self, conn):
+        """Copy history.json and snippets.json into the database"""
+        if self.history_file is not None:
+            # The file lists the newest entry first; ids grow with time
+            for entry in reversed(_read_json_list(self.history_file)):
+                filename = entry.get('filename', '')
+                conn.execute(
+                    'INSERT INTO history (filename, format, download_url, timestamp, preview) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (filename, entry.get('format', ''),
+                     entry.get('download_url') or f'/api/download/{filename}',
+                     entry.get('timestamp') or datetime.now().isoformat(),
+                     entry.get('preview', '')))
+
+        if self.snippets_file is not None:
+            seen = set()
+            for snippet in _read_json_list(self.snippets_file):
+                # Old ids could repeat after deletes; repeated ones get new ids
+                snippet_id = snippet.get('id')
+                if not isinstance(snippet_id, int) or snippet_id in seen:
+                    snippet_id = None
+                seen.add(snippet_id)
+                conn.execute(
+                    'INSERT INTO snippets (id, title, content, created) VALUES (?, ?, ?, ?)',
+                    (snippet_id, snippet.get('title', 'Untitled'), snippet.get('content', ''),
+                     snippet.get('created') or datetime.now().isoformat()))
+
+    def add_history(self, filename, format_type, preview, download_url):
+        """Record a generated report and return its history entry."""
+        entry = {'filename': filename, 'format': format_type, 'download_url': download_url,
+                 'timestamp': datetime.now().isoformat(), 'preview': preview}
+        with self._connect() as conn, conn:
+            cursor = conn.execute(
+                'INSERT INTO history (filename, format, download_url, timestamp, preview) '
+                'VALUES (:filename, :format, :download_url, :timestamp, :preview)', entry)
+        return dict(entry, id=cursor.lastrowid)
+
+    def history(self, limit=50, offset=0, format_type=None):
+        """Return a page of history entries, newest first.
+
+        Args:
+            limit (int): Entries to return
+            offset (int): Entries to skip
+            format_type (str): Only return reports of this format
+
+        Returns:
+            tuple: (list of entry dicts, total number of matching entries)
+        """
+        where, params = ('WHERE format = ?', (format_type,)) if format_type else ('', ())
+        with self._connect() as conn:
+            total = conn.execute(f'SELECT COUNT(*) FROM history {where}', params).fetchone()[0]
+            rows = conn.execute(f'SELECT * FROM history {where} ORDER BY id DESC LIMIT ? OFFSET ?',
+                                params + (limit, offset)).fetchall()
+        return [dict(row) for row in rows], total
+
+    def snippets(self, limit=100, offset=0):
+        """Return a page of snippets, oldest first, and the total number of snippets."""
+        with self._connect() as conn:
+            total = conn.execute('SELECT COUNT(*) FROM snippets').fetchone()[0]
+            rows = conn.execute('SELECT * FROM snippets ORDER BY id LIMIT ? OFFSET ?',
+                                (limit, offset)).fetchall()
+        return [dict(row) for row in rows], total
+
+    def add_snippet(self, title, content):
+        """Save a snippet and return it with its new id."""
+        snippet = {'title': title, 'content': content, 'created': datetime.now().isoformat()}
+        with self._connect() as conn, conn:
+            cursor = conn.execute(
+                'INSERT INTO snippets (title, content, created) VALUES (:title, :content, :created)',
+                snippet)
+        return dict(snippet, id=cursor.lastrowid)
+
+    def delete_snippet(self, snippet_id):
+        """Delete a snippet and return whether it existed."""
+        with self._connect() as conn, conn:
+            cursor = conn.execute('DELETE FROM snippets WHERE id = ?', (snippet_id,))
+        return cursor.rowcount > 0
@@ -0,0 +1,222 @@
+"""Per-stage timing of the report pipeline.
+
+Pipeline code wraps each stage in ``with stage('name', bytes=...)``. Every
+stage is also a tracing span (see ``common.span``), so it costs next to
+nothing unless timings or tracing are on. ``auto --timings`` starts a
+recorder that measures wall time, CPU time and peak memory of every stage
+together with the input sizes passed in.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+from .common import span
+
+# Recorder used by stage(), or None when timings are not being collected
+_active = None
+
+
+class TimingRecorder:
+    """Collect wall time, CPU time and peak memory for pipeline stages.
+
+    CPU time is that of the calling thread plus any subprocesses (such as
+    ``typst compile``) that finished during the stage. Peak memory is the
+    highest Python allocation seen during the stage above its starting
+    point, as traced by tracemalloc. tracemalloc's peak is process-wide, so
+    a stage's peak is only reported when no other thread ran a stage at
+    the same time; stages that overlapped (such as formats rendered
+    concurrently) have no peak of their own, and the run's overall peak is
+    reported instead.
+    """
+
+    def __init__(self, track_memory=True):
+        """Initialize the recorder.
+
+        Args:
+            track_memory (bool): Trace allocations to report peak memory
+        """
+        self.track_memory = track_memory
+        self.stages = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._started = time.perf_counter()
+        self._started_memory = False
+        # Threads with a stage open, and how often a thread joined others
+        self._active_threads = 0
+        self._overlaps = 0
+        self._base_memory = 0
+        self._run_peak = None
+
+    def start(self):
+        """Start tracing memory if requested."""
+        if self.track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_memory = True
+        if self.track_memory:
+            self._base_memory = tracemalloc.get_traced_memory()[0]
+            self._run_peak = self._base_memory
+        self._started = time.perf_counter()
+
+    def _traced_peak(self, reset=False):
+        """Return the traced memory and peak, keeping the run's peak (lock held)"""
+        current, peak = tracemalloc.get_traced_memory()
+        self._run_peak = max(self._run_peak or 0, peak)
+        if reset:
+            tracemalloc.reset_peak()
+        return current, peak
+
+    def stop(self):
+        """Stop tracing memory if this recorder started it."""
+        if self._started_memory:
+            tracemalloc.stop()
+            self._started_memory = False
+
+    @contextlib.contextmanager
+    def stage(self, name, **sizes):
+        """Measure one stage; the yielded dict may be updated with more sizes."""
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        tracing = self.track_memory and tracemalloc.is_tracing()
+        with self._lock:
+            if not stack:
+                if self._active_threads:
+                    self._overlaps += 1
+                self._active_threads += 1
+            alone = self._active_threads == 1
+            overlaps = self._overlaps
+            if tracing:
+                current, peak = self._traced_peak(reset=True)
+                if stack:
+                    # Keep the enclosing stage's peak before resetting it
+                    stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            else:
+                current = 0
+
+        frame = {'peak': current}
+        stack.append(frame)
+        children = os.times()
+        cpu = time.thread_time()
+        wall = time.perf_counter()
+        start = wall - self._started
+        try:
+            with span(name, 'stage', **sizes) as sizes:
+                yield sizes
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.thread_time() - cpu
+            after = os.times()
+            cpu += (after.children_user - children.children_user
+                    + after.children_system - children.children_system)
+            stack.pop()
+
+            with self._lock:
+                peak_bytes = None
+                if tracing and tracemalloc.is_tracing():
+                    frame['peak'] = max(frame['peak'], self._traced_peak()[1])
+                    if stack:
+                        stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+                    # Another thread's stages would have moved the shared peak
+                    if alone and self._overlaps == overlaps:
+                        peak_bytes = max(frame['peak'] - current, 0)
+                if not stack:
+                    self._active_threads -= 1
+
+                self.stages.append({
+                    'stage': name,
+                    'thread': threading.current_thread().name,
+                    'depth': len(stack),
+                    'start_s': round(start, 6),
+                    'wall_s': round(wall, 6),
+                    'cpu_s': round(cpu, 6),
+                    'peak_memory_bytes': peak_bytes,
+                    'sizes': dict(sizes),
+                })
+
+    def to_dict(self):
+        """Return the recorded stages as a JSON-serializable dict."""
+        with self._lock:
+            # Stages are recorded as they finish; list them in start order
+            stages = sorted(self.stages, key=lambda entry: entry['start_s'])
+            if self._run_peak is not None and tracemalloc.is_tracing():
+                self._traced_peak()
+            peak = self._run_peak
+        return {
+            'total_wall_s': round(time.perf_counter() - self._started, 6),
+            'peak_memory_bytes': max(peak - self._base_memory, 0) if peak is not None else None,
+            'stages': stages,
+        }
+
+    def format_text(self):
+        """Return the recorded stages as a human-readable table."""
+        data = self.to_dict()
+        # Keep each thread's nested stages together
+        thread_start = {}
+        for entry in data['stages']:
+            thread_start.setdefault(entry['thread'], entry['start_s'])
+        stages = sorted(data['stages'],
+                        key=lambda entry: (thread_start[entry['thread']], entry['start_s']))
+        lines = [
+            "\n⏱️  Timings:",
+            f"   {'stage':<24} {'wall s':>9} {'cpu s':>9} {'peak MB':>9}  sizes",
+        ]
+        for entry in stages:
+            name = '  ' * entry['depth'] + entry['stage']
+            peak = entry['peak_memory_bytes']
+            peak = f"{peak / (1024 * 1024):.1f}" if peak is not None else '-'
+            sizes = ', '.join(f"{key}={value}" for key, value in entry['sizes'].items())
+            lines.append(f"   {name:<24} {entry['wall_s']:>9.3f} {entry['cpu_s']:>9.3f} "
+                         f"{peak:>9}  {sizes}")
+        peak = data['peak_memory_bytes']
+        peak = f"{peak / (1024 * 1024):.1f}" if peak is not None else '-'
+        lines.append(f"   {'total':<24} {data['total_wall_s']:>9.3f} {'':>9} {peak:>9}")
+        return '\n'.join(lines)
+
+    def write_json(self, output_file, **extra):
+        """Write the recorded stages, plus any extra fields, to a JSON file."""
+        data = dict(extra, **self.to_dict())
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+
+def start_timings(track_memory=True):
+    """Start recording stage timings for this process.
+
+    Returns:
+        TimingRecorder: The active recorder
+    """
+    global _active
+    recorder = TimingRecorder(track_memory=track_memory)
+    recorder.start()
+    _active = recorder
+    return recorder
+
+
+def stop_timings():
+    """Stop recording and return the recorder, or None if none was active."""
+    global _active
+    recorder, _active = _active, None
+    if recorder is not None:
+        recorder.stop()
+    return recorder
+
+
+def stage(name, **sizes):
+    """Measure a pipeline stage if timings are being recorded.
+
+    Args:
+        name (str): Stage name, e.g. 'read_excel'
+        **sizes: Input sizes such as rows, sections or bytes
+
+    Returns:
+        A context manager yielding a dict to which further sizes may be added
+    """
+    recorder = _active
+    if recorder is None:
+        return span(name, 'stage', **sizes)
+    return recorder.stage(name, **sizes)
@@ -0,0 +1,286 @@
+"""Isolated Typst compilation in per-build scratch workspaces.
+
+Every compilation gets its own temporary folder holding a copy of the
+template (report.typ) and the generated report_content.typ, so concurrent
+builds from web requests, batch workers or ReportBuilder never overwrite
+each other's intermediate files. The files the template names by path,
+such as logos, are linked into the workspace so relative paths keep
+working; nothing else in the template's folder is visible to Typst.
+
+Two backends compile the workspace. The 'python' backend uses the typst
+Python bindings (``pip install typst``) in process, keeping one compiler
+per thread so fonts are discovered once and reused for every document.
+The 'cli' backend runs ``typst compile`` and is used when the bindings
+are not installed.
+
+Compilations are capped per process by a semaphore and each has a
+timeout, both configurable:
+
+- AUTORPT_TYPST_BACKEND: 'auto' (python if installed, else cli), 'python' or 'cli'
+- AUTORPT_TYPST_JOBS: concurrent compilations (default: CPU count)
+- AUTORPT_TYPST_TIMEOUT: seconds per compilation, 0 for none (default: 30).
+  Only the cli backend can stop a compilation that runs too long.
+"""
+
+import importlib.util
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from .timings import stage
+
+DEFAULT_TIMEOUT = 30
+
+TYPST_BACKENDS = ('auto', 'python', 'cli')
+
+# The typst package compiles documents in process
+TYPST_PY_AVAILABLE = importlib.util.find_spec('typst') is not None
+
+# Files produced by builds, never linked into a workspace
+_GENERATED = ('report.typ', 'report_content.typ')
+
+# A Typst string literal, such as the path in image("logo.png")
+_STRING_PATTERN = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+
+_slots = None
+_slots_size = None
+_slots_lock = threading.Lock()
+
+# In-process compilers are not thread-safe, so each thread keeps its own
+_compilers = threading.local()
+
+
+class TypstError(Exception):
+    """Raised when Typst is missing, fails or times out."""
+
+
+def get_typst_jobs():
+    """Return the number of Typst compilations allowed to run at once."""
+    value = os.environ.get('AUTORPT_TYPST_JOBS')
+    try:
+        jobs = int(value) if value else 0
+    except ValueError:
+        jobs = 0
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+def get_typst_timeout():
+    """Return the seconds allowed per Typst compilation, or None for no limit."""
+    value = os.environ.get('AUTORPT_TYPST_TIMEOUT')
+    if not value:
+        return DEFAULT_TIMEOUT
+    try:
+        timeout = float(value)
+    except ValueError:
+        return DEFAULT_TIMEOUT
+    return timeout if timeout > 0 else None
+
+
+def resolve_backend(backend=None):
+    """Return the backend used to compile Typst documents.
+
+    Args:
+        backend (str): 'auto', 'python' or 'cli' (default: the
+            AUTORPT_TYPST_BACKEND environment variable, or 'auto')
+
+    Returns:
+        str: 'python' or 'cli'
+
+    Raises:
+        ValueError: If the backend is unknown, or python is requested but
+            the typst package is not installed
+    """
+    backend = (backend or os.environ.get('AUTORPT_TYPST_BACKEND') or 'auto').lower()
+    if backend not in TYPST_BACKENDS:
+        raise ValueError(f"unknown Typst backend '{backend}' (choose from {', '.join(TYPST_BACKENDS)})")
+    if backend == 'auto':
+        return 'python' if TYPST_PY_AVAILABLE else 'cli'
+    if backend == 'python' and not TYPST_PY_AVAILABLE:
+        raise ValueError("the python Typst backend needs the typst package: pip install typst")
+    return backend
+
+
+def _typst_slots():
+    """Return the semaphore capping concurrent compilations, resized if the cap changed."""
+    global _slots, _slots_size
+    jobs = get_typst_jobs()
+    with _slots_lock:
+        if _slots is None or _slots_size != jobs:
+            _slots = threading.BoundedSemaphore(jobs)
+            _slots_size = jobs
+        return _slots
+
+
+def template_assets(template, asset_dir=None):
+    """Return the files a template refers to by a literal relative path.
+
+    Every string literal in the template that names a file in asset_dir
+    counts as a reference, so images, data files and included modules are
+    all found; .typ files found this way are searched in turn. Paths
+    starting with '/' are relative to asset_dir, as in Typst.
+
+    Args:
+        template (str or Path): Template text, or the path of report.typ
+        asset_dir (str or Path): Folder the paths are relative to
+            (default: the template's folder when it is a path)
+
+    Returns:
+        dict: Path of each referenced file by its name relative to asset_dir
+    """
+    if isinstance(template, Path):
+        if asset_dir is None:
+            asset_dir = template.parent
+        template = template.read_text(encoding='utf-8')
+    if asset_dir is None:
+        return {}
+    asset_dir = Path(asset_dir)
+
+    assets = {}
+    pending = [(template, '')]
+    while pending:
+        text, folder = pending.pop()
+        for literal in _STRING_PATTERN.findall(text):
+            name = literal[1:] if literal.startswith('/') else os.path.join(folder, literal)
+            name = os.path.normpath(name).replace(os.sep, '/') if name else ''
+            parts = name.split('/')
+            if (not name or os.path.isabs(name) or parts[0] in _GENERATED
+                    or any(part == '..' or part.startswith('.') for part in parts)):
+                continue
+            path = asset_dir / name
+            if name in assets or not path.is_file():
+                continue
+            assets[name] = path
+            if path.suffix == '.typ':
+                try:
+                    pending.append((path.read_text(encoding='utf-8'), os.path.dirname(name)))
+                except (OSError, UnicodeDecodeError):
+                    continue
+    return dict(sorted(assets.items()))
+
+
+def _link_assets(template, asset_dir, workspace):
+    """Link the files the template refers to (see template_assets) into the workspace.
+
+    Files are symlinked where the platform allows it and otherwise left
+    out, so templates referencing them fail just as they would elsewhere.
+    """
+    for name, path in template_assets(template, asset_dir).items():
+        link = workspace / name
+        try:
+            link.parent.mkdir(parents=True, exist_ok=True)
+            os.symlink(path.resolve(), link)
+        except OSError:
+            continue
+
+
+def compile_typst(template, typst_text, asset_dir=None, timeout=None, data_files=None,
+                  backend=None):
+    """Compile a template and its generated content to PDF in a scratch workspace.
+
+    Args:
+        template (str or Path): Template text, or the path of report.typ
+        typst_text (str): Generated markup, included by the template as
+            "report_content.typ"
+        asset_dir (str or Path): Folder holding the files the template loads
+            by relative path (default: the template's folder when it is a
+            path); only the files it names are linked into the workspace
+        timeout (float): Seconds allowed for the compilation (default:
+            AUTORPT_TYPST_TIMEOUT)
+        data_files (dict): Table data files and other generated files loaded
+            by the markup, as bytes by path relative to report_content.typ
+        backend (str): 'auto', 'python' or 'cli' (see resolve_backend)
+
+    Returns:
+        bytes: The PDF
+
+    Raises:
+        TypstError: If Typst is not installed, fails or times out
+        ValueError: If the backend is unknown or not installed
+    """
+    if isinstance(template, Path):
+        if asset_dir is None:
+            asset_dir = template.parent
+        template = template.read_text(encoding='utf-8')
+    if timeout is None:
+        timeout = get_typst_timeout()
+    backend = resolve_backend(backend)
+
+    with tempfile.TemporaryDirectory(prefix='autorpt-typst-') as workspace:
+        workspace = Path(workspace)
+        if asset_dir is not None:
+            _link_assets(template, asset_dir, workspace)
+        (workspace / 'report.typ').write_text(template, encoding='utf-8')
+        (workspace / 'report_content.typ').write_text(typst_text, encoding='utf-8')
+        for file_name, payload in (data_files or {}).items():
+            # Never write through a link to the asset folder
+            top = workspace / Path(file_name).parts[0]
+            if top.is_symlink():
+                top.unlink()
+            target = workspace / file_name
+            if target.is_symlink():
+                target.unlink()
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(payload)
+
+        with _typst_slots():
+            with stage('typst_compile', backend=backend) as sizes:
+                if backend == 'python':
+                    data = _compile_in_process(workspace)
+                else:
+                    data = _compile_with_cli(workspace, timeout)
+                sizes['bytes'] = len(data)
+    return data
+
+
+def _compile_in_process(workspace):
+    """Compile the workspace's report.typ with this thread's typst compiler."""
+    import typst
+
+    compiler = getattr(_compilers, 'compiler', None)
+    if compiler is None:
+        # Fonts are discovered once, when the compiler is created
+        font_paths = [path for path in os.environ.get('TYPST_FONT_PATHS', '').split(os.pathsep)
+                      if path]
+        compiler = _compilers.compiler = typst.Compiler(font_paths=font_paths)
+    try:
+        return compiler.compile(input=str(workspace / 'report.typ'), root=str(workspace),
+                                format='pdf')
+    except typst.TypstError as e:
+        raise TypstError(f"Typst compilation failed:\n{e.diagnostic or e.message}") from e
+    except RuntimeError as e:
+        raise TypstError(f"Typst compilation failed:\n{e}") from e
+
+
+def _compile_with_cli(workspace, timeout):
+    """Compile the workspace's report.typ with the typst command line tool."""
+    output_file = workspace / 'report.pdf'
+    try:
+        result = subprocess.run(
+            ['typst', 'compile', 'report.typ', output_file.name],
+            cwd=str(workspace), capture_output=True, text=True, timeout=timeout)
+    except FileNotFoundError as e:
+        raise TypstError("Typst not found") from e
+    except subprocess.TimeoutExpired as e:
+        raise TypstError(f"Typst compilation timed out after {timeout:g}s") from e
+    if result.returncode != 0:
+        raise TypstError(f"Typst compilation failed:\n{result.stderr.strip()}")
+    if not output_file.exists():
+        raise TypstError("Typst compilation succeeded but PDF file not created")
+    return output_file.read_bytes()
+
+
+def write_output(output_file, data):
+    """Write a build's output atomically, so readers never see a partial file."""
+    output_file = Path(output_file)
+    tmp_file = output_file.with_name(f".{output_file.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, output_file)
+    finally:
+        if tmp_file.exists():
+            tmp_file.unlink()
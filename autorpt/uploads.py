@@ -0,0 +1,288 @@
+"""Content-addressed storage of uploaded workbooks.
+
+Uploads are streamed to disk in chunks while their SHA-256 is computed,
+and each distinct workbook is stored once, named by its hash. Users see
+their uploads under their own file names through hard links in their
+workspaces. The summary shown after an upload (preview, row count and
+columns) is computed once per workbook and stored next to it, so
+uploading the same file again answers straight away.
+
+Files larger than one request allows are sent as resumable chunked
+uploads: a client starts an upload, appends chunks at the offset the
+server has received so far, asking for that offset again after a
+failure, and completes the upload once every byte has arrived.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from pathlib import Path
+
+from .common import file_sha256
+
+CHUNK_SIZE = 1024 * 1024
+
+# Largest workbook accepted through a chunked upload
+MAX_UPLOAD_SIZE = 1024 * 1024 * 1024
+
+UPLOAD_SUFFIXES = ('.xlsx', '.xls')
+
+_DIGEST_PATTERN = re.compile(r'^[0-9a-f]{64}$')
+_UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+
+class UploadError(Exception):
+    """Raised when an upload is invalid, unknown or incomplete."""
+
+
+class UploadStore:
+    """Store uploaded workbooks once per distinct content.
+
+    Blobs live in ``blobs/`` as ``<sha256><suffix>`` with their cached
+    summary as ``<sha256>.json``; chunked uploads in progress live in
+    ``partial/`` as ``<id>.part`` with their details in ``<id>.json``.
+    """
+
+    def __init__(self, root):
+        """Initialize the store.
+
+        Args:
+            root (str or Path): Folder holding the blobs and partial uploads
+        """
+        self.root = Path(root)
+        self.blobs_dir = self.root / 'blobs'
+        self.partial_dir = self.root / 'partial'
+        self._lock = threading.Lock()
+        # Chunked uploads being appended to, each with its own lock
+        self._upload_locks = {}
+
+    def _ensure_dirs(self):
+        """Create the store's folders"""
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def check_suffix(filename):
+        """Return the workbook suffix of filename.
+
+        Raises:
+            UploadError: If the file is not an .xlsx or .xls workbook
+        """
+        suffix = Path(filename).suffix.lower()
+        if suffix not in UPLOAD_SUFFIXES:
+            raise UploadError('Invalid file type. Please upload .xlsx or .xls')
+        return suffix
+
+    def find(self, digest, suffix=None):
+        """Return the stored blob with this SHA-256 (and suffix, if given), or None."""
+        if not _DIGEST_PATTERN.match(digest or ''):
+            return None
+        for suffix in [suffix] if suffix else UPLOAD_SUFFIXES:
+            blob = self.blobs_dir / f"{digest}{suffix}"
+            if blob.exists():
+                return blob
+        return None
+
+    def _commit(self, tmp_file, digest, suffix):
+        """Move a received file into the store, unless the blob already exists.
+
+        Returns:
+            tuple: (blob path, True if the blob was already stored)
+        """
+        blob = self.blobs_dir / f"{digest}{suffix}"
+        with self._lock:
+            if blob.exists():
+                tmp_file.unlink()
+                return blob, True
+            os.replace(tmp_file, blob)
+        return blob, False
+
+    def save_stream(self, stream, suffix):
+        """Store a workbook read from a binary stream, hashing it as it is written.
+
+        Args:
+            stream (file object): The upload, read in chunks
+            suffix (str): Workbook suffix, '.xlsx' or '.xls'
+
+        Returns:
+            tuple: (SHA-256 hex digest, blob path, True if already stored)
+        """
+        self._ensure_dirs()
+        tmp_file = self.partial_dir / f"{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        try:
+            with open(tmp_file, 'wb') as f:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    digest.update(chunk)
+                    f.write(chunk)
+        except BaseException:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        digest = digest.hexdigest()
+        blob, existed = self._commit(tmp_file, digest, suffix)
+        return digest, blob, existed
+
+    def _partial_files(self, upload_id):
+        """Return the data and details files of a chunked upload"""
+        if not _UPLOAD_ID_PATTERN.match(upload_id or ''):
+            raise UploadError('Unknown upload')
+        return self.partial_dir / f"{upload_id}.part", self.partial_dir / f"{upload_id}.json"
+
+    def start(self, filename, size):
+        """Start a chunked upload and return its id.
+
+        Args:
+            filename (str): Name the workbook is saved under
+            size (int): Total size in bytes
+
+        Raises:
+            UploadError: If the file type or size is not accepted
+        """
+        suffix = self.check_suffix(filename)
+        if not isinstance(size, int) or not 0 < size <= MAX_UPLOAD_SIZE:
+            raise UploadError(f'Upload size must be between 1 byte and {MAX_UPLOAD_SIZE} bytes')
+        self._ensure_dirs()
+        upload_id = uuid.uuid4().hex
+        part_file, info_file = self._partial_files(upload_id)
+        part_file.touch()
+        info_file.write_text(json.dumps({'filename': filename, 'suffix': suffix, 'size': size}),
+                             encoding='utf-8')
+        return upload_id
+
+    def status(self, upload_id):
+        """Return a chunked upload's details with the bytes received as 'offset'.
+
+        Raises:
+            UploadError: If the upload is unknown
+        """
+        part_file, info_file = self._partial_files(upload_id)
+        try:
+            info = json.loads(info_file.read_text(encoding='utf-8'))
+            info['offset'] = part_file.stat().st_size
+        except (OSError, ValueError) as e:
+            raise UploadError('Unknown upload') from e
+        return info
+
+    @contextlib.contextmanager
+    def _upload_lock(self, upload_id):
+        """Hold the lock of one chunked upload, dropping it once nobody waits on it"""
+        with self._lock:
+            lock, users = self._upload_locks.get(upload_id, (threading.Lock(), 0))
+            self._upload_locks[upload_id] = (lock, users + 1)
+        try:
+            with lock:
+                yield
+        finally:
+            with self._lock:
+                users = self._upload_locks[upload_id][1] - 1
+                if users:
+                    self._upload_locks[upload_id] = (lock, users)
+                else:
+                    del self._upload_locks[upload_id]
+
+    def append(self, upload_id, offset, stream):
+        """Append a chunk read from stream at offset and return the bytes received.
+
+        A chunk whose offset does not match the bytes already received is
+        rejected, so a client resumes by asking for the status first.
+        Chunks of one upload are appended one at a time, so two requests
+        sending the same offset cannot both be written.
+
+        Raises:
+            UploadError: If the upload is unknown, the offset is wrong or
+                the upload would exceed its size
+        """
+        part_file, _ = self._partial_files(upload_id)
+        with self._upload_lock(upload_id):
+            info = self.status(upload_id)
+            if offset != info['offset']:
+                raise UploadError(f"Expected offset {info['offset']}")
+            received = offset
+            with open(part_file, 'ab') as f:
+                for chunk in iter(lambda: stream.read(CHUNK_SIZE), b''):
+                    received += len(chunk)
+                    if received > info['size']:
+                        f.truncate(offset)
+                        raise UploadError('Upload is larger than its declared size')
+                    f.write(chunk)
+            return received
+
+    def finish(self, upload_id):
+        """Move a fully received chunked upload into the store.
+
+        Returns:
+            tuple: (file name, SHA-256 hex digest, blob path, True if already stored)
+
+        Raises:
+            UploadError: If the upload is unknown or incomplete
+        """
+        with self._upload_lock(upload_id):
+            info = self.status(upload_id)
+            if info['offset'] != info['size']:
+                raise UploadError(
+                    f"Upload incomplete: {info['offset']} of {info['size']} bytes received")
+            part_file, info_file = self._partial_files(upload_id)
+            digest = file_sha256(part_file)
+            blob, existed = self._commit(part_file, digest, info['suffix'])
+            info_file.unlink(missing_ok=True)
+        return info['filename'], digest, blob, existed
+
+    def summary(self, digest, blob, compute):
+        """Return a blob's summary, computing and storing it on first use.
+
+        Args:
+            digest (str): The blob's SHA-256
+            blob (Path): The stored workbook
+            compute (callable): Called with the blob path to build the
+                summary dict when none is stored
+
+        Returns:
+            dict: The summary
+        """
+        summary_file = self.blobs_dir / f"{digest}.json"
+        try:
+            return json.loads(summary_file.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            pass
+        summary = compute(blob)
+        tmp_file = summary_file.with_name(f".{summary_file.name}.{uuid.uuid4().hex}.tmp")
+        tmp_file.write_text(json.dumps(summary), encoding='utf-8')
+        os.replace(tmp_file, summary_file)
+        return summary
+
+    @staticmethod
+    def link(blob, target):
+        """Make target a hard link to blob (a copy where links are not supported)."""
+        target = Path(target)
+        tmp_file = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            os.link(blob, tmp_file)
+        except OSError:
+            shutil.copyfile(blob, tmp_file)
+        os.replace(tmp_file, target)
+
+    def prune(self, max_age):
+        """Delete stale partial uploads and blobs no workspace links to any more.
+
+        Args:
+            max_age (float): Seconds since a file was last modified
+        """
+        cutoff = time.time() - max_age
+        for folder in (self.partial_dir, self.blobs_dir):
+            if not folder.exists():
+                continue
+            for entry in folder.iterdir():
+                stat = entry.stat()
+                if stat.st_mtime >= cutoff or entry.suffix == '.json':
+                    continue
+                # A blob with no other link is no longer in any workspace
+                if folder == self.blobs_dir and stat.st_nlink > 1:
+                    continue
+                entry.unlink(missing_ok=True)
+                entry.with_suffix('.json').unlink(missing_ok=True)
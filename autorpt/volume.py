@@ -0,0 +1,154 @@
+"""Combined PDF volumes of many project reports, compiled in one Typst run.
+
+Each project's content.md is converted to its own Typst include, and one
+volume document includes them all after a generated table of contents.
+Typst starts, loads fonts and reads the template once for the whole
+volume instead of once per report. Pages are numbered continuously
+through the volume, so the page listed for a report in the table of
+contents is the number printed in its footer.
+"""
+
+from datetime import datetime
+from pathlib import Path
+
+from .batch import discover_projects
+from .common import print_error, print_results_summary, span, traced
+
+# Workspace folder holding the per-project includes and their data files
+VOLUME_DIR = '_volume'
+
+
+def _typst_string(text):
+    """Return text as a Typst string literal."""
+    text = ' '.join(str(text).split())
+    return '"' + text.replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def _volume_template(root_dir, projects):
+    """Return the template used for the volume: root's report.typ, else the first project's."""
+    for folder in [Path(root_dir)] + list(projects):
+        template = folder / 'report.typ'
+        if template.is_file():
+            return template
+    return None
+
+
+def volume_markup(reports, title='Contents'):
+    """Return the Typst markup of a volume.
+
+    Args:
+        reports (list): (report title, include path) pairs in volume order
+        title (str): Heading of the table of contents
+
+    Returns:
+        str: Markup that includes every report after a table of contents
+    """
+    lines = [
+        f'#heading(level: 1, outlined: false)[#{_typst_string(title)}]',
+        '',
+        '#context for report in query(<autorpt-report>) [',
+        '  #link(report.location())[#report.body #box(width: 1fr, repeat[.]) '
+        '#counter(page).at(report.location()).first()] \\',
+        ']',
+        '',
+    ]
+    for report_title, include in reports:
+        name = _typst_string(report_title)
+        lines.extend([
+            '#pagebreak(weak: true)',
+            f'#set page(footer: context align(center, text(size: 9pt)[#{name} — '
+            '#counter(page).display()]))',
+            f'#heading(level: 1, outlined: false)[#{name}] <autorpt-report>',
+            '#[',
+            '  #set heading(offset: 1)',
+            f'  #include {_typst_string(include)}',
+            ']',
+            '',
+        ])
+    return '\n'.join(lines)
+
+
+@traced('build_volume', 'volume')
+def build_volume(root_dir='reports', output_file=None, title='Contents'):
+    """Compile every project report below root_dir into one PDF.
+
+    Projects are found as for ``auto batch`` and titled with their
+    ``project:`` frontmatter value or folder name. The volume uses
+    root_dir's report.typ, or the first project's when root_dir has none,
+    and tables that cannot be read are left out as in single PDF reports.
+
+    Args:
+        root_dir (str or Path): Directory holding one folder per project
+        output_file (str or Path): PDF to write (default:
+            volume_YYYY-MM-DD.pdf in root_dir)
+        title (str): Heading of the table of contents
+
+    Returns:
+        dict: Summary with success/failed/errors/discovered keys and the
+        PDF path under 'output' (None if no volume was written)
+    """
+    from .autorpt import markdown_to_typst, read_content
+    from .placeholders import compile_plan
+    from .typst_build import TypstError, compile_typst, write_output
+
+    root_dir = Path(root_dir)
+    projects = discover_projects(root_dir)
+    results = {'success': 0, 'failed': 0, 'errors': [], 'discovered': len(projects),
+               'output': None}
+
+    if not projects:
+        print(f"ℹ️  No project folders with content.md found in {root_dir}")
+        return results
+
+    template = _volume_template(root_dir, projects)
+    if template is None:
+        print_error(f"Typst template not found: add report.typ to {root_dir}/")
+        results['failed'] = len(projects)
+        results['errors'].append("report.typ not found")
+        return results
+
+    if output_file is None:
+        output_file = root_dir / f"volume_{datetime.now().strftime('%Y-%m-%d')}.pdf"
+
+    print(f"📚 Building a volume of {len(projects)} report(s)...")
+    reports = []
+    files = {}
+    for number, project_dir in enumerate(projects, start=1):
+        with span('volume_report', 'volume', project=project_dir.name):
+            try:
+                content_text = read_content(project_dir / 'content.md')
+                plan = compile_plan(content_text)
+                data_files = {}
+                typst_text = markdown_to_typst(content_text, tables=plan.load_tables(project_dir),
+                                               data_files=data_files)
+            except Exception as e:
+                results['failed'] += 1
+                results['errors'].append(f"{project_dir.name}: {e}")
+                print(f"   ❌ {project_dir.name}: {e}")
+                continue
+
+        # Data files are loaded relative to the include that uses them
+        folder = f"{VOLUME_DIR}/{number:03d}"
+        files[f"{folder}/report_content.typ"] = typst_text.encode('utf-8')
+        for file_name, payload in data_files.items():
+            files[f"{folder}/{file_name}"] = payload
+        reports.append((plan.metadata.get('project') or project_dir.name,
+                        f"{folder}/report_content.typ"))
+        results['success'] += 1
+        print(f"   ✅ {project_dir.name}")
+
+    if reports:
+        print(f"🔄 Compiling {len(reports)} report(s) with Typst...")
+        try:
+            data = compile_typst(template, volume_markup(reports, title), data_files=files)
+            write_output(output_file, data)
+            results['output'] = str(output_file)
+            print(f"✅ Volume created: {output_file} ({len(data) / 1024:.1f} KB)")
+        except (TypstError, ValueError, OSError) as e:
+            print_error(str(e))
+            results['errors'].append(f"volume: {e}")
+            results['failed'] += results['success']
+            results['success'] = 0
+
+    print_results_summary(results, "Volume Build")
+    return results
@@ -0,0 +1,287 @@
+"""Watch content.md, its workbooks and report.typ and rebuild reports on change."""
+
+import os
+import subprocess
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .common import print_error, print_info, print_success, print_warning
+
+
+class ReportWatcher:
+    """Rebuild a report folder incrementally whenever its inputs change.
+
+    Only the stages whose inputs changed are redone: a workbook referenced by
+    a table placeholder is re-read only when it changes, the markdown is
+    re-converted only when content.md or one of its tables changes, and the
+    Word or Typst stages run
+    only when those formats were requested. PDFs are produced by a single
+    long-lived ``typst watch`` process that recompiles whenever the
+    regenerated report_content.typ (or report.typ itself) is written.
+    """
+
+    def __init__(self, reports_dir="reports", formats=('docx',), debounce=0.3,
+                 poll_interval=0.2):
+        """Initialize the watcher.
+
+        Args:
+            reports_dir (str or Path): Folder with content.md, budget.xlsx and report.typ
+            formats (tuple): Formats to keep up to date, any of 'docx' and 'pdf'
+            debounce (float): Seconds without further changes before rebuilding
+            poll_interval (float): Seconds between file modification checks
+        """
+        self.reports_dir = Path(reports_dir)
+        self.formats = tuple(formats)
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+
+        self.content_file = self.reports_dir / 'content.md'
+        self.template_file = self.reports_dir / 'report.typ'
+        self.report_content_file = self.reports_dir / 'report_content.typ'
+
+        self.content_text = None
+        self.plan = None
+        self.tables = {}
+        self.table_markup = {}
+        self.data_files = {}
+        self.typst_process = None
+        self._typst_output_file = None
+
+    def watched_files(self):
+        """Return the input files whose changes trigger a rebuild."""
+        files = [self.content_file]
+        if self.plan is not None:
+            files.extend(self.plan.table_files(self.reports_dir))
+        else:
+            files.append(self.reports_dir / 'budget.xlsx')
+        if 'pdf' in self.formats:
+            files.append(self.template_file)
+        return files
+
+    def snapshot(self):
+        """Return the modification time and size of every watched file."""
+        state = {}
+        for path in self.watched_files():
+            try:
+                stat = path.stat()
+                state[self._name(path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                state[self._name(path)] = None
+        return state
+
+    def _name(self, path):
+        """Return a watched file's path relative to the report folder."""
+        return Path(os.path.relpath(path, self.reports_dir)).as_posix()
+
+    def rebuild(self, changed):
+        """Redo the stages affected by the changed input files.
+
+        Args:
+            changed (set): Names of the files that changed since the last build
+
+        Returns:
+            bool: True if every requested stage succeeded
+        """
+        from .autorpt import (build_word_document, markdown_to_typst, write_typst_content,
+                              write_typst_data_files)
+        from .placeholders import compile_plan, missing_tables
+
+        started = time.perf_counter()
+        success = True
+
+        if self.content_file.name in changed or self.content_text is None:
+            if not self.content_file.exists():
+                print_error(f"{self.content_file} not found")
+                return False
+            with open(self.content_file, 'r', encoding='utf-8') as f:
+                self.content_text = f.read()
+            self.plan = compile_plan(self.content_text)
+
+        # Drop tables no longer referenced or whose workbook changed, then
+        # read the ones not loaded yet
+        stale = [ref for ref in self.tables
+                 if ref not in self.plan.tables
+                 or self._name(self.reports_dir / ref.file) in changed]
+        for ref in stale:
+            del self.tables[ref]
+            self.table_markup.pop(ref, None)
+        new_refs = [ref for ref in self.plan.tables if ref not in self.tables]
+        if new_refs:
+            self.tables.update(self.plan.load_tables(self.reports_dir, new_refs))
+
+        content_changed = bool(stale or new_refs) or self.content_file.name in changed
+
+        if 'docx' in self.formats and content_changed:
+            missing = missing_tables(self.tables)
+            if missing:
+                print_error(f"{', '.join(missing)} could not be read, skipping Word report")
+                success = False
+            else:
+                doc = build_word_document(self.content_text, tables=self.tables)
+                output_file = self.reports_dir / f"report_{datetime.now().strftime('%Y-%m-%d')}.docx"
+                try:
+                    doc.save(str(output_file))
+                    print_success(f"Word report updated: {output_file}")
+                except (OSError, PermissionError) as e:
+                    print_error(f"Error saving {output_file}: {e}")
+                    success = False
+
+        if 'pdf' in self.formats and content_changed:
+            typst_text = markdown_to_typst(self.content_text, tables=self.tables,
+                                           table_markup=self.table_markup,
+                                           data_files=self.data_files)
+            # Data files first, so typst watch never sees content without them
+            write_typst_data_files(self.reports_dir, self.data_files)
+            self._drop_unused_data_files()
+            if write_typst_content(self.report_content_file, typst_text):
+                print_info(f"Typst content updated: {self.report_content_file}")
+
+        if 'pdf' in self.formats:
+            success = self.ensure_typst_watch() and success
+
+        elapsed = time.perf_counter() - started
+        print_info(f"Rebuilt {', '.join(sorted(changed))} in {elapsed:.2f}s")
+        return success
+
+    def _drop_unused_data_files(self):
+        """Delete the data files of tables that have since changed or been removed."""
+        used = '\n'.join(markup for markup in self.table_markup.values() if markup)
+        for file_name in [name for name in self.data_files if name not in used]:
+            del self.data_files[file_name]
+            (self.reports_dir / file_name).unlink(missing_ok=True)
+
+    def ensure_typst_watch(self):
+        """Start the long-lived ``typst watch`` process if it is not running.
+
+        Returns:
+            bool: True if the process is running
+        """
+        output_name = f"report_{datetime.now().strftime('%Y-%m-%d')}.pdf"
+        if self.typst_process is not None:
+            if self.typst_process.poll() is None and self._typst_output_file == output_name:
+                return True
+            self.stop_typst_watch()
+
+        if not self.template_file.exists():
+            print_error(f"Typst template not found: {self.template_file}")
+            return False
+
+        try:
+            self.typst_process = subprocess.Popen(
+                ['typst', 'watch', self.template_file.name, output_name],
+                cwd=str(self.reports_dir),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+            )
+        except FileNotFoundError:
+            print_error("Typst not found. Please install Typst:")
+            print("   https://github.com/typst/typst")
+            self.formats = tuple(fmt for fmt in self.formats if fmt != 'pdf')
+            return False
+
+        self._typst_output_file = output_name
+        threading.Thread(target=self._relay_typst_output,
+                         args=(self.typst_process,), daemon=True).start()
+        print_info(f"typst watch started for {self.reports_dir / output_name}")
+        return True
+
+    def stop_typst_watch(self):
+        """Stop the ``typst watch`` process if it is running."""
+        if self.typst_process is None:
+            return
+        if self.typst_process.poll() is None:
+            self.typst_process.terminate()
+            try:
+                self.typst_process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.typst_process.kill()
+        self.typst_process = None
+
+    @staticmethod
+    def _relay_typst_output(process):
+        """Print the typst watch diagnostics as they arrive."""
+        for line in process.stdout:
+            line = line.rstrip()
+            if line:
+                print(f"   typst: {line}")
+
+    def _follow_watched_files(self, last_state):
+        """Start tracking workbooks newly referenced by content.md.
+
+        Files that were already watched keep their last seen state, so saves
+        made during a rebuild still trigger the next one.
+        """
+        state = self.snapshot()
+        return {name: last_state.get(name, state[name]) for name in state}
+
+    def run(self, max_rebuilds=None):
+        """Build once, then poll the inputs and rebuild after each burst of saves.
+
+        Args:
+            max_rebuilds (int): Stop after this many rebuilds (default: run until interrupted)
+
+        Returns:
+            int: Number of rebuilds performed
+        """
+        print(f"👀 Watching {', '.join(str(p) for p in self.watched_files())}")
+        print("⌨️  Press CTRL+C to stop\n")
+
+        last_state = self.snapshot()
+        self.rebuild(set(last_state))
+        last_state = self._follow_watched_files(last_state)
+        rebuilds = 1
+
+        try:
+            while max_rebuilds is None or rebuilds < max_rebuilds:
+                time.sleep(self.poll_interval)
+                state = self.snapshot()
+                if state == last_state:
+                    continue
+
+                # Debounce: wait until the files stop changing
+                changed = {name for name in state if state[name] != last_state.get(name)}
+                settled_at = time.monotonic() + self.debounce
+                while time.monotonic() < settled_at:
+                    time.sleep(min(self.poll_interval, self.debounce))
+                    newer = self.snapshot()
+                    if newer != state:
+                        changed |= {name for name in newer if newer[name] != state.get(name)}
+                        state = newer
+                        settled_at = time.monotonic() + self.debounce
+
+                last_state = state
+                try:
+                    self.rebuild(changed)
+                except Exception as e:
+                    print_error(f"Rebuild failed: {e}")
+                last_state = self._follow_watched_files(last_state)
+                rebuilds += 1
+        except KeyboardInterrupt:
+            print("\n\nWatch stopped")
+        finally:
+            self.stop_typst_watch()
+
+        return rebuilds
+
+
+def watch_reports(reports_dir="reports", formats=('docx',), debounce=0.3):
+    """Watch a report folder and keep the requested formats up to date.
+
+    Args:
+        reports_dir (str or Path): Folder with content.md, budget.xlsx and report.typ
+        formats (tuple): Formats to keep up to date, any of 'docx' and 'pdf'
+        debounce (float): Seconds without further changes before rebuilding
+
+    Returns:
+        int: 0 when the watch ends normally, 1 if the folder is missing
+    """
+    if not Path(reports_dir).is_dir():
+        print_error(f"Reports directory not found: {reports_dir}")
+        return 1
+    if 'pdf' in formats and not (Path(reports_dir) / 'report.typ').exists():
+        print_warning(f"No report.typ in {reports_dir}, PDF output will fail until it exists")
+    ReportWatcher(reports_dir, formats=formats, debounce=debounce).run()
+    return 0
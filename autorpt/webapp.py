@@ -1,23 +1,16 @@
 """Web application for autorpt - A user-friendly interface for report generation."""
 
-import os
 import json
 import glob
+import shutil
+import time
+import uuid
 import webbrowser
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from flask import Flask, render_template, request, jsonify, send_file, redirect, url_for
+from flask import Flask, Response, g, render_template, request, jsonify, send_file, session
 from werkzeug.utils import secure_filename
-import pandas as pd
-
-# Try to import report generation functions
-try:
-    from .autorpt import create_report_word
-    from .pdf import create_report_pdf
-except ImportError:
-    # Fallback if imports fail
-    create_report_word = None
-    create_report_pdf = None
 
 try:
     from .common import read_markdown_with_frontmatter
@@ -40,6 +33,16 @@ except ImportError:
                 return metadata, body
         return {}, content
 
+from .builder import ReportBuilder
+from .common import span
+from .jobs import JobQueue
+from .excel import read_excel_cached
+from .gallery import GALLERY_SORT_KEYS, GalleryIndex
+from .sections import BUDGET_TABLE
+from .store import AppStore
+from .typst_build import write_output
+from .uploads import UploadError, UploadStore
+
 try:
     from . import __version__
 except ImportError:
@@ -54,50 +57,118 @@ REPORTS_DIR = Path('reports')
 SNIPPETS_FILE = REPORTS_DIR / 'snippets.json'
 HISTORY_FILE = REPORTS_DIR / 'history.json'
 
-# Ensure directories exist
-REPORTS_DIR.mkdir(exist_ok=True)
+# The stores below create their files under REPORTS_DIR when first used,
+# so importing this module writes nothing and starts no threads
+
+# Report history and snippets, imported once from the JSON files above
+STORE = AppStore(REPORTS_DIR / 'autorpt.db', history_file=HISTORY_FILE,
+                 snippets_file=SNIPPETS_FILE)
+
+# Each browser session uploads into its own workspace, and each build
+# writes into its own output folder, so users never overwrite each other
+WORKSPACES_DIR = REPORTS_DIR / '.workspaces'
+OUTPUTS_DIR = REPORTS_DIR / '.outputs'
+WORKSPACE_MAX_AGE = 7 * 24 * 3600
+
+# Uploaded workbooks, stored once per distinct content
+UPLOADS = UploadStore(REPORTS_DIR / '.uploads')
+
+# Most rows returned by one table page
+TABLE_PAGE_LIMIT = 1000
+
+# Metadata of the saved reports listed in the gallery
+GALLERY = GalleryIndex(REPORTS_DIR)
+
+# Report builds run in the background; job records are kept in reports/.jobs
+JOBS = JobQueue(REPORTS_DIR / '.jobs')
+
 
+@app.before_request
+def start_request_span():
+    """Record each request as a span when tracing is on."""
+    g.request_span = span(f'{request.method} {request.path}', 'http',
+                          method=request.method, path=request.path)
+    g.request_span.__enter__()
 
-def get_snippets():
-    """Load saved snippets."""
-    if SNIPPETS_FILE.exists():
-        with open(SNIPPETS_FILE, 'r') as f:
-            return json.load(f)
-    return []
 
+@app.after_request
+def record_response_status(response):
+    """Add the response status to the request span."""
+    request_span = g.get('request_span')
+    if request_span is not None:
+        request_span.args['status'] = response.status_code
+    return response
 
-def save_snippets(snippets):
-    """Save snippets to file."""
-    with open(SNIPPETS_FILE, 'w') as f:
-        json.dump(snippets, f, indent=2)
 
+@app.teardown_request
+def end_request_span(exc):
+    """Close the request span."""
+    request_span = g.pop('request_span', None)
+    if request_span is not None:
+        request_span.__exit__(type(exc) if exc else None, exc, None)
 
-def get_history():
-    """Load report history."""
-    if HISTORY_FILE.exists():
-        with open(HISTORY_FILE, 'r') as f:
-            return json.load(f)
-    return []
 
+def get_workspace():
+    """Return the current browser session's workspace folder for uploads."""
+    workspace_id = session.get('workspace')
+    if not workspace_id or not workspace_id.isalnum():
+        workspace_id = session['workspace'] = uuid.uuid4().hex
+    workspace = WORKSPACES_DIR / workspace_id
+    workspace.mkdir(parents=True, exist_ok=True)
+    return workspace
 
-def save_history(history):
-    """Save report history."""
-    with open(HISTORY_FILE, 'w') as f:
-        json.dump(history, f, indent=2)
+
+def workspace_workbooks(workspace):
+    """Return the workbooks uploaded to a workspace by file name."""
+    return {path.name: path for ext in ('*.xlsx', '*.xls') for path in workspace.glob(ext)}
+
+
+def session_content(workspace):
+    """Return the content.md a session edits.
+
+    Content saved in the web app goes to the session's workspace; until the
+    session saves its own, it starts from the shared reports/content.md.
+    """
+    content_path = workspace / 'content.md'
+    return content_path if content_path.exists() else REPORTS_DIR / 'content.md'
+
+
+def prune_workspaces(max_age=WORKSPACE_MAX_AGE):
+    """Delete session workspaces and build outputs not modified within max_age seconds."""
+    cutoff = time.time() - max_age
+    for parent in (WORKSPACES_DIR, OUTPUTS_DIR):
+        if not parent.exists():
+            continue
+        for folder in parent.iterdir():
+            if folder.is_dir() and folder.stat().st_mtime < cutoff:
+                shutil.rmtree(folder, ignore_errors=True)
+    UPLOADS.prune(max_age)
+
+
+def compose_content(metadata, content):
+    """Return content.md text with the metadata as YAML frontmatter."""
+    lines = ['---']
+    for key, value in metadata.items():
+        lines.append(f'{key}: {value}')
+    lines.append('---')
+    lines.append('')
+    lines.append(content)
+    return '\n'.join(lines)
 
 
-def add_to_history(filename, format_type, content_preview):
+def add_to_history(filename, format_type, content_preview, download_url=None):
     """Add a generated report to history."""
-    history = get_history()
-    history.insert(0, {
-        'filename': filename,
-        'format': format_type,
-        'timestamp': datetime.now().isoformat(),
-        'preview': content_preview[:100] + '...' if len(content_preview) > 100 else content_preview
-    })
-    # Keep only last 50 entries
-    history = history[:50]
-    save_history(history)
+    STORE.add_history(
+        filename, format_type,
+        content_preview[:100] + '...' if len(content_preview) > 100 else content_preview,
+        download_url or f'/api/download/{filename}')
+
+
+def page_args(default_limit, max_limit):
+    """Return the limit and offset query parameters of a paginated endpoint."""
+    limit = min(max(request.args.get('limit', default_limit, type=int), 0), max_limit)
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    return limit, offset
 
 
 @app.route('/')
@@ -114,8 +185,8 @@ def get_version():
 
 @app.route('/api/load-content', methods=['GET'])
 def load_content():
-    """Load existing content.md file."""
-    content_path = REPORTS_DIR / 'content.md'
+    """Load the session's content.md file."""
+    content_path = session_content(get_workspace())
     if content_path.exists():
         with open(content_path, 'r', encoding='utf-8') as f:
             content = f.read()
@@ -137,28 +208,42 @@ def load_content():
 
 @app.route('/api/save-content', methods=['POST'])
 def save_content():
-    """Save content to content.md."""
+    """Save content to the session's content.md."""
     data = request.json
-    metadata = data.get('metadata', {})
-    content = data.get('content', '')
+    full_content = compose_content(data.get('metadata', {}), data.get('content', ''))
     
-    # Build markdown with frontmatter
-    lines = ['---']
-    for key, value in metadata.items():
-        lines.append(f'{key}: {value}')
-    lines.append('---')
-    lines.append('')
-    lines.append(content)
-    
-    full_content = '\n'.join(lines)
-    
-    content_path = REPORTS_DIR / 'content.md'
+    content_path = get_workspace() / 'content.md'
     with open(content_path, 'w', encoding='utf-8') as f:
         f.write(full_content)
     
     return jsonify({'success': True})
 
 
+def excel_summary(filepath):
+    """Return the preview, size and columns of a workbook's first sheet."""
+    with span('read_excel', 'io', file=filepath.name) as args:
+        df = read_excel_cached(filepath)
+        args['rows'] = len(df)
+    with span('excel_preview', 'render', rows=len(df)):
+        preview = df.head(5).to_html(classes='table table-sm table-bordered', index=False)
+    return {
+        'preview': preview,
+        'rows': len(df),
+        'columns': [str(column) for column in df.columns]
+    }
+
+
+def uploaded_workbook(filename, digest, blob, duplicate):
+    """Add a stored workbook to the session's workspace and describe it."""
+    UPLOADS.link(blob, get_workspace() / filename)
+    try:
+        summary = UPLOADS.summary(digest, blob, excel_summary)
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+    return jsonify(dict(summary, success=True, filename=filename, sha256=digest,
+                        duplicate=duplicate))
+
+
 @app.route('/api/upload-excel', methods=['POST'])
 def upload_excel():
     """Handle Excel file upload."""
@@ -169,40 +254,133 @@ def upload_excel():
     if file.filename == '':
         return jsonify({'success': False, 'error': 'No file selected'})
     
-    if file and file.filename.endswith(('.xlsx', '.xls')):
-        filename = secure_filename(file.filename)
-        filepath = REPORTS_DIR / filename
-        file.save(filepath)
-        
-        # Read Excel to show preview
-        try:
-            df = pd.read_excel(filepath)
-            preview = df.head(5).to_html(classes='table table-sm table-bordered', index=False)
-            full_table = df.to_html(classes='table table-sm table-bordered', index=False)
-            return jsonify({
-                'success': True,
-                'filename': filename,
-                'preview': preview,
-                'full_table': full_table,
-                'rows': len(df),
-                'columns': list(df.columns)
-            })
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e)})
+    filename = secure_filename(file.filename)
+    try:
+        suffix = UPLOADS.check_suffix(filename)
+    except UploadError as e:
+        return jsonify({'success': False, 'error': str(e)})
     
-    return jsonify({'success': False, 'error': 'Invalid file type. Please upload .xlsx or .xls'})
+    with span('save_upload', 'io', file=filename):
+        digest, blob, duplicate = UPLOADS.save_stream(file.stream, suffix)
+    return uploaded_workbook(filename, digest, blob, duplicate)
+
+
+@app.route('/api/uploads', methods=['POST'])
+def start_upload():
+    """Start a resumable chunked upload of a workbook.
+
+    A client that sends the workbook's sha256 skips the transfer when the
+    same workbook was uploaded before.
+    """
+    data = request.json or {}
+    filename = secure_filename(data.get('filename', ''))
+    try:
+        suffix = UPLOADS.check_suffix(filename)
+        blob = UPLOADS.find(data.get('sha256'), suffix)
+        if blob is not None:
+            return uploaded_workbook(filename, data['sha256'], blob, True)
+        upload_id = UPLOADS.start(filename, data.get('size'))
+    except UploadError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({'success': True, 'upload_id': upload_id, 'offset': 0,
+                    'chunk_size': app.config['MAX_CONTENT_LENGTH'] // 2})
+
+
+@app.route('/api/uploads/<upload_id>', methods=['GET'])
+def upload_status(upload_id):
+    """Return how many bytes of a chunked upload were received, to resume it."""
+    try:
+        info = UPLOADS.status(upload_id)
+    except UploadError as e:
+        return jsonify({'success': False, 'error': str(e)}), 404
+    return jsonify({'success': True, 'offset': info['offset'], 'size': info['size']})
+
+
+@app.route('/api/uploads/<upload_id>', methods=['PUT'])
+def upload_chunk(upload_id):
+    """Append the request body to a chunked upload at the ?offset= given."""
+    try:
+        offset = UPLOADS.append(upload_id, request.args.get('offset', type=int), request.stream)
+    except UploadError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    return jsonify({'success': True, 'offset': offset})
+
+
+@app.route('/api/uploads/<upload_id>/complete', methods=['POST'])
+def complete_upload(upload_id):
+    """Finish a chunked upload and add the workbook to the session's workspace."""
+    try:
+        with span('save_upload', 'io', upload=upload_id):
+            filename, digest, blob, duplicate = UPLOADS.finish(upload_id)
+    except UploadError as e:
+        return jsonify({'success': False, 'error': str(e)}), 409
+    return uploaded_workbook(filename, digest, blob, duplicate)
+
+
+@lru_cache(maxsize=16)
+def sorted_rows(digest, column, descending):
+    """Return the row order of an uploaded workbook's first sheet sorted by column."""
+    df = read_excel_cached(UPLOADS.find(digest))
+    values = df[{str(name): name for name in df.columns}[column]]
+    try:
+        order = values.sort_values(ascending=not descending, kind='stable', na_position='last')
+    except TypeError:
+        # Columns mixing text and numbers are sorted as text
+        order = values.astype(str).sort_values(ascending=not descending, kind='stable')
+    return order.index.to_numpy()
+
+
+@app.route('/api/tables/<digest>/rows', methods=['GET'])
+def table_rows(digest):
+    """Return a page of an uploaded workbook's first sheet as columnar JSON.
+
+    Query parameters are offset, limit (at most TABLE_PAGE_LIMIT), sort (a
+    column name), order ('asc' or 'desc') and columns (repeated once per
+    column, e.g. ?columns=Task&columns=Spent; default all), so names may
+    hold commas. 'values' holds one list per returned column.
+    """
+    blob = UPLOADS.find(digest)
+    if blob is None:
+        return jsonify({'success': False, 'error': 'Table not found'}), 404
+    limit, offset = page_args(100, TABLE_PAGE_LIMIT)
+    sort = request.args.get('sort')
+    descending = request.args.get('order', 'asc') == 'desc'
+
+    with span('table_page', 'io', offset=offset, limit=limit):
+        df = read_excel_cached(blob)
+        names = {str(name): name for name in df.columns}
+        selected = request.args.getlist('columns') or list(names)
+        unknown = [name for name in selected + ([sort] if sort else []) if name not in names]
+        if unknown:
+            return jsonify({'success': False, 'error': f"Unknown column: {unknown[0]}"}), 400
+
+        if sort:
+            page = df.loc[sorted_rows(digest, sort, descending)[offset:offset + limit]]
+        else:
+            page = df.iloc[offset:offset + limit]
+        values = [json.loads(page[names[name]].to_json(orient='values', date_format='iso'))
+                  for name in selected]
+    return jsonify({
+        'success': True,
+        'total': len(df),
+        'offset': offset,
+        'columns': selected,
+        'values': values
+    })
 
 
 @app.route('/api/list-excel-files', methods=['GET'])
 def list_excel_files():
-    """List all Excel files in reports directory."""
-    excel_files = []
+    """List the Excel files uploaded in this session and those in reports directory."""
+    excel_files = {}
     for ext in ['*.xlsx', '*.xls']:
-        excel_files.extend(glob.glob(str(REPORTS_DIR / ext)))
+        for filepath in glob.glob(str(REPORTS_DIR / ext)):
+            excel_files[Path(filepath).name] = Path(filepath)
+    # Workbooks uploaded in this session take precedence
+    excel_files.update(workspace_workbooks(get_workspace()))
     
     files = []
-    for filepath in excel_files:
-        path = Path(filepath)
+    for path in excel_files.values():
         files.append({
             'filename': path.name,
             'size': path.stat().st_size,
@@ -212,135 +390,159 @@ def list_excel_files():
     return jsonify({'files': files})
 
 
+def build_report_job(progress, format_type, content, excel_data, preview, workbooks, output_id):
+    """Build one report in a job thread and return the fields of the finished job.
+
+    The content comes from the request and the workbooks from the user's
+    workspace (falling back to reports/), and the report is written to
+    its own output folder, so concurrent builds share no files.
+    """
+    timestamp = datetime.now().strftime('%Y-%m-%d')
+    filename = f'report_{timestamp}.{format_type}'
+    output_dir = OUTPUTS_DIR / output_id
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if format_type in ('docx', 'pdf'):
+        progress(f'Building {format_type.upper()}', 20)
+        builder = ReportBuilder(content, tables=workbooks, base_dir=REPORTS_DIR)
+        with span(f'build_{format_type}', 'render'):
+            report = builder.build(format_type)
+    elif format_type == 'html':
+        progress('Building HTML', 40)
+        # The last uploaded workbook fills the budget table, rendered from its cached frame
+        tables = dict(workbooks)
+        budget = UPLOADS.find(excel_data.get('sha256'))
+        if budget is not None:
+            tables[BUDGET_TABLE] = budget
+        builder = ReportBuilder(content, tables=tables, base_dir=REPORTS_DIR,
+                                require_tables=False)
+        with span('build_html', 'render'):
+            report = builder.html(table_name=excel_data.get('filename', 'budget.xlsx'))
+            report = report.encode('utf-8')
+    else:
+        report = content.encode('utf-8')
+
+    progress('Saving', 90)
+    write_output(output_dir / filename, report)
+    download_url = f'/api/outputs/{output_id}/{filename}'
+    add_to_history(filename, format_type, preview, download_url)
+    return {'filename': filename, 'download_url': download_url}
+
+
 @app.route('/api/generate-report', methods=['POST'])
 def generate_report():
-    """Generate report in specified format."""
+    """Queue a report build and return its job id."""
     data = request.json
     format_type = data.get('format', 'docx')
+    if format_type not in ('docx', 'pdf', 'html', 'md'):
+        return jsonify({'success': False, 'error': f'Unknown format: {format_type}'})
     
-    # Save content first
-    save_content()
+    # Build from the request's own content, not the shared content.md
+    content = compose_content(data.get('metadata', {}), data.get('content', ''))
+    workspace = get_workspace()
+    workbooks = workspace_workbooks(workspace)
     
-    try:
-        timestamp = datetime.now().strftime('%Y-%m-%d')
-        content_file = str(REPORTS_DIR / 'content.md')
-        
-        if format_type == 'docx':
-            filename = f'report_{timestamp}.docx'
-            filepath = REPORTS_DIR / filename
-            if create_report_word:
-                # Use the main autorpt function
-                from .autorpt import generate_report_from_content
-                generate_report_from_content()
-                # Find the generated file
-                latest_docx = max(glob.glob(str(REPORTS_DIR / 'report_*.docx')), 
-                                key=os.path.getctime, default=None)
-                if latest_docx:
-                    filename = Path(latest_docx).name
-            else:
-                return jsonify({'success': False, 'error': 'Word generation not available'})
-                
-        elif format_type == 'pdf':
-            filename = f'report_{timestamp}.pdf'
-            filepath = REPORTS_DIR / filename
-            if create_report_pdf:
-                # Use typst or pdf generation
-                from .autorpt import generate_pdf_with_typst
-                generate_pdf_with_typst()
-                # Find the generated file
-                latest_pdf = max(glob.glob(str(REPORTS_DIR / 'report_*.pdf')),
-                               key=os.path.getctime, default=None)
-                if latest_pdf:
-                    filename = Path(latest_pdf).name
-            else:
-                return jsonify({'success': False, 'error': 'PDF generation not available. Install Typst.'})
-                
-        elif format_type == 'html':
-            filename = f'report_{timestamp}.html'
-            filepath = REPORTS_DIR / filename
-            # Simple HTML export
-            import markdown
-            with open(content_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            # Remove frontmatter for HTML
-            if content.startswith('---'):
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    content = parts[2]
-            # Insert uploaded Excel table into content if available
-            excel_data = data.get('excel', {})
-            if excel_data.get('full_table'):
-                content = content.replace(
-                    '[insert budget from budget.xlsx here]',
-                    f'<h3>Budget Table: {excel_data.get("filename", "budget.xlsx")}</h3>\n{excel_data["full_table"]}'
-                )
-            html_content = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{data.get('metadata', {}).get('title', 'Report')}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; max-width: 800px; margin: 40px auto; padding: 20px; }}
-        h1 {{ color: #333; border-bottom: 2px solid #0066cc; padding-bottom: 10px; }}
-        h2 {{ color: #0066cc; margin-top: 30px; }}
-        table {{ border-collapse: collapse; width: 100%; margin: 20px 0; }}
-        th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-        th {{ background-color: #0066cc; color: white; }}
-    </style>
-</head>
-<body>
-    {markdown.markdown(content, extensions=['tables', 'fenced_code'])}
-</body>
-</html>'''
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-                
-        elif format_type == 'md':
-            filename = f'report_{timestamp}.md'
-            filepath = REPORTS_DIR / filename
-            # Just copy the content.md file
-            import shutil
-            shutil.copy(content_file, filepath)
-        
-        add_to_history(filename, format_type, data.get('content', ''))
-        
-        return jsonify({
-            'success': True,
-            'filename': filename,
-            'download_url': f'/api/download/{filename}'
-        })
-    except Exception as e:
-        import traceback
-        traceback.print_exc()
-        return jsonify({'success': False, 'error': str(e)})
-
+    job = JOBS.submit(build_report_job, format_type, content, data.get('excel') or {},
+                      data.get('content', ''), workbooks, uuid.uuid4().hex, format=format_type,
+                      workspace=workspace.name)
+    return jsonify({
+        'success': True,
+        'job_id': job['id'],
+        'status_url': f"/api/jobs/{job['id']}",
+        'events_url': f"/api/jobs/{job['id']}/events",
+    }), 202
+
+
+def session_job(job_id):
+    """Return a job submitted by the current browser session, or None."""
+    job = JOBS.get(job_id)
+    if job is None or job.get('workspace') != session.get('workspace'):
+        return None
+    return job
+
+
+@app.route('/api/jobs/<job_id>')
+def get_job(job_id):
+    """Return the status of a report job."""
+    job = session_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job})
+
+
+@app.route('/api/jobs/<job_id>/events')
+def job_events(job_id):
+    """Stream a report job's status as Server-Sent Events until it finishes."""
+    job = session_job(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+
+    def events(job):
+        while True:
+            yield f"data: {json.dumps(job)}\n\n"
+            if job['status'] in ('done', 'failed'):
+                return
+            version = job['version']
+            job = JOBS.wait(job_id, version, timeout=15)
+            if job is None:
+                # The record was removed while the client was following it
+                gone = {'id': job_id, 'status': 'failed', 'error': 'Job no longer exists'}
+                yield f"data: {json.dumps(gone)}\n\n"
+                return
+            if job['version'] == version:
+                # Keep idle connections open through proxies
+                yield ': keep-alive\n\n'
+
+    return Response(events(job), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache'})
+
+
+@app.route('/api/jobs')
+def list_jobs():
+    """List the most recent report jobs of the current browser session."""
+    workspace = session.get('workspace')
+    if not workspace:
+        return jsonify({'jobs': []})
+    return jsonify({'jobs': JOBS.recent(request.args.get('limit', 20, type=int),
+                                        workspace=workspace)})
 
 
 @app.route('/api/gallery')
 def get_gallery():
-    """List all saved report directories."""
-    reports = []
-    if REPORTS_DIR.exists():
-        for item in sorted(REPORTS_DIR.iterdir(), key=lambda x: x.stat().st_mtime, reverse=True):
-            if item.is_dir() and not item.name.startswith('.'):
-                content_file = item / 'content.md'
-                meta = {}
-                if content_file.exists():
-                    meta, _ = read_markdown_with_frontmatter(str(content_file))
-                reports.append({
-                    'name': item.name,
-                    'title': meta.get('title', item.name),
-                    'project': meta.get('project', ''),
-                    'date': meta.get('date', ''),
-                    'modified': datetime.fromtimestamp(item.stat().st_mtime).isoformat(),
-                })
-    return jsonify({'reports': reports})
+    """List a page of saved report directories.
+
+    Query parameters are sort (one of GALLERY_SORT_KEYS, default
+    'modified'), order ('asc' or 'desc', default 'desc'), limit (default
+    100) and offset. The response carries an ETag, so unchanged listings
+    are answered with 304 Not Modified.
+    """
+    sort = request.args.get('sort', 'modified')
+    order = request.args.get('order', 'desc')
+    if sort not in GALLERY_SORT_KEYS:
+        return jsonify({'success': False, 'error': f'Unknown sort: {sort}'}), 400
+    limit, offset = page_args(100, 1000)
+
+    signature = GALLERY.refresh()
+    etag = f'{signature}-{sort}-{order}-{offset}-{limit}'
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+
+    reports = GALLERY.listing(sort, descending=order != 'asc')
+    response = jsonify({
+        'reports': reports[offset:offset + limit],
+        'total': len(reports),
+        'offset': offset,
+        'limit': limit
+    })
+    response.set_etag(etag)
+    return response
 
 
 @app.route('/api/save-as', methods=['POST'])
 def save_as():
     """Save current report to a new directory."""
-    import shutil
     data = request.json
     name = secure_filename(data.get('name', '').strip())
     if not name:
@@ -352,14 +554,17 @@ def save_as():
 
     dest_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy content.md
-    src_content = REPORTS_DIR / 'content.md'
+    # Copy the session's content.md
+    workspace = get_workspace()
+    src_content = session_content(workspace)
     if src_content.exists():
         shutil.copy(src_content, dest_dir / 'content.md')
 
-    # Copy any .xlsx files
+    # Copy any .xlsx files, preferring those uploaded in this session
     for xlsx in REPORTS_DIR.glob('*.xlsx'):
         shutil.copy(xlsx, dest_dir / xlsx.name)
+    for workbook in workspace_workbooks(workspace).values():
+        shutil.copy(workbook, dest_dir / workbook.name)
 
     return jsonify({'success': True, 'name': name})
 
@@ -387,7 +592,7 @@ def load_saved(name):
 @app.route('/api/download/<filename>')
 def download_file(filename):
     """Download or view a generated report."""
-    filepath = REPORTS_DIR / secure_filename(filename)
+    filepath = (REPORTS_DIR / secure_filename(filename)).resolve()
     if filepath.exists():
         # Open PDF and HTML in browser; force download for Word and Markdown
         if filename.endswith(('.pdf', '.html')):
@@ -396,40 +601,46 @@ def download_file(filename):
     return jsonify({'error': 'File not found'}), 404
 
 
+@app.route('/api/outputs/<output_id>/<filename>')
+def download_output(output_id, filename):
+    """Download or view a report built by a job."""
+    filepath = (OUTPUTS_DIR / secure_filename(output_id) / secure_filename(filename)).resolve()
+    if filepath.exists():
+        # Open PDF and HTML in browser; force download for Word and Markdown
+        return send_file(filepath, as_attachment=not filename.endswith(('.pdf', '.html')))
+    return jsonify({'error': 'File not found'}), 404
+
+
 @app.route('/api/snippets', methods=['GET'])
 def get_snippets_api():
-    """Get all snippets."""
-    return jsonify({'snippets': get_snippets()})
+    """Get a page of snippets (?limit=, default 100, and ?offset=)."""
+    limit, offset = page_args(100, 500)
+    snippets, total = STORE.snippets(limit, offset)
+    return jsonify({'snippets': snippets, 'total': total, 'offset': offset, 'limit': limit})
 
 
 @app.route('/api/snippets', methods=['POST'])
 def save_snippet():
     """Save a new snippet."""
     data = request.json
-    snippets = get_snippets()
-    snippets.append({
-        'id': len(snippets) + 1,
-        'title': data.get('title', 'Untitled'),
-        'content': data.get('content', ''),
-        'created': datetime.now().isoformat()
-    })
-    save_snippets(snippets)
-    return jsonify({'success': True, 'snippets': snippets})
+    snippet = STORE.add_snippet(data.get('title', 'Untitled'), data.get('content', ''))
+    return jsonify({'success': True, 'snippet': snippet})
 
 
 @app.route('/api/snippets/<int:snippet_id>', methods=['DELETE'])
 def delete_snippet(snippet_id):
     """Delete a snippet."""
-    snippets = get_snippets()
-    snippets = [s for s in snippets if s['id'] != snippet_id]
-    save_snippets(snippets)
-    return jsonify({'success': True, 'snippets': snippets})
+    if not STORE.delete_snippet(snippet_id):
+        return jsonify({'success': False, 'error': 'Snippet not found'}), 404
+    return jsonify({'success': True})
 
 
 @app.route('/api/history', methods=['GET'])
 def get_history_api():
-    """Get report history."""
-    return jsonify({'history': get_history()})
+    """Get a page of report history, newest first (?limit=, default 50, ?offset= and ?format=)."""
+    limit, offset = page_args(50, 500)
+    history, total = STORE.history(limit, offset, request.args.get('format'))
+    return jsonify({'history': history, 'total': total, 'offset': offset, 'limit': limit})
 
 
 @app.route('/api/templates', methods=['GET'])
@@ -478,6 +689,8 @@ def kill_port(port):
 def start_server(host='127.0.0.1', port=8080, debug=False, open_browser=True):
     """Start the Flask web server."""
     kill_port(port)
+    REPORTS_DIR.mkdir(exist_ok=True)
+    prune_workspaces()
 
     if open_browser:
         import threading
@@ -0,0 +1,145 @@
+"""Synthetic report inputs for the autorpt benchmark suite.
+
+Run the benchmarks with pytest-benchmark and keep the results so that
+later versions can be compared against them::
+
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks --benchmark-compare --benchmark-compare-fail=mean:25%
+
+The small and medium scales run by default. Set AUTORPT_BENCH_SCALES to
+choose others, e.g. ``AUTORPT_BENCH_SCALES=small,medium,large``.
+"""
+
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+
+REPO_REPORTS = Path(__file__).resolve().parents[1] / 'reports'
+
+# Budget rows and content.md sections generated at each scale
+SCALES = {
+    'small': {'rows': 10, 'sections': 1},
+    'medium': {'rows': 1_000, 'sections': 100},
+    'large': {'rows': 100_000, 'sections': 1_000},
+}
+
+DEFAULT_SCALES = ('small', 'medium')
+
+TYPST_AVAILABLE = shutil.which('typst') is not None
+
+
+def enabled_scales():
+    """Return the scale names selected with AUTORPT_BENCH_SCALES."""
+    value = os.environ.get('AUTORPT_BENCH_SCALES')
+    if not value:
+        return DEFAULT_SCALES
+    return tuple(name.strip() for name in value.split(',') if name.strip() in SCALES)
+
+
+def scale_params(max_scale=None):
+    """Parametrize a benchmark over the scales, skipping the disabled ones.
+
+    Args:
+        max_scale (str): Largest scale the stage is run at, for stages that
+            would take hours at the large scale
+    """
+    names = list(SCALES)
+    if max_scale:
+        names = names[:names.index(max_scale) + 1]
+    enabled = enabled_scales()
+    return [
+        pytest.param(name, marks=pytest.mark.skipif(
+            name not in enabled, reason=f"{name} scale not in AUTORPT_BENCH_SCALES"))
+        for name in names
+    ]
+
+
+def make_budget_rows(rows):
+    """Build a budget table shaped like reports/budget.xlsx with the given row count.
+
+    Categories hold up to nine numbered sub-items followed by a sub-total,
+    and the table ends with the total project, indirect and TOTAL rows.
+    """
+    records = []
+    category = 0
+    body_rows = max(rows - 3, 1)
+    while len(records) < body_rows:
+        category += 1
+        records.append((f"{category}. Category {category}", None, None, None))
+        for item in range(1, 10):
+            if len(records) >= body_rows - 1:
+                break
+            budgeted = 1000.0 * item + category
+            spent = round(budgeted * 0.37, 2)
+            records.append((f"{category}.{item} Item {item}", budgeted, spent, budgeted - spent))
+        records.append(('sub-total', 50000.0, 18500.0, 31500.0))
+    records = records[:body_rows]
+    records.extend([
+        ('total project', 345000.0, 127193.0, 112807.0),
+        ('indirect (10%)', 34500.0, 12719.3, 11280.7),
+        ('TOTAL', 379500.0, 139912.3, 124087.7),
+    ])
+    return records[:rows]
+
+
+def make_content(sections):
+    """Build content.md text with frontmatter and the given number of sections.
+
+    The first section holds the budget placeholder; every section mixes
+    paragraphs, a sub-heading and a bullet list.
+    """
+    lines = ['---', 'title: Benchmark Report', 'author: autorpt', '---', '']
+    for number in range(1, sections + 1):
+        lines.append(f"# Section {number}")
+        lines.append('')
+        lines.append(f"Progress for section {number} is **on track** and within budget.")
+        if number == 1:
+            lines.append('')
+            lines.append('[insert budget from budget.xlsx here]')
+        lines.append('')
+        lines.append(f"## Details {number}")
+        lines.append('')
+        for item in range(1, 4):
+            lines.append(f"- Milestone {number}.{item} completed")
+        lines.append('')
+        lines.append('Field work continued through the quarter with *minor* delays.')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def write_budget(path, rows):
+    """Write a budget workbook with openpyxl's streaming writer."""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Budget')
+    sheet.append(['Task', 'Budgeted', 'Spent', 'Remaining'])
+    for record in make_budget_rows(rows):
+        sheet.append(list(record))
+    workbook.save(path)
+
+
+@pytest.fixture(scope='session')
+def report_dirs(tmp_path_factory):
+    """Return a function building (once per session) a report folder for a scale."""
+    built = {}
+
+    def get(scale):
+        if scale not in built:
+            reports_dir = tmp_path_factory.mktemp(f"reports_{scale}")
+            (reports_dir / 'content.md').write_text(
+                make_content(SCALES[scale]['sections']), encoding='utf-8')
+            write_budget(reports_dir / 'budget.xlsx', SCALES[scale]['rows'])
+            shutil.copy(REPO_REPORTS / 'report.typ', reports_dir / 'report.typ')
+            built[scale] = reports_dir
+        return built[scale]
+
+    return get
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(tmp_path, monkeypatch):
+    """Keep the build and frame caches out of the user's cache folder."""
+    monkeypatch.setenv('AUTORPT_CACHE_DIR', str(tmp_path / 'cache'))
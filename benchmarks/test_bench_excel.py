@@ -0,0 +1,59 @@
+"""Benchmarks for reading budget workbooks.
+
+Set AUTORPT_BENCH_WORKBOOK to a real workbook (e.g. one of the 40 MB
+budget files) to benchmark it alongside the synthetic ones.
+"""
+
+import os
+from pathlib import Path
+
+import pytest
+
+from autorpt.excel import CALAMINE_AVAILABLE, read_excel_cached
+
+from conftest import scale_params
+
+ENGINES = [
+    'openpyxl',
+    pytest.param('calamine', marks=pytest.mark.skipif(
+        not CALAMINE_AVAILABLE, reason="python-calamine not installed")),
+]
+
+WORKBOOK = os.environ.get('AUTORPT_BENCH_WORKBOOK')
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('scale', scale_params())
+def test_read_budget_uncached(benchmark, report_dirs, scale, engine):
+    """Parse budget.xlsx on every round."""
+    budget_file = report_dirs(scale) / 'budget.xlsx'
+    df = benchmark(read_excel_cached, budget_file, use_cache=False, engine=engine)
+    assert len(df) > 0
+
+
+@pytest.mark.parametrize('engine', ENGINES)
+@pytest.mark.parametrize('scale', scale_params())
+def test_read_budget_pruned(benchmark, report_dirs, scale, engine):
+    """Parse only the first two columns of the first 1,000 rows."""
+    budget_file = report_dirs(scale) / 'budget.xlsx'
+    df = benchmark(read_excel_cached, budget_file, use_cache=False, engine=engine,
+                   usecols='A:B', nrows=1000)
+    assert list(df.columns) == ['Task', 'Budgeted']
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_read_budget_cached(benchmark, report_dirs, scale):
+    """Read budget.xlsx through the in-memory and on-disk frame caches."""
+    budget_file = report_dirs(scale) / 'budget.xlsx'
+    read_excel_cached(budget_file)
+    df = benchmark(read_excel_cached, budget_file)
+    assert len(df) > 0
+
+
+@pytest.mark.skipif(not WORKBOOK, reason="AUTORPT_BENCH_WORKBOOK not set")
+@pytest.mark.parametrize('engine', ENGINES)
+def test_read_workbook(benchmark, engine):
+    """Parse the workbook named by AUTORPT_BENCH_WORKBOOK."""
+    df = benchmark.pedantic(read_excel_cached, args=(Path(WORKBOOK),),
+                            kwargs={'use_cache': False, 'engine': engine}, rounds=3)
+    assert len(df.columns) > 0
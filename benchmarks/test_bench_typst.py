@@ -0,0 +1,88 @@
+"""Benchmarks for the Typst report stages."""
+
+import pytest
+
+from autorpt import autorpt
+from autorpt.excel import read_excel_cached
+from autorpt.sections import section_cache
+from autorpt.typst_build import TYPST_PY_AVAILABLE
+
+from conftest import TYPST_AVAILABLE, scale_params
+
+
+def _inputs(reports_dir):
+    content_text = (reports_dir / 'content.md').read_text(encoding='utf-8')
+    budget_df = read_excel_cached(reports_dir / 'budget.xlsx', use_cache=False)
+    return content_text, budget_df
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_df_to_typst_table(benchmark, report_dirs, scale):
+    """Convert the budget table to Typst markup."""
+    _, budget_df = _inputs(report_dirs(scale))
+    table = benchmark(autorpt.df_to_typst_table, budget_df)
+    assert table.startswith('#table(')
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_df_to_typst_data(benchmark, report_dirs, scale):
+    """Convert the budget table to a JSON data file for Typst's json() loader."""
+    _, budget_df = _inputs(report_dirs(scale))
+    markup, _, payload = benchmark(autorpt.df_to_typst_data, budget_df)
+    assert markup.startswith('#autorpt-data-table(') and payload
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_markdown_to_typst_cold(benchmark, report_dirs, scale):
+    """Convert content.md to Typst with an empty section cache."""
+    content_text, budget_df = _inputs(report_dirs(scale))
+
+    def setup():
+        section_cache.clear()
+        return (content_text, budget_df), {}
+
+    benchmark.pedantic(autorpt.markdown_to_typst, setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_markdown_to_typst_warm(benchmark, report_dirs, scale):
+    """Re-convert unchanged content.md, reusing every cached section."""
+    content_text, budget_df = _inputs(report_dirs(scale))
+    budget_table = autorpt.df_to_typst_table(budget_df)
+    autorpt.markdown_to_typst(content_text, budget_table=budget_table)
+    benchmark(autorpt.markdown_to_typst, content_text, budget_table=budget_table)
+
+
+@pytest.mark.parametrize('backend', [
+    pytest.param('cli', marks=pytest.mark.skipif(not TYPST_AVAILABLE,
+                                                 reason="typst binary not found")),
+    pytest.param('python', marks=pytest.mark.skipif(not TYPST_PY_AVAILABLE,
+                                                    reason="typst package not installed")),
+])
+@pytest.mark.parametrize('scale', scale_params())
+def test_compile_typst_pdf(benchmark, report_dirs, scale, backend, monkeypatch, capsys):
+    """Compile the generated report with each Typst backend."""
+    monkeypatch.setenv('AUTORPT_TYPST_BACKEND', backend)
+    reports_dir = report_dirs(scale)
+    content_text, budget_df = _inputs(reports_dir)
+    typst_text = autorpt.markdown_to_typst(content_text, budget_df)
+
+    ok = benchmark.pedantic(autorpt.compile_typst_pdf,
+                            args=(reports_dir, reports_dir / 'bench.pdf', typst_text), rounds=3)
+    assert ok
+
+
+@pytest.mark.skipif(not TYPST_AVAILABLE, reason="typst binary not found")
+@pytest.mark.parametrize('scale', scale_params())
+def test_compile_typst_pdf_data_tables(benchmark, report_dirs, scale, capsys):
+    """Compile the report with the budget loaded from a JSON data file."""
+    reports_dir = report_dirs(scale)
+    content_text, budget_df = _inputs(reports_dir)
+    data_files = {}
+    typst_text = autorpt.markdown_to_typst(content_text, budget_df, data_files=data_files,
+                                           table_mode='data')
+
+    ok = benchmark.pedantic(autorpt.compile_typst_pdf,
+                            args=(reports_dir, reports_dir / 'bench.pdf', typst_text, data_files),
+                            rounds=3)
+    assert ok
@@ -0,0 +1,86 @@
+"""Benchmarks for the web interface endpoints."""
+
+import io
+import shutil
+
+import pytest
+
+from autorpt import webapp
+from autorpt.gallery import GalleryIndex
+from autorpt.jobs import JobQueue
+from autorpt.store import AppStore
+from autorpt.uploads import UploadStore
+
+from conftest import scale_params
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Flask test client working in a temporary reports folder."""
+    monkeypatch.setattr(webapp, 'REPORTS_DIR', tmp_path)
+    monkeypatch.setattr(webapp, 'STORE', AppStore(tmp_path / 'autorpt.db'))
+    monkeypatch.setattr(webapp, 'GALLERY', GalleryIndex(tmp_path))
+    monkeypatch.setattr(webapp, 'WORKSPACES_DIR', tmp_path / '.workspaces')
+    monkeypatch.setattr(webapp, 'OUTPUTS_DIR', tmp_path / '.outputs')
+    monkeypatch.setattr(webapp, 'UPLOADS', UploadStore(tmp_path / '.uploads'))
+    queue = JobQueue(tmp_path / '.jobs')
+    monkeypatch.setattr(webapp, 'JOBS', queue)
+    webapp.app.config['TESTING'] = True
+    yield webapp.app.test_client()
+    queue.shutdown()
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_upload_excel(benchmark, client, report_dirs, scale):
+    """Upload budget.xlsx and build its preview tables."""
+    workbook = (report_dirs(scale) / 'budget.xlsx').read_bytes()
+
+    def upload():
+        return client.post('/api/upload-excel', content_type='multipart/form-data',
+                           data={'file': (io.BytesIO(workbook), 'budget.xlsx')})
+
+    response = benchmark(upload)
+    assert response.get_json()['success']
+
+
+@pytest.mark.parametrize('scale', scale_params())
+@pytest.mark.parametrize('format_type', ['html', 'md'])
+def test_generate_report(benchmark, client, report_dirs, scale, format_type):
+    """Save the editor content and export it."""
+    reports_dir = report_dirs(scale)
+    content = (reports_dir / 'content.md').read_text(encoding='utf-8')
+    workbook = (reports_dir / 'budget.xlsx').read_bytes()
+    upload = client.post('/api/upload-excel', content_type='multipart/form-data',
+                         data={'file': (io.BytesIO(workbook), 'budget.xlsx')}).get_json()
+    payload = {
+        'format': format_type,
+        'metadata': {'title': 'Benchmark Report'},
+        'content': content.split('---', 2)[2],
+        'excel': {'filename': upload['filename'], 'sha256': upload['sha256']},
+    }
+
+    response = benchmark(client.post, '/api/generate-report', json=payload)
+    assert response.get_json()['success']
+
+
+def test_load_content(benchmark, client, report_dirs):
+    """Load the saved editor content."""
+    shutil.copy(report_dirs('small') / 'content.md', webapp.REPORTS_DIR / 'content.md')
+    response = benchmark(client.get, '/api/load-content')
+    assert response.get_json()['success']
+
+
+@pytest.mark.parametrize('revalidate', [False, True])
+def test_gallery(benchmark, client, report_dirs, revalidate):
+    """List 500 saved reports, optionally revalidating with the previous ETag."""
+    content = (report_dirs('small') / 'content.md').read_text(encoding='utf-8')
+    for number in range(500):
+        folder = webapp.REPORTS_DIR / f'report_{number:03d}'
+        folder.mkdir()
+        (folder / 'content.md').write_text(content, encoding='utf-8')
+    headers = {}
+    if revalidate:
+        headers['If-None-Match'] = client.get('/api/gallery').headers['ETag']
+
+    response = benchmark(client.get, '/api/gallery', headers=headers)
+    assert response.status_code == (304 if revalidate else 200)
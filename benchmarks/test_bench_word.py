@@ -0,0 +1,73 @@
+"""Benchmarks for the Word report stages."""
+
+import pytest
+from docx import Document
+
+from autorpt import autorpt
+from autorpt.excel import read_excel_cached
+from autorpt.gen_auto import AutoReportGenerator
+from autorpt.sections import section_cache, split_frontmatter
+
+from conftest import scale_params
+
+
+def _inputs(reports_dir):
+    content_text = (reports_dir / 'content.md').read_text(encoding='utf-8')
+    budget_df = read_excel_cached(reports_dir / 'budget.xlsx', use_cache=False)
+    return content_text, budget_df
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_add_table_to_document(benchmark, report_dirs, scale):
+    """Insert the budget table into a fresh Word document."""
+    _, budget_df = _inputs(report_dirs(scale))
+
+    table = benchmark.pedantic(
+        autorpt.add_table_to_document,
+        setup=lambda: ((Document(), budget_df), {}),
+        rounds=5,
+    )
+    assert len(table.rows) == len(budget_df) + 1
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_add_markdown_to_document(benchmark, report_dirs, scale):
+    """Convert content.md (without the budget table) into Word paragraphs."""
+    content_text, _ = _inputs(report_dirs(scale))
+    _, body = split_frontmatter(content_text)
+
+    def setup():
+        section_cache.clear()
+        return (Document(), body), {}
+
+    benchmark.pedantic(autorpt.add_markdown_to_document, setup=setup, rounds=5)
+
+
+@pytest.mark.parametrize('scale', scale_params())
+def test_build_word_document(benchmark, report_dirs, scale):
+    """Build the complete Word document from parsed inputs."""
+    content_text, budget_df = _inputs(report_dirs(scale))
+
+    def setup():
+        section_cache.clear()
+        return (content_text, budget_df), {}
+
+    doc = benchmark.pedantic(autorpt.build_word_document, setup=setup, rounds=5)
+    assert len(doc.tables) == 1
+
+
+# Cell-by-cell python-docx tables need hours for 100,000 rows
+@pytest.mark.parametrize('scale', scale_params(max_scale='medium'))
+def test_gen_auto_excel_table(benchmark, report_dirs, scale, capsys):
+    """Add the budget workbook with AutoReportGenerator."""
+    budget_file = report_dirs(scale) / 'budget.xlsx'
+
+    def run(generator):
+        return generator.add_excel_table_to_document(budget_file)
+
+    ok = benchmark.pedantic(
+        run,
+        setup=lambda: ((AutoReportGenerator(Document()),), {}),
+        rounds=3,
+    )
+    assert ok
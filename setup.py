@@ -25,6 +25,15 @@ setup_requirements = []
 
 test_requirements = []
 
+extras_requirements = {
+    # Faster parsed-budget cache (Feather instead of pickle)
+    'fast': ['pyarrow', 'python-calamine'],
+    # In-process PDF compilation without the typst command
+    'typst': ['typst>=0.13'],
+    # Word-to-PDF conversion in autorpt.pdf (needs Microsoft Word)
+    'docx2pdf': ['docx2pdf>=0.1.8'],
+}
+
 setup(
     author="Vance Russell",
     author_email='vance@3point.xyz',
@@ -41,6 +50,7 @@ setup(
     ],
     description="Automated budget report generator for grant management with Excel input and Word output",
     install_requires=install_requires,
+    extras_require=extras_requirements,
     dependency_links=dependency_links,
     license="MIT license",
     long_description=readme,
@@ -3,9 +3,43 @@
 """Tests for `autorpt` package."""
 
 
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+from docx import Document
 
 from autorpt import autorpt
+from autorpt.batch import discover_projects
+from autorpt.builder import ReportBuildError, ReportBuilder
+from autorpt.cache import BuildCache
+from autorpt.common import merge_traces, span, start_tracing, stop_tracing
+from autorpt.excel import FEATHER_AVAILABLE, clear_memory_cache, read_excel_cached
+from autorpt.pipeline import generate_formats, parse_formats
+from autorpt.placeholders import compile_plan
+from autorpt.sections import BUDGET_TABLE, TableRef, parse_sections, section_cache, split_frontmatter
+from autorpt.timings import stage, start_timings, stop_timings
+from autorpt.typst_build import TYPST_PY_AVAILABLE
+from autorpt.watch import ReportWatcher
+
+
+def setUpModule():
+    """Keep the build and frame caches out of the user's cache folder."""
+    cache_dir = tempfile.TemporaryDirectory()
+    patcher = mock.patch.dict(os.environ, {'AUTORPT_CACHE_DIR': cache_dir.name})
+    patcher.start()
+    unittest.addModuleCleanup(cache_dir.cleanup)
+    unittest.addModuleCleanup(patcher.stop)
 
 
 class TestAutorpt(unittest.TestCase):
@@ -19,3 +53,1027 @@ class TestAutorpt(unittest.TestCase):
 
     def test_000_something(self):
         """Test something."""
+
+
+class TestBatch(unittest.TestCase):
+    """Tests for multi-project batch discovery."""
+
+    def test_discover_projects(self):
+        """Only subfolders with a content.md are projects."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            for name in ('b_project', 'a_project', 'empty', '.hidden'):
+                (root / name).mkdir()
+            for name in ('b_project', 'a_project', '.hidden'):
+                (root / name / 'content.md').write_text('# Summary\n')
+            (root / 'content.md').write_text('# Root\n')
+
+            projects = discover_projects(root)
+
+        self.assertEqual([p.name for p in projects], ['a_project', 'b_project'])
+
+
+class TestWordTable(unittest.TestCase):
+    """Tests for the Word budget table."""
+
+    def setUp(self):
+        """Build a small budget frame."""
+        self.df = pd.DataFrame({
+            'Task': ['1. Planning', '2. Work', 'TOTAL'],
+            'Budgeted': [20000.0, None, 1234.5],
+            'Spent': [15226.0, None, 99.0],
+        })
+
+    def test_table_values_and_bold_rows(self):
+        """Numbers are formatted and the header and TOTAL rows are bold."""
+        doc = Document()
+        table = autorpt.add_table_to_document(doc, self.df)
+
+        self.assertEqual(len(doc.tables), 1)
+        rows = [[cell.text for cell in row.cells] for row in table.rows]
+        self.assertEqual(rows, [
+            ['Task', 'Budgeted', 'Spent'],
+            ['1. Planning', '20,000', '15,226'],
+            ['2. Work', '', ''],
+            ['TOTAL', '1,234.50', '99'],
+        ])
+
+        def is_bold(row):
+            return all(run.bold for cell in row.cells
+                       for paragraph in cell.paragraphs for run in paragraph.runs)
+
+        self.assertTrue(is_bold(table.rows[0]))
+        self.assertFalse(is_bold(table.rows[1]))
+        self.assertTrue(is_bold(table.rows[3]))
+
+    def test_only_exact_total_row_is_bold(self):
+        """Rows merely containing 'total' are not bold in Word."""
+        df = pd.DataFrame({
+            'Task': ['1. Planning', 'Grand Total', 'total ', 'Total Project', 'total'],
+            'Budgeted': [1.0, 2.0, 3.0, 4.0, 5.0],
+        })
+        table = autorpt.add_table_to_document(Document(), df)
+
+        bold = [all(run.bold for cell in row.cells
+                    for paragraph in cell.paragraphs for run in paragraph.runs)
+                for row in table.rows[1:]]
+        self.assertEqual(bold, [False, False, False, False, True])
+
+
+class TestBudgetRows(unittest.TestCase):
+    """Tests for budget row classification."""
+
+    def test_classify_budget_rows(self):
+        """Rows are classified from the task names in the first column."""
+        df = pd.DataFrame({
+            'Task': ['1. Planning', '2. Work', '2.1 Staffing', 'Travel', 'sub-total',
+                     None, 'total project', 'indirect (10%)', 'TOTAL'],
+            'Budgeted': [1, None, 2, 3, 5, None, 6, 0.6, 6.6],
+        })
+
+        rows = autorpt.classify_budget_rows(df)
+
+        self.assertEqual(rows['kind'].tolist(), [
+            'category', 'category', 'sub_item', 'item', 'subtotal',
+            'item', 'total_project', 'indirect', 'total',
+        ])
+        self.assertEqual(rows['task'].iloc[5], '')
+        self.assertTrue(rows['numbered'].iloc[1])
+
+    def test_typst_table_row_styles(self):
+        """Totals are bold and category headers have blank values."""
+        df = pd.DataFrame({
+            'Task': ['2. Work', '2.1 Staffing', 'total project', 'indirect', 'TOTAL'],
+            'Budgeted': [None, 1000.0, 1000.0, 100.0, 1100.0],
+        })
+
+        table = autorpt.df_to_typst_table(df)
+
+        self.assertIn('[2. Work], [#align(right)[]]', table)
+        self.assertIn('[    2.1 Staffing], [#align(right)[1,000]]', table)
+        self.assertIn('table.hline(), [Total Project], [#align(right)[*1,000*]]', table)
+        self.assertIn('[Indirect], [#align(right)[*100*]], table.hline()', table)
+        self.assertIn('[*TOTAL*], [#align(right)[*1,100*]]', table)
+
+    def test_total_project_indirect_row(self):
+        """A row naming both total project and indirect gets both rules."""
+        df = pd.DataFrame({'Task': ['1. Work', 'Total Project Indirect', 'TOTAL'],
+                           'Budgeted': [10.0, 1.0, 11.0]})
+
+        rows = autorpt.classify_budget_rows(df)
+        self.assertEqual(rows['hline_before'].tolist(), [False, True, False])
+        self.assertEqual(rows['hline_after'].tolist(), [False, True, False])
+
+        table = autorpt.df_to_typst_table(df)
+        self.assertIn('table.hline(), [Total Project Indirect], [#align(right)[*1*]], '
+                      'table.hline()', table)
+
+        data_files = {}
+        autorpt.markdown_to_typst('[insert budget from budget.xlsx here]\n', budget_df=df,
+                                  data_files=data_files, table_mode='data')
+        row = json.loads(next(iter(data_files.values())))['rows'][1]
+        self.assertEqual((row['hline_before'], row['hline_after']), (True, True))
+
+    def test_typst_data_table(self):
+        """Large tables are written to a JSON data file loaded by the markup."""
+        df = pd.DataFrame({'Task': ['2. Work', '2.1 Staffing', 'TOTAL'],
+                           'Budgeted': [None, 1000.0, 1000.0]})
+        content = '# Budget\n\n[insert budget from budget.xlsx here]\n'
+
+        data_files = {}
+        typst = autorpt.markdown_to_typst(content, budget_df=df, data_files=data_files,
+                                          table_mode='data')
+
+        (file_name, payload), = data_files.items()
+        self.assertIn(f'#autorpt-data-table(json("{file_name}"))', typst)
+        self.assertTrue(typst.startswith('#let autorpt-data-table(data)'))
+        self.assertEqual(json.loads(payload)['rows'][1],
+                         {'kind': 'sub_item', 'hline_before': False, 'hline_after': False,
+                          'cells': ['2.1 Staffing', '1,000']})
+
+        # Small tables stay inline in auto mode
+        data_files = {}
+        typst = autorpt.markdown_to_typst(content, budget_df=df, data_files=data_files)
+        self.assertEqual(data_files, {})
+        self.assertIn('[*TOTAL*]', typst)
+
+
+class TestWatch(unittest.TestCase):
+    """Tests for incremental rebuilds in watch mode."""
+
+    def test_markdown_change_keeps_budget(self):
+        """Editing content.md does not re-read the budget workbook."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'content.md').write_text('# Budget\n\n[insert budget from budget.xlsx here]\n')
+            pd.DataFrame({'Task': ['TOTAL'], 'Budgeted': [10.0]}).to_excel(
+                root / 'budget.xlsx', index=False)
+
+            watcher = ReportWatcher(root, formats=('docx',))
+            self.assertTrue(watcher.rebuild({'content.md', 'budget.xlsx'}))
+            budget_df = watcher.tables[BUDGET_TABLE]
+
+            (root / 'content.md').write_text(
+                '# Budget\n\nUpdated.\n\n[insert budget from budget.xlsx here]\n')
+            self.assertTrue(watcher.rebuild({'content.md'}))
+
+            self.assertIs(watcher.tables[BUDGET_TABLE], budget_df)
+            self.assertIn('Updated.', watcher.content_text)
+            self.assertTrue(list(root.glob('report_*.docx')))
+
+
+class TestBuildCache(unittest.TestCase):
+    """Tests for the content-hash build cache."""
+
+    def test_restore_and_evict(self):
+        """Artifacts are restored for unchanged inputs and evicted LRU first."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            content = root / 'content.md'
+            content.write_text('# Summary\n')
+            artifact = root / 'report.docx'
+            artifact.write_bytes(b'x' * 100)
+
+            cache = BuildCache(root / 'cache', max_bytes=150)
+            key = BuildCache.make_key('docx', [content])
+            self.assertFalse(cache.restore(key, [root / 'out.docx']))
+            cache.put(key, [artifact])
+
+            self.assertTrue(cache.restore(key, [root / 'out.docx']))
+            self.assertEqual((root / 'out.docx').read_bytes(), b'x' * 100)
+
+            content.write_text('# Summary\n\nEdited.\n')
+            new_key = BuildCache.make_key('docx', [content])
+            self.assertNotEqual(key, new_key)
+
+            cache.put(new_key, [artifact])
+            self.assertEqual([k for k, _ in cache.entries()], [new_key])
+
+
+class TestExcelCache(unittest.TestCase):
+    """Tests for the parsed worksheet cache."""
+
+    def test_cache_invalidated_when_workbook_changes(self):
+        """A rewritten workbook is parsed again instead of served from cache."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            workbook = root / 'budget.xlsx'
+            with mock.patch.dict(os.environ, {'AUTORPT_CACHE_DIR': str(root / 'cache')}):
+                pd.DataFrame({'Task': ['A'], 'Budgeted': [1.0]}).to_excel(workbook, index=False)
+                first = read_excel_cached(workbook)
+                first.loc[0, 'Budgeted'] = 99.0
+                self.assertEqual(read_excel_cached(workbook).loc[0, 'Budgeted'], 1.0)
+
+                clear_memory_cache()
+                self.assertEqual(read_excel_cached(workbook).loc[0, 'Task'], 'A')
+
+                pd.DataFrame({'Task': ['B'], 'Budgeted': [2.0]}).to_excel(workbook, index=False)
+                self.assertEqual(read_excel_cached(workbook).loc[0, 'Task'], 'B')
+
+    @unittest.skipUnless(FEATHER_AVAILABLE, 'pyarrow is not installed')
+    def test_disk_cache_is_bounded(self):
+        """The least recently used frames are evicted and old pickles removed."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            frames_dir = root / 'cache' / 'frames'
+            frames_dir.mkdir(parents=True)
+            (frames_dir / 'old.pkl').write_bytes(b'pickled')
+            workbooks = []
+            for name in ('a', 'b'):
+                workbooks.append(root / f"{name}.xlsx")
+                pd.DataFrame({'Task': [name] * 50}).to_excel(workbooks[-1], index=False)
+
+            with mock.patch.dict(os.environ, {'AUTORPT_CACHE_DIR': str(root / 'cache'),
+                                              'AUTORPT_FRAME_CACHE_MAX_MB': '0.003'}):
+                read_excel_cached(workbooks[0])
+                self.assertEqual(len(list(frames_dir.glob('*.feather'))), 1)
+                os.utime(next(frames_dir.glob('*.feather')), (0, 0))
+                read_excel_cached(workbooks[1])
+
+            cached = list(frames_dir.iterdir())
+            self.assertEqual(len(cached), 1)
+            self.assertEqual(pd.read_feather(cached[0]).loc[0, 'Task'], 'b')
+
+    def test_reader_hints(self):
+        """Column and row hints are applied and cached separately."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            workbook = root / 'budget.xlsx'
+            pd.DataFrame({'Task': ['A', 'B', 'C'], 'Budgeted': [1.0, 2.0, 3.0],
+                          'Spent': [0.5, 1.0, 1.5]}).to_excel(workbook, index=False)
+            with mock.patch.dict(os.environ, {'AUTORPT_CACHE_DIR': str(root / 'cache')}):
+                pruned = read_excel_cached(workbook, engine='openpyxl', usecols='A:B', nrows=2)
+                full = read_excel_cached(workbook, engine='openpyxl')
+
+                with self.assertRaises(ValueError):
+                    read_excel_cached(workbook, engine='xlrd2')
+
+        self.assertEqual(pruned.shape, (2, 2))
+        self.assertEqual(full.shape, (3, 3))
+
+
+class TestSections(unittest.TestCase):
+    """Tests for the shared section parser."""
+
+    def test_parse_sections(self):
+        """Frontmatter is split off and sections get stable hashes."""
+        metadata, body = split_frontmatter('---\ntitle: Report\n---\nIntro\n# A\none\n## B\ntwo\n')
+        sections = parse_sections(body, max_level=2)
+
+        self.assertEqual(metadata, {'title': 'Report'})
+        self.assertEqual([(s['level'], s['title'], s['content']) for s in sections],
+                         [(0, '', 'Intro'), (1, 'A', 'one'), (2, 'B', 'two')])
+        self.assertEqual(sections[1]['hash'], parse_sections('# A\none\n')[0]['hash'])
+
+    def test_indented_headers(self):
+        """gen_auto accepts indented headers; the report parsers do not."""
+        from autorpt.gen_auto import AutoReportGenerator
+
+        body = 'Intro\n  # Indented\ntext\n'
+        self.assertEqual([s['title'] for s in parse_sections(body)], [''])
+
+        blocks = AutoReportGenerator()._parse_markdown_content(body)
+        self.assertEqual([(b['level'], b['text'], b['content']) for b in blocks],
+                         [(1, 'Indented', 'text')])
+
+    def test_header_rules(self):
+        """Headers are '#'s and a space at the start of a line; the title may be empty."""
+        sections = parse_sections('# \nUnder an empty title\n#\tTabbed\n', max_level=2)
+        self.assertEqual([(s['level'], s['title'], s['content']) for s in sections],
+                         [(1, '', 'Under an empty title\n#\tTabbed')])
+
+        doc = autorpt.build_word_document('# \nUnder an empty title\n')
+        self.assertEqual([p.text for p in doc.paragraphs], ['Under an empty title'])
+
+    def test_typst_keeps_first_line_indent(self):
+        """Only the header line is stripped, not the first line of its section."""
+        typst = autorpt.markdown_to_typst('# Title\n\n    indented first\nnext\n')
+        self.assertEqual(typst, '= Title\n\n    indented first\nnext')
+
+    def test_only_changed_sections_are_rendered(self):
+        """Re-converting an edited document renders just the edited section."""
+        text = ''.join(f'# Section {i}\n\nParagraph {i}.\n' for i in range(20))
+        section_cache.clear()
+        first = autorpt.markdown_to_typst(text)
+        misses = section_cache.misses
+
+        edited = autorpt.markdown_to_typst(text.replace('Paragraph 7.', 'Edited.'))
+
+        # The new plan, then blocks + Typst for the one edited section
+        self.assertEqual(section_cache.misses - misses, 3)
+        self.assertEqual(first.replace('Paragraph 7.', 'Edited.'), edited)
+
+
+class TestPlaceholders(unittest.TestCase):
+    """Tests for table and frontmatter placeholders."""
+
+    CONTENT = (
+        '---\nproject: Alpha\n---\n'
+        '# Staffing\n\nStaff for {{ frontmatter.project }}.\n\n'
+        '[insert table from staffing.xlsx sheet Q3]\n'
+        '# Again\n\n[insert table from staffing.xlsx sheet Q3]\n'
+    )
+
+    def test_compile_plan(self):
+        """Fields are substituted and each referenced table is listed once."""
+        plan = compile_plan(self.CONTENT + '\n[insert budget from budget.xlsx here]\n')
+
+        self.assertEqual(plan.tables, (TableRef('staffing.xlsx', 'Q3'), BUDGET_TABLE))
+        self.assertIn('Staff for Alpha.', plan.body)
+
+    def test_only_referenced_sheets_are_read(self):
+        """Word and Typst builds read just the referenced sheet, once each."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'content.md').write_text(self.CONTENT)
+            with pd.ExcelWriter(root / 'staffing.xlsx') as writer:
+                pd.DataFrame({'Role': ['Q2 lead']}).to_excel(writer, sheet_name='Q2', index=False)
+                pd.DataFrame({'Role': ['Q3 lead']}).to_excel(writer, sheet_name='Q3', index=False)
+
+            with mock.patch('autorpt.excel.read_excel_cached', wraps=read_excel_cached) as read:
+                self.assertTrue(autorpt.generate_report_from_content(root, use_cache=False))
+                tables = compile_plan(self.CONTENT).load_tables(root)
+
+            self.assertEqual([c.kwargs['sheet_name'] for c in read.call_args_list], ['Q3', 'Q3'])
+            typst = autorpt.markdown_to_typst(self.CONTENT, tables=tables)
+            self.assertEqual(typst.count('[Q3 lead]'), 2)
+            self.assertIn('Staff for Alpha.', typst)
+
+    def test_tables_outside_folder_are_rejected(self):
+        """Placeholders cannot name workbooks outside the report folder."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / 'reports'
+            (root / '.uploads').mkdir(parents=True)
+            for workbook in (Path(tmp) / 'secret.xlsx', root / '.uploads' / 'other.xlsx'):
+                pd.DataFrame({'Task': ['secret']}).to_excel(workbook, index=False)
+            (root / 'linked.xlsx').symlink_to(Path(tmp) / 'secret.xlsx')
+
+            for name in (f'{tmp}/secret.xlsx', '../secret.xlsx', '.uploads/other.xlsx',
+                         'linked.xlsx'):
+                content = f'# Budget\n\n[insert table from {name}]\n'
+                with self.assertRaises(ValueError):
+                    TableRef(name, None).path(root)
+                self.assertEqual(compile_plan(content).load_tables(root),
+                                 {TableRef(name, None): None})
+                with self.assertRaises(ReportBuildError):
+                    ReportBuilder(content, base_dir=root).docx()
+
+
+class TestPipeline(unittest.TestCase):
+    """Tests for single-parse multi-format generation."""
+
+    def test_parse_formats(self):
+        """Formats are de-duplicated and unknown formats rejected."""
+        self.assertEqual(parse_formats('docx, PDF,docx'), ('docx', 'pdf'))
+        with self.assertRaises(ValueError):
+            parse_formats('docx,rtf')
+
+    def test_generate_formats(self):
+        """Word, HTML and markdown are generated from one read of the inputs."""
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'content.md').write_text(
+                '---\ntitle: Q3\n---\n# Budget\n\n[insert budget from budget.xlsx here]\n')
+            pd.DataFrame({'Task': ['TOTAL'], 'Budgeted': [10.0]}).to_excel(
+                root / 'budget.xlsx', index=False)
+
+            results = generate_formats(root, formats=('docx', 'html', 'md'), use_cache=False)
+
+            self.assertEqual(results['failed'], 0)
+            self.assertEqual(sorted(results['outputs']), ['docx', 'html', 'md'])
+            html = Path(results['outputs']['html']).read_text(encoding='utf-8')
+            self.assertIn('<title>Q3</title>', html)
+            self.assertIn('<td>TOTAL</td>', html)
+
+
+class TestReportBuilder(unittest.TestCase):
+    """Tests for in-process report building."""
+
+    CONTENT = '# Budget\n\n[insert budget from budget.xlsx here]\n'
+
+    def test_build_from_dataframe(self):
+        """Reports are built from a DataFrame and returned as bytes."""
+        budget_df = pd.DataFrame({'Task': ['TOTAL'], 'Budgeted': [10.0]})
+        builder = ReportBuilder(self.CONTENT, tables={'budget.xlsx': budget_df})
+
+        doc = Document(builder.build_io('docx'))
+        html = builder.build('html').decode('utf-8')
+
+        self.assertEqual(doc.tables[0].cell(1, 0).text, 'TOTAL')
+        self.assertIn('<td>TOTAL</td>', html)
+        self.assertIn('[*TOTAL*]', builder.typst())
+
+    def test_concurrent_builds(self):
+        """Builders with different inputs can run in parallel threads."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        def build(number):
+            budget_df = pd.DataFrame({'Task': [f'Item {number}'], 'Budgeted': [float(number)]})
+            report = ReportBuilder(self.CONTENT, tables={'budget.xlsx': budget_df}).build('docx')
+            return Document(io.BytesIO(report)).tables[0].cell(1, 0).text
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(list(executor.map(build, range(8))),
+                             [f'Item {number}' for number in range(8)])
+
+    def test_missing_table(self):
+        """A referenced table that was not given is an error unless allowed."""
+        with self.assertRaises(ReportBuildError):
+            ReportBuilder(self.CONTENT).build('docx')
+        html = ReportBuilder(self.CONTENT, require_tables=False).build('html')
+        self.assertIn(b'[insert budget from budget.xlsx here]', html)
+
+
+class TestTypstBuild(unittest.TestCase):
+    """Tests for isolated Typst compilation."""
+
+    @unittest.skipUnless(shutil.which('typst'), "typst not installed")
+    def test_concurrent_pdf_builds(self):
+        """Builds of one folder compile in their own workspaces."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'report.typ').write_text('#include "report_content.typ"\n')
+
+            def build(number):
+                return autorpt.compile_typst_pdf(root, root / f'report_{number}.pdf',
+                                                 f'= Report {number}\n')
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                self.assertTrue(all(executor.map(build, range(4))))
+
+            self.assertEqual(sorted(p.name for p in root.iterdir()),
+                             ['report.typ'] + [f'report_{number}.pdf' for number in range(4)])
+
+    @unittest.skipUnless(TYPST_PY_AVAILABLE, "typst package not installed")
+    def test_in_process_backend(self):
+        """The python backend reuses one compiler per thread."""
+        from autorpt import typst_build
+
+        template = '#include "report_content.typ"\n'
+        first = typst_build.compile_typst(template, '= One\n', backend='python')
+        compiler = typst_build._compilers.compiler
+        second = typst_build.compile_typst(template, '= Two\n', backend='python')
+
+        self.assertTrue(first.startswith(b'%PDF') and second.startswith(b'%PDF'))
+        self.assertIs(typst_build._compilers.compiler, compiler)
+        with self.assertRaises(typst_build.TypstError):
+            typst_build.compile_typst(template, '#undefined-function()', backend='python')
+        with self.assertRaises(ValueError):
+            typst_build.resolve_backend('latex')
+
+    def test_template_assets(self):
+        """Files the template and its included modules name are its assets."""
+        from autorpt.typst_build import template_assets
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'parts').mkdir()
+            (root / 'report.typ').write_text(
+                '#import "parts/style.typ": *\n#image("logo.png")\n'
+                '#include "report_content.typ"\n#read("../secret.txt")\n')
+            (root / 'parts' / 'style.typ').write_text('#let data = json("/data.json")\n'
+                                                     '#image("badge.svg")\n')
+            for name in ('logo.png', 'data.json', 'parts/badge.svg', 'unused.png',
+                         'report_content.typ'):
+                (root / name).write_text(name)
+
+            self.assertEqual(list(template_assets(root / 'report.typ')),
+                             ['data.json', 'logo.png', 'parts/badge.svg', 'parts/style.typ'])
+
+            # A changed asset or backend changes the PDF's cache inputs
+            files, settings = autorpt._typst_cache_inputs(root)
+            self.assertIn(root / 'logo.png', files)
+            with mock.patch.dict(os.environ, {'AUTORPT_TYPST_BACKEND': 'cli'}):
+                self.assertEqual(autorpt._typst_cache_inputs(root)[1], ('cli',))
+            key = BuildCache.make_key('pdf', files, settings)
+            (root / 'logo.png').write_text('new logo')
+            self.assertNotEqual(BuildCache.make_key('pdf', files, settings), key)
+
+    def test_only_referenced_assets_are_linked(self):
+        """Saved reports, uploads and databases next to the template stay out of builds."""
+        from autorpt.typst_build import _link_assets
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp) / 'reports'
+            workspace = Path(tmp) / 'workspace'
+            for folder in (root / 'images', root / 'saved', root / '.uploads', workspace):
+                folder.mkdir(parents=True)
+            for name in ('images/logo.svg', 'saved/content.md', 'autorpt.db', 'budget.xlsx'):
+                (root / name).write_text(name)
+
+            _link_assets('#image("images/logo.svg")\n#include "report_content.typ"\n',
+                         root, workspace)
+
+            linked = sorted(str(path.relative_to(workspace)) for path in workspace.rglob('*'))
+            self.assertEqual(linked, ['images', os.path.join('images', 'logo.svg')])
+            self.assertEqual((workspace / 'images' / 'logo.svg').read_text(), 'images/logo.svg')
+
+    def test_timeout_setting(self):
+        """The timeout comes from AUTORPT_TYPST_TIMEOUT, 0 meaning none."""
+        from autorpt.typst_build import DEFAULT_TIMEOUT, get_typst_timeout
+
+        with mock.patch.dict(os.environ, {'AUTORPT_TYPST_TIMEOUT': '0'}):
+            self.assertIsNone(get_typst_timeout())
+        with mock.patch.dict(os.environ, {'AUTORPT_TYPST_TIMEOUT': '120'}):
+            self.assertEqual(get_typst_timeout(), 120)
+        with mock.patch.dict(os.environ, {'AUTORPT_TYPST_TIMEOUT': ''}):
+            self.assertEqual(get_typst_timeout(), DEFAULT_TIMEOUT)
+
+
+class TestVolume(unittest.TestCase):
+    """Tests for multi-report PDF volumes."""
+
+    @unittest.skipUnless(TYPST_PY_AVAILABLE or shutil.which('typst'), "typst not installed")
+    def test_build_volume(self):
+        """Every project is included in one PDF after the table of contents."""
+        from autorpt.volume import build_volume
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'report.typ').write_text('#include "report_content.typ"\n')
+            for name in ('alpha', 'beta'):
+                (root / name).mkdir()
+                (root / name / 'content.md').write_text(
+                    f'---\nproject: Project {name}\n---\n# Summary\n\nAll good.\n')
+
+            results = build_volume(root, title='Board Packet')
+
+            self.assertEqual(results['success'], 2)
+            self.assertTrue(Path(results['output']).read_bytes().startswith(b'%PDF'))
+
+    @unittest.skipUnless(TYPST_PY_AVAILABLE or shutil.which('typst'), "typst not installed")
+    def test_volume_contents_pages(self):
+        """The contents list the page number printed on each report's first page."""
+        from autorpt.volume import volume_markup
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'alpha.typ').write_text('One\n#pagebreak()\nTwo\n#pagebreak()\nThree\n')
+            (root / 'beta.typ').write_text('Four\n')
+            # Record the page number each report's footer displays
+            (root / 'volume.typ').write_text(
+                volume_markup([('Alpha', 'alpha.typ'), ('Beta', 'beta.typ')])
+                + '\n#context [#metadata(query(<autorpt-report>).map('
+                'report => counter(page).at(report.location()).first())) <footers>]\n')
+
+            def query(selector):
+                if TYPST_PY_AVAILABLE:
+                    import typst
+                    return json.loads(typst.query(str(root / 'volume.typ'), selector))
+                return json.loads(subprocess.run(
+                    ['typst', 'query', str(root / 'volume.typ'), selector],
+                    capture_output=True, text=True, check=True).stdout)
+
+            entries = [[child['text'] for child in link['body']['children'] if 'text' in child]
+                       for link in query('link')]
+            footers = query('<footers>')[0]['value']
+
+        # Contents on page 1, Alpha on pages 2-4, Beta from page 5
+        self.assertEqual(footers, [2, 5])
+        self.assertEqual(entries, [['Alpha', '2'], ['Beta', '5']])
+
+    def test_volume_markup(self):
+        """Reports are numbered through the volume and listed in the contents."""
+        from autorpt.volume import volume_markup
+
+        markup = volume_markup([('Alpha "A"', '_volume/001/report_content.typ')])
+
+        self.assertIn('query(<autorpt-report>)', markup)
+        self.assertNotIn('#counter(page).update(1)', markup)
+        self.assertIn('[#"Alpha \\"A\\""] <autorpt-report>', markup)
+        self.assertIn('#include "_volume/001/report_content.typ"', markup)
+
+
+class TestJobs(unittest.TestCase):
+    """Tests for the background job queue."""
+
+    def test_jobs_run_and_survive_restart(self):
+        """Finished jobs are kept on disk and interrupted ones marked failed."""
+        from autorpt.jobs import JobQueue
+
+        def build(progress, name):
+            progress('Building', 50)
+            return {'filename': name}
+
+        def fail(progress):
+            raise ValueError('no content')
+
+        with tempfile.TemporaryDirectory() as tmp:
+            queue = JobQueue(Path(tmp), workers=2)
+            done = queue.submit(build, 'report.docx', format='docx')
+            failed = queue.submit(fail, format='pdf')
+            queue.shutdown()
+
+            self.assertEqual(queue.wait(done['id'], 0)['filename'], 'report.docx')
+            self.assertEqual(queue.get(failed['id'])['error'], 'no content')
+
+            # A job left running by a stopped server
+            record = dict(queue.get(done['id']), id='stale', status='running')
+            (Path(tmp) / 'stale.json').write_text(json.dumps(record))
+
+            restarted = JobQueue(Path(tmp))
+            self.assertEqual(restarted.get(done['id'])['status'], 'done')
+            self.assertEqual(restarted.get('stale')['status'], 'failed')
+
+    def test_queue_is_created_on_first_use(self):
+        """A new queue creates no folder and starts no threads until it is used."""
+        from autorpt.jobs import JobQueue
+
+        with tempfile.TemporaryDirectory() as tmp:
+            jobs_dir = Path(tmp) / '.jobs'
+            threads = threading.active_count()
+            queue = JobQueue(jobs_dir)
+            self.assertFalse(jobs_dir.exists())
+            self.assertEqual(threading.active_count(), threads)
+
+            self.assertEqual(queue.recent(), [])
+            self.assertTrue(jobs_dir.exists())
+
+    def test_finished_jobs_are_trimmed(self):
+        """Only the newest MAX_JOB_RECORDS finished jobs are kept in memory and on disk."""
+        from autorpt import jobs
+
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(jobs, 'MAX_JOB_RECORDS', 3):
+            queue = jobs.JobQueue(Path(tmp), workers=1)
+            submitted = []
+            for number in range(5):
+                submitted.append(queue.submit(lambda progress: None, number=number)['id'])
+                queue.shutdown()
+
+            self.assertEqual(len(queue.recent(10)), 3)
+            self.assertIsNone(queue.get(submitted[0]))
+            self.assertEqual(sorted(path.stem for path in Path(tmp).glob('*.json')),
+                             sorted(submitted[2:]))
+            self.assertEqual(queue.recent(10, number=4)[0]['id'], submitted[4])
+
+
+class TestUploads(unittest.TestCase):
+    """Tests for the content-addressed upload store."""
+
+    def test_duplicates_and_chunked_uploads(self):
+        """A workbook is stored and summarized once, however it is uploaded."""
+        from autorpt.uploads import UploadError, UploadStore
+
+        workbook = b'PK\x03\x04' + bytes(range(256)) * 10
+        summaries = []
+
+        def summarize(blob):
+            summaries.append(blob)
+            return {'rows': 3}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = UploadStore(Path(tmp))
+            digest, blob, existed = store.save_stream(io.BytesIO(workbook), '.xlsx')
+            self.assertFalse(existed)
+            self.assertEqual(blob.read_bytes(), workbook)
+
+            upload_id = store.start('budget.xlsx', len(workbook))
+            store.append(upload_id, 0, io.BytesIO(workbook[:1000]))
+            with self.assertRaises(UploadError):
+                store.append(upload_id, 0, io.BytesIO(workbook[:1000]))
+            with self.assertRaises(UploadError):
+                store.finish(upload_id)
+            offset = store.status(upload_id)['offset']
+            store.append(upload_id, offset, io.BytesIO(workbook[offset:]))
+            self.assertEqual(store.finish(upload_id), ('budget.xlsx', digest, blob, True))
+
+            self.assertEqual(store.summary(digest, blob, summarize), {'rows': 3})
+            self.assertEqual(store.summary(digest, blob, summarize), {'rows': 3})
+            self.assertEqual(len(summaries), 1)
+            self.assertEqual(store.find(digest, '.xlsx'), blob)
+            with self.assertRaises(UploadError):
+                store.start('budget.csv', 10)
+
+    def test_concurrent_chunks_at_one_offset(self):
+        """Only one of two chunks sent at the same offset is appended."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from autorpt.uploads import UploadError, UploadStore
+
+        class SlowStream(io.BytesIO):
+            def read(self, size=-1):
+                time.sleep(0.01)
+                return super().read(size)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            store = UploadStore(Path(tmp))
+            upload_id = store.start('budget.xlsx', 2000)
+
+            def send(_):
+                try:
+                    return store.append(upload_id, 0, SlowStream(b'x' * 1000))
+                except UploadError:
+                    return None
+
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                results = list(executor.map(send, range(2)))
+
+            self.assertEqual(sorted(results, key=str), [1000, None])
+            self.assertEqual(store.status(upload_id)['offset'], 1000)
+            self.assertEqual(store._upload_locks, {})
+
+
+class TestAppStore(unittest.TestCase):
+    """Tests for the SQLite history and snippet store."""
+
+    def test_migration_and_concurrent_writes(self):
+        """JSON files are imported once and concurrent inserts all get distinct ids."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        from autorpt.store import AppStore
+
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / 'history.json').write_text(json.dumps([
+                {'filename': 'new.pdf', 'format': 'pdf', 'timestamp': '2024-02-01', 'preview': ''},
+                {'filename': 'old.docx', 'format': 'docx', 'timestamp': '2024-01-01', 'preview': ''},
+            ]))
+            (root / 'snippets.json').write_text(json.dumps([
+                {'id': 1, 'title': 'a', 'content': 'A', 'created': '2024-01-01'},
+                {'id': 1, 'title': 'b', 'content': 'B', 'created': '2024-01-02'},
+            ]))
+            store = AppStore(root / 'autorpt.db', root / 'history.json', root / 'snippets.json')
+
+            history, total = store.history()
+            self.assertEqual([entry['filename'] for entry in history], ['new.pdf', 'old.docx'])
+            self.assertEqual(store.history(format_type='docx')[1], 1)
+            self.assertFalse((root / 'history.json').exists())
+            self.assertEqual([s['id'] for s in store.snippets()[0]], [1, 2])
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                added = list(executor.map(lambda i: store.add_snippet(f's{i}', 'x'), range(40)))
+            self.assertEqual(len({snippet['id'] for snippet in added}), 40)
+            self.assertEqual(store.snippets(limit=10, offset=40)[1], 42)
+
+            # Ids are never reused after a delete
+            last = added[-1]['id']
+            self.assertTrue(store.delete_snippet(last))
+            self.assertFalse(store.delete_snippet(last))
+            self.assertGreater(store.add_snippet('t', 'y')['id'], max(s['id'] for s in added))
+
+            # Reopening does not import again
+            reopened = AppStore(root / 'autorpt.db', root / 'history.json.migrated')
+            self.assertEqual(reopened.history()[1], 2)
+
+
+class TestWebApp(unittest.TestCase):
+    """Tests for the web app's workspaces and table pages."""
+
+    def setUp(self):
+        """Point the web app at a temporary reports folder."""
+        from autorpt import webapp
+        from autorpt.gallery import GalleryIndex
+        from autorpt.jobs import JobQueue
+        from autorpt.store import AppStore
+        from autorpt.uploads import UploadStore
+
+        self.webapp = webapp
+        self.tmp = tempfile.TemporaryDirectory()
+        self.reports_dir = Path(self.tmp.name)
+        self.queue = JobQueue(self.reports_dir / '.jobs', workers=2)
+        patcher = mock.patch.multiple(webapp, REPORTS_DIR=self.reports_dir, JOBS=self.queue,
+                                      WORKSPACES_DIR=self.reports_dir / '.workspaces',
+                                      OUTPUTS_DIR=self.reports_dir / '.outputs',
+                                      UPLOADS=UploadStore(self.reports_dir / '.uploads'),
+                                      STORE=AppStore(self.reports_dir / 'autorpt.db'),
+                                      GALLERY=GalleryIndex(self.reports_dir))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def upload(self, client, df):
+        """Upload a frame as budget.xlsx and return the response."""
+        workbook = io.BytesIO()
+        df.to_excel(workbook, index=False)
+        workbook.seek(0)
+        return client.post('/api/upload-excel', data={'file': (workbook, 'budget.xlsx')},
+                           content_type='multipart/form-data').get_json()
+
+    def test_sessions_do_not_share_files(self):
+        """Uploads stay in their session and each build gets its own output."""
+        alice = self.webapp.app.test_client()
+        bob = self.webapp.app.test_client()
+        self.upload(alice, pd.DataFrame({'Task': ['Planning'], 'Budgeted': [5.0]}))
+
+        files = alice.get('/api/list-excel-files').get_json()['files']
+        self.assertEqual([f['filename'] for f in files], ['budget.xlsx'])
+        self.assertEqual(bob.get('/api/list-excel-files').get_json()['files'], [])
+
+        jobs = [client.post('/api/generate-report', json={
+            'format': 'md', 'metadata': {'title': name}, 'content': 'Hello'}).get_json()
+            for client, name in ((alice, 'Alice'), (bob, 'Bob'))]
+        self.queue.shutdown()
+
+        reports = [alice.get(self.queue.get(job['job_id'])['download_url']).data
+                   for job in jobs]
+        self.assertIn(b'title: Alice', reports[0])
+        self.assertIn(b'title: Bob', reports[1])
+        self.assertFalse((self.reports_dir / 'content.md').exists())
+
+        # Each session only sees its own jobs
+        self.assertEqual([job['id'] for job in alice.get('/api/jobs').get_json()['jobs']],
+                         [jobs[0]['job_id']])
+        self.assertEqual(bob.get(f"/api/jobs/{jobs[0]['job_id']}").status_code, 404)
+        self.assertEqual(bob.get(f"/api/jobs/{jobs[0]['job_id']}/events").status_code, 404)
+        self.assertEqual(self.webapp.app.test_client().get('/api/jobs').get_json()['jobs'], [])
+
+        history = alice.get('/api/history?limit=1').get_json()
+        self.assertEqual(history['total'], 2)
+        self.assertEqual(len(history['history']), 1)
+        self.assertIn(history['history'][0]['download_url'],
+                      [self.queue.get(job['job_id'])['download_url'] for job in jobs])
+
+    def test_events_end_when_job_is_removed(self):
+        """A job record removed while it is followed ends the stream as failed."""
+        client = self.webapp.app.test_client()
+        with client.session_transaction() as client_session:
+            client_session['workspace'] = 'a' * 32
+        release = threading.Event()
+        job = self.queue.submit(lambda progress: release.wait(5), workspace='a' * 32)
+
+        with mock.patch.object(self.queue, 'wait', return_value=None):
+            body = client.get(f"/api/jobs/{job['id']}/events").get_data(as_text=True)
+        release.set()
+
+        events = [json.loads(line[6:]) for line in body.splitlines() if line.startswith('data: ')]
+        self.assertEqual(events[-1], {'id': job['id'], 'status': 'failed',
+                                      'error': 'Job no longer exists'})
+
+    def test_sessions_save_their_own_content(self):
+        """Saved content stays in the session's workspace and Save As copies it."""
+        (self.reports_dir / 'content.md').write_text('---\ntitle: Shared\n---\n\nShared',
+                                                     encoding='utf-8')
+        alice = self.webapp.app.test_client()
+        bob = self.webapp.app.test_client()
+
+        alice.post('/api/save-content', json={'metadata': {'title': 'Alice'}, 'content': 'Mine'})
+
+        self.assertEqual(alice.get('/api/load-content').get_json()['content'], 'Mine')
+        self.assertEqual(bob.get('/api/load-content').get_json()['content'], 'Shared')
+        self.assertIn('Shared', (self.reports_dir / 'content.md').read_text(encoding='utf-8'))
+
+        self.assertTrue(alice.post('/api/save-as', json={'name': 'alice'}).get_json()['success'])
+        self.assertEqual(alice.get('/api/load-saved/alice').get_json()['metadata']['title'],
+                         'Alice')
+
+    def test_table_pages(self):
+        """Uploaded tables are served in sorted, column-selected pages."""
+        client = self.webapp.app.test_client()
+        upload = self.upload(client, pd.DataFrame({
+            'Task': ['a', 'b', 'c', 'd'], 'Spent': [3.0, None, 1.0, 2.0],
+            'Cost, USD': [1, 2, 3, 4]}))
+        self.assertNotIn('full_table', upload)
+        rows_url = f"/api/tables/{upload['sha256']}/rows"
+
+        page = client.get(f'{rows_url}?offset=1&limit=2').get_json()
+        self.assertEqual(page['total'], 4)
+        self.assertEqual(page['values'], [['b', 'c'], [None, 1.0], [2, 3]])
+
+        page = client.get(f'{rows_url}?sort=Spent&order=desc&columns=Task').get_json()
+        self.assertEqual(page['values'], [['a', 'd', 'c', 'b']])
+
+        page = client.get(rows_url, query_string=[('columns', 'Cost, USD'), ('columns', 'Task'),
+                                                  ('limit', 2)]).get_json()
+        self.assertEqual(page['columns'], ['Cost, USD', 'Task'])
+        self.assertEqual(page['values'], [[1, 2], ['a', 'b']])
+        self.assertEqual(client.get(f'{rows_url}?sort=Nope').status_code, 400)
+
+    def test_gallery(self):
+        """Saved reports are listed in pages, with ETags until a report changes."""
+        client = self.webapp.app.test_client()
+        for name, title in (('beta', 'B report'), ('alpha', 'A report')):
+            (self.reports_dir / name).mkdir()
+            (self.reports_dir / name / 'content.md').write_text(f'---\ntitle: {title}\n---\n# Body\n')
+
+        response = client.get('/api/gallery?sort=title&order=asc&limit=1')
+        gallery = response.get_json()
+        self.assertEqual(gallery['total'], 2)
+        self.assertEqual([report['name'] for report in gallery['reports']], ['alpha'])
+
+        etag = response.headers['ETag']
+        url = '/api/gallery?sort=title&order=asc&limit=1'
+        self.assertEqual(client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+        (self.reports_dir / 'beta' / 'content.md').write_text('---\ntitle: 0 first\n---\n')
+        response = client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['reports'][0]['title'], '0 first')
+
+
+class TestTimings(unittest.TestCase):
+    """Tests for per-stage timings."""
+
+    def tearDown(self):
+        stop_timings()
+
+    def test_stage_without_recorder(self):
+        """Stages are no-ops unless timings are being recorded."""
+        with stage('read_excel', bytes=10) as sizes:
+            sizes['rows'] = 3
+        self.assertIsNone(stop_timings())
+
+    def test_word_stages(self):
+        """Building a Word report records nested stages with their sizes."""
+        budget_df = pd.DataFrame({'Task': ['1. Planning', 'TOTAL'], 'Budgeted': [5.0, 5.0]})
+        start_timings()
+        autorpt.build_word_document(
+            '# Budget\n\n[insert budget from budget.xlsx here]\n', budget_df)
+        data = stop_timings().to_dict()
+
+        stages = {entry['stage']: entry for entry in data['stages']}
+        self.assertEqual(stages['parse_markdown']['sizes']['sections'], 1)
+        self.assertEqual(stages['word_table']['sizes']['rows'], 2)
+        self.assertEqual(stages['word_table']['depth'], 1)
+        self.assertGreaterEqual(stages['build_docx']['wall_s'], stages['word_table']['wall_s'])
+        self.assertIsNotNone(stages['build_docx']['peak_memory_bytes'])
+
+    def test_concurrent_stages_have_no_own_peak(self):
+        """Only stages that ran alone report a peak; the run keeps its overall peak."""
+        barrier = threading.Barrier(2)
+
+        def render(name):
+            with stage(name):
+                barrier.wait()
+
+        start_timings()
+        with stage('alone'):
+            pass
+        threads = [threading.Thread(target=render, args=(name,)) for name in ('docx', 'pdf')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        data = stop_timings().to_dict()
+
+        peaks = {entry['stage']: entry['peak_memory_bytes'] for entry in data['stages']}
+        self.assertIsNotNone(peaks['alone'])
+        self.assertIsNone(peaks['docx'])
+        self.assertIsNone(peaks['pdf'])
+        self.assertIsNotNone(data['peak_memory_bytes'])
+
+
+class TestTracing(unittest.TestCase):
+    """Tests for span tracing."""
+
+    def tearDown(self):
+        stop_tracing()
+
+    def test_span_without_tracer(self):
+        """Spans still yield their args while tracing is off."""
+        with span('read_excel', rows=1) as args:
+            args['columns'] = 2
+        self.assertEqual(args, {'rows': 1, 'columns': 2})
+        self.assertIsNone(stop_tracing())
+
+    def test_export_and_merge(self):
+        """Stages become complete events in Chrome JSON and JSON lines exports."""
+        start_tracing()
+        autorpt.build_word_document('# Summary\n\nText\n')
+        tracer = stop_tracing()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            chrome_file = Path(tmp) / 'trace.json'
+            jsonl_file = Path(tmp) / 'trace.jsonl'
+            tracer.export_chrome(chrome_file)
+            tracer.export_jsonl(jsonl_file)
+
+            with open(chrome_file, encoding='utf-8') as f:
+                events = json.load(f)['traceEvents']
+            spans = {event['name']: event for event in events if event['ph'] == 'X'}
+            self.assertEqual(spans['parse_markdown']['args']['sections'], 1)
+            self.assertGreater(spans['build_docx']['ts'], 1e15)  # epoch microseconds
+
+            merged = Path(tmp) / 'merged.json'
+            count = merge_traces([chrome_file, jsonl_file], merged)
+            self.assertEqual(count, 2 * len(events))
+
+
+class TestStartup(unittest.TestCase):
+    """Tests for CLI startup cost."""
+
+    IMPORT_TIME_LIMIT = 0.5  # seconds
+
+    def test_help_import_time(self):
+        """'python -X importtime -m autorpt --help' loads no heavy libraries."""
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-m', 'autorpt', '--help'],
+            cwd=Path(__file__).resolve().parent.parent,
+            capture_output=True, text=True, timeout=60,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+        total_us = 0
+        modules = set()
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'imported package' in line:
+                continue
+            _, cumulative, name = line[len('import time:'):].split('|')
+            modules.add(name.strip())
+            if not name.startswith('  '):  # top-level imports only
+                total_us += int(cumulative)
+
+        for heavy in ('pandas', 'numpy', 'docx', 'openpyxl', 'flask'):
+            self.assertNotIn(heavy, modules)
+        self.assertLess(total_us / 1e6, self.IMPORT_TIME_LIMIT)